@@ -12,11 +12,11 @@ REM ============================================
 call .venv\Scripts\activate
 
 REM ============================================
-REM  Ejecutar el script Consolida_FTP
+REM  Ejecutar todos los consolidados FTP (main.py)
 REM  Guardar logs en carpeta: Log/Error
 REM ============================================
 
-python -m Scripts.Consolida_FTP > "Log\Error\Error_Consolida_FTP.log" 2>&1
+python main.py > "Log\Error\Error_Consolida_FTP.log" 2>&1
 
 pause
 
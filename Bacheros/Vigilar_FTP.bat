@@ -0,0 +1,19 @@
+@echo off
+REM ============================================
+REM  Ir al directorio del proyecto
+REM ============================================
+
+cd /d "D:\MASTER PROYECTOS\LOGISTICA\Python_Villa"
+
+REM ============================================
+REM  Activar entorno virtual
+REM ============================================
+
+call .venv\Scripts\activate
+
+REM ============================================
+REM  Vigilar carpeta FTP (proceso permanente)
+REM  Guardar logs en carpeta: Log/Error
+REM ============================================
+
+python -m Scripts.Vigilar_FTP > "Log\Error\Error_Vigilar_FTP.log" 2>&1
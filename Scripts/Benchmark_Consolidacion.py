@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+from datetime import datetime
+import pandas as pd
+from dotenv import load_dotenv
+from src.log.logging import configurar_logging, rss_pico_mb
+from src.Benchmark.generador import generar_lote
+from src.Consolidacion.tipos import concatenar
+from src.Consolidacion.dedup import deduplicar
+from src.Consolidacion.motor import Reporte, leer_archivo_generico, normalizar
+from src.Consolidacion.reportes import (
+    REPORTE_CHECKING_HISTORICO,
+    REPORTE_PARTES,
+    REPORTE_PICKING,
+    REPORTE_PICKING_HISTORICO,
+)
+
+# =============================================================
+# ENV
+# =============================================================
+load_dotenv(".env")
+
+
+# =============================================================
+# CRONÓMETRO POR ETAPA
+# =============================================================
+class Medicion:
+
+    def __init__(self, reporte: str):
+        self.reporte = reporte
+        self.etapas: list[dict] = []
+
+    def etapa(self, nombre: str, funcion, filas=None):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        segundos = time.perf_counter() - inicio
+
+        # Filas procesadas: la salida de la etapa, salvo que se indique otra cosa
+        if filas is None:
+            filas = len(resultado) if isinstance(resultado, pd.DataFrame) else \
+                    sum(len(df) for df in resultado)
+
+        self.etapas.append({
+            "reporte": self.reporte,
+            "etapa": nombre,
+            "segundos": round(segundos, 4),
+            "filas": int(filas),
+            "filas_por_segundo": round(filas / segundos) if segundos else None,
+            "rss_pico_mb": rss_pico_mb()
+        })
+
+        logging.info(
+            f"⏱ {self.reporte} | {nombre}: {segundos:.2f}s | "
+            f"{filas} filas | RSS pico: {rss_pico_mb()} MB"
+        )
+        return resultado
+
+
+# =============================================================
+# ETAPAS POR REPORTE (MISMAS FUNCIONES QUE EL MOTOR)
+# =============================================================
+def medir_reporte(reporte: Reporte, archivos: list[Path], salida: Path, etiqueta: str) -> list[dict]:
+    m = Medicion(etiqueta)
+    clave = list(reporte.clave) if reporte.clave else None
+
+    crudos = m.etapa("lectura", lambda: [
+        leer_archivo_generico(a, reporte.esquema) for a in archivos
+    ])
+    normalizados = m.etapa("normalizacion", lambda: [
+        normalizar(df, a.name, reporte.esquema) for a, df in zip(archivos, crudos)
+    ])
+
+    def concat():
+        df = concatenar(normalizados)
+        return reporte.tipar(df) if reporte.tipar is not None else df
+
+    df = m.etapa("concat", concat)
+    df = m.etapa("deduplicacion", lambda: deduplicar(df, clave))
+    m.etapa(
+        "exportacion",
+        lambda: df.to_csv(salida / f"{etiqueta}.csv", index=False, sep="|", encoding="utf-8"),
+        filas=len(df)
+    )
+    return m.etapas
+
+
+# =============================================================
+# COMPARACIÓN CONTRA UNA CORRIDA BASE
+# =============================================================
+def comparar(resultados: list[dict], base: Path, tolerancia: float) -> list[str]:
+    previas = {
+        (r["reporte"], r["etapa"]): r
+        for r in json.loads(base.read_text(encoding="utf-8"))["etapas"]
+    }
+
+    regresiones = []
+    for r in resultados:
+        previa = previas.get((r["reporte"], r["etapa"]))
+        if not previa or not previa["segundos"]:
+            continue
+
+        variacion = r["segundos"] / previa["segundos"] - 1
+        if variacion > tolerancia:
+            regresiones.append(
+                f"{r['reporte']} | {r['etapa']}: {previa['segundos']}s → "
+                f"{r['segundos']}s (+{variacion:.0%})"
+            )
+
+    return regresiones
+
+
+# =============================================================
+# PROCESO PRINCIPAL – BENCHMARK
+# =============================================================
+def Ejecutar_Benchmark(
+    filas: int = 50_000,
+    archivos: int = 4,
+    duplicados: float = 0.1,
+    formatos: tuple[str, ...] = ("csv", "xlsx"),
+    semilla: int = 0,
+    directorio: Path | None = None,
+    base: Path | None = None,
+    tolerancia: float = 0.2
+) -> int:
+
+    Archivo = Path(__file__).stem
+    configurar_logging(Archivo)
+    logging.info(
+        f"🚀 Iniciando benchmark | {archivos} archivos x {filas} filas | "
+        f"Duplicados: {duplicados:.0%} | Formatos: {', '.join(formatos)}"
+    )
+
+    with tempfile.TemporaryDirectory() as temporal:
+        trabajo = directorio or Path(temporal)
+        entrada = trabajo / "FTP"
+        salida = trabajo / "Salida"
+        salida.mkdir(parents=True, exist_ok=True)
+
+        # Caché de Excel aislada: la lectura se mide siempre en frío
+        os.environ["RUTA_CACHE_EXCEL"] = str(trabajo / "Cache")
+
+        inicio = time.perf_counter()
+        generados = generar_lote(entrada, filas, archivos, duplicados, formatos, semilla)
+        logging.info(f"🧪 Datos sintéticos generados en {time.perf_counter() - inicio:.1f}s")
+
+        etapas = (
+            medir_reporte(REPORTE_PICKING, generados["PICKING"], salida, "PICKING")
+            + medir_reporte(REPORTE_PARTES, generados["PARTES"], salida, "PARTES")
+            + medir_reporte(REPORTE_CHECKING_HISTORICO, generados["CHECKING_"], salida, "HISTORICO_CHECKING")
+            + medir_reporte(REPORTE_PICKING_HISTORICO, generados["PICKING_"], salida, "HISTORICO_PICKING")
+        )
+
+    # =========================
+    # GUARDAR RESULTADOS
+    # =========================
+    ruta_resultados = Path(os.getenv("RUTA_BENCHMARK", "./Log/Benchmark"))
+    ruta_resultados.mkdir(parents=True, exist_ok=True)
+
+    resultado = ruta_resultados / f"Benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    resultado.write_text(json.dumps({
+        "parametros": {
+            "filas": filas,
+            "archivos": archivos,
+            "duplicados": duplicados,
+            "formatos": list(formatos),
+            "semilla": semilla
+        },
+        "etapas": etapas
+    }, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    logging.info(f"💾 Resultados guardados: {resultado}")
+
+    if base is None:
+        return 0
+
+    regresiones = comparar(etapas, base, tolerancia)
+    for r in regresiones:
+        logging.warning(f"🐢 Regresión: {r}")
+
+    if regresiones:
+        return 1
+
+    logging.info(f"✅ Sin regresiones contra {base.name} (tolerancia {tolerancia:.0%})")
+    return 0
+
+
+# =============================================================
+# MAIN
+# =============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de los consolidados FTP / histórico")
+    parser.add_argument("--filas", type=int, default=50_000, help="Filas por archivo generado")
+    parser.add_argument("--archivos", type=int, default=4, help="Archivos por reporte")
+    parser.add_argument(
+        "--duplicados",
+        type=float,
+        default=0.1,
+        help="Fracción de filas duplicadas dentro de cada archivo"
+    )
+    parser.add_argument(
+        "--formatos",
+        default="csv,xlsx",
+        help="Formatos a alternar entre archivos (csv, xlsx)"
+    )
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador")
+    parser.add_argument(
+        "--directorio",
+        type=Path,
+        default=None,
+        help="Conserva los archivos generados en esta carpeta (por defecto, temporal)"
+    )
+    parser.add_argument(
+        "--base",
+        type=Path,
+        default=None,
+        help="JSON de una corrida anterior para detectar regresiones"
+    )
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=0.2,
+        help="Aumento de tiempo aceptado por etapa antes de marcar regresión"
+    )
+    args = parser.parse_args()
+
+    sys.exit(Ejecutar_Benchmark(
+        filas=args.filas,
+        archivos=args.archivos,
+        duplicados=args.duplicados,
+        formatos=tuple(args.formatos.split(",")),
+        semilla=args.semilla,
+        directorio=args.directorio,
+        base=args.base,
+        tolerancia=args.tolerancia
+    ))
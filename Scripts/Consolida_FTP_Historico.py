@@ -1,28 +1,52 @@
 import os
-import pandas as pd
+import argparse
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
 from src.log.logging import configurar_logging
+from src.Consolidacion.config import opcion_bool, opcion_int
+from src.Consolidacion.manifiesto import Manifiesto
+from src.Consolidacion.motor import Opciones, Resultado, agregar_argumentos, consolidar, detectar_archivos
+from src.Consolidacion.reportes import REPORTE_CHECKING_HISTORICO, REPORTE_PICKING_HISTORICO
 
 # ============================
 # Cargar variables de entorno
 # ============================
 load_dotenv(".env")
 
+REPORTES_HISTORICO = [REPORTE_CHECKING_HISTORICO, REPORTE_PICKING_HISTORICO]
 
-def Ejecutar_Consolidado_Historico():
+
+def opciones_historico(args: argparse.Namespace | None = None) -> Opciones:
+    # El histórico siempre se reconstruye completo; memoria y particiones
+    # tienen sus propias variables de entorno
+    args = args or argparse.Namespace()
+    return Opciones.desde_args(
+        args,
+        incremental=False,
+        fuera_de_memoria=opcion_bool("HISTORICO_FUERA_DE_MEMORIA", getattr(args, "fuera_de_memoria", None)),
+        particiones=opcion_int("PARTICIONES_HISTORICO", getattr(args, "particiones", None), defecto=16)
+    )
+
+
+def Ejecutar_Consolidado_Historico(
+    opciones: Opciones | None = None,
+    cache: bool | None = None
+) -> list[Resultado]:
 
     Archivo = Path(__file__).stem
     configurar_logging(Archivo)
     logging.info("Iniciando consolidado de HISTÓRICOS (CHECKING / PICKING)")
 
+    opciones = opciones or opciones_historico()
+    cache = opcion_bool("CACHE_HISTORICO", cache, defecto=True)
+
     try:
         # =============================================================
         # 1️⃣ Leer rutas del .env
         # =============================================================
-        ruta_historico = Path(os.getenv("RUTA_HISTORICO"))
-        ruta_output = Path(os.getenv("RUTA_OUTPUT_HISTORICO"))
+        ruta_historico = os.getenv("RUTA_HISTORICO")
+        ruta_output = os.getenv("RUTA_OUTPUT_HISTORICO")
 
         if not ruta_historico:
             raise ValueError("❌ Falta RUTA_HISTORICO en .env")
@@ -30,71 +54,30 @@ def Ejecutar_Consolidado_Historico():
         if not ruta_output:
             raise ValueError("❌ Falta RUTA_OUTPUT_HISTORICO en .env")
 
+        ruta_historico, ruta_output = Path(ruta_historico), Path(ruta_output)
         ruta_output.mkdir(parents=True, exist_ok=True)
 
-        # Archivos de salida
-        archivo_checking = ruta_output / "Checking_Historico_Consolidado.csv"
-        archivo_picking = ruta_output / "Picking_Historico_Consolidado.csv"
-
-        df_checking = []
-        df_picking = []
+        # Manifiesto + caché: solo se parsean archivos nuevos o modificados
+        manifiesto = Manifiesto(ruta_output / "Cache_Historico") if cache else None
 
         # =============================================================
         # 2️⃣ Recorrer archivos históricos
         # =============================================================
         logging.info(f"Buscando archivos en: {ruta_historico}")
-
-        for archivo in ruta_historico.iterdir():
-            nombre = archivo.name.upper()
-
-            # ------------ CHECKING ------------
-            if nombre.startswith("CHECKING_") and archivo.suffix.lower() in [".xlsx", ".xls", ".csv"]:
-                logging.info(f"✓ Archivo CHECKING detectado: {archivo.name}")
-
-                df = pd.read_excel(archivo, dtype=str) if archivo.suffix.lower() in [".xlsx", ".xls"] else \
-                     pd.read_csv(archivo, dtype=str)
-
-                df = df.apply(lambda col: col.astype(str).str.strip())
-                df["Archivo_Origen"] = archivo.name
-                df_checking.append(df)
-
-            # ------------ PICKING ------------
-            elif nombre.startswith("PICKING_") and archivo.suffix.lower() in [".xlsx", ".xls", ".csv"]:
-                logging.info(f"✓ Archivo PICKING detectado: {archivo.name}")
-
-                df = pd.read_excel(archivo, dtype=str) if archivo.suffix.lower() in [".xlsx", ".xls"] else \
-                     pd.read_csv(archivo, dtype=str)
-
-                df = df.apply(lambda col: col.astype(str).str.strip())
-                df["Archivo_Origen"] = archivo.name
-                df_picking.append(df)
+        encontrados = detectar_archivos(list(ruta_historico.iterdir()), REPORTES_HISTORICO)
 
         # =============================================================
         # 3️⃣ CONSOLIDAR + QUITAR DUPLICADOS + EXPORTAR
         # =============================================================
+        resultados = [
+            consolidar(reporte, encontrados[reporte.nombre], ruta_output, opciones, manifiesto=manifiesto)
+            for reporte in REPORTES_HISTORICO
+        ]
 
-        # ========== CHECKING ==========
-        if df_checking:
-            df_final_checking = pd.concat(df_checking, ignore_index=True)
-
-            # Quitar duplicados de TODO
-            df_final_checking = df_final_checking.drop_duplicates()
-
-            df_final_checking.to_csv(archivo_checking, index=False, sep="|", encoding="utf-8")
-            logging.info(f"✅ Consolidado CHECKING generado: {archivo_checking}  Filas: {len(df_final_checking)}")
-        else:
-            logging.warning("⚠ No se encontraron archivos CHECKING_ en el histórico")
-
-        # ========== PICKING ==========
-        if df_picking:
-            df_final_picking = pd.concat(df_picking, ignore_index=True)
-
-            df_final_picking = df_final_picking.drop_duplicates()
+        if manifiesto:
+            manifiesto.guardar()
 
-            df_final_picking.to_csv(archivo_picking, index=False, sep="|", encoding="utf-8")
-            logging.info(f"✅ Consolidado PICKING generado: {archivo_picking}  Filas: {len(df_final_picking)}")
-        else:
-            logging.warning("⚠ No se encontraron archivos PICKING_ en el histórico")
+        return resultados
 
     except Exception as e:
         logging.error(f"❌ Error general en consolidado HISTÓRICO: {e}")
@@ -102,4 +85,16 @@ def Ejecutar_Consolidado_Historico():
 
 
 if __name__ == "__main__":
-    Ejecutar_Consolidado_Historico()
+    parser = argparse.ArgumentParser(description="Consolidado de HISTÓRICOS (CHECKING / PICKING)")
+    # Sin incremental ni diario: el histórico se reconstruye y no mueve archivos
+    agregar_argumentos(parser, omitir=("incremental", "diario"))
+    parser.add_argument(
+        "--sin-cache",
+        dest="cache",
+        action="store_false",
+        default=None,
+        help="Vuelve a parsear todos los archivos (ignora el manifiesto)"
+    )
+    args = parser.parse_args()
+
+    Ejecutar_Consolidado_Historico(opciones_historico(args), args.cache)
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+from src.Database.consulta import consultar, ruta_consulta
+from src.Consolidacion.reportes import REPORTES_FTP
+
+# =============================================================
+# ENV
+# =============================================================
+load_dotenv(".env")
+
+
+# =============================================================
+# CONSULTA POR CLAVE SOBRE EL ÍNDICE LOCAL
+# =============================================================
+# Ejemplos:
+#   python -m Scripts.Consultar_Consolidado PICKING Nro_Gestion 123456
+#   python -m Scripts.Consultar_Consolidado PARTES Codigo --desde A100 --hasta A199
+#   python -m Scripts.Consultar_Consolidado PARTES Nro_Pedido 98765 --csv pedido.csv
+def Ejecutar_Consulta(
+    reporte: str,
+    columna: str,
+    valor: str | None = None,
+    desde: str | None = None,
+    hasta: str | None = None,
+    limite: int | None = 1000,
+    csv: Path | None = None
+) -> int:
+
+    ruta = ruta_consulta(Path(os.getenv("RUTA_OUTPUT", ".")))
+
+    inicio = time.perf_counter()
+    df = consultar(ruta, reporte, columna, valor, desde, hasta, limite)
+    milisegundos = (time.perf_counter() - inicio) * 1000
+
+    if csv is not None:
+        df.to_csv(csv, index=False, sep="|", encoding="utf-8")
+        print(f"💾 {len(df)} fila(s) guardadas en {csv}")
+    elif not df.empty:
+        print(df.to_string(index=False))
+
+    print(f"🔎 {reporte} | {columna} | Filas: {len(df)} | {milisegundos:.1f} ms")
+    return len(df)
+
+
+# =============================================================
+# MAIN
+# =============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consulta por clave sobre el índice de consulta local")
+    parser.add_argument(
+        "reporte",
+        choices=[reporte.nombre for reporte in REPORTES_FTP],
+        help="Reporte a consultar"
+    )
+    parser.add_argument("columna", help="Columna de búsqueda (p. ej. Nro_Gestion, Codigo)")
+    parser.add_argument("valor", nargs="?", default=None, help="Valor exacto a buscar")
+    parser.add_argument("--desde", default=None, help="Inicio del rango (inclusive)")
+    parser.add_argument("--hasta", default=None, help="Fin del rango (inclusive)")
+    parser.add_argument("--limite", type=int, default=1000, help="Máximo de filas (0 = sin límite)")
+    parser.add_argument("--csv", type=Path, default=None, help="Guarda el resultado en un CSV en vez de mostrarlo")
+    args = parser.parse_args()
+
+    if args.valor is None and args.desde is None and args.hasta is None:
+        parser.error("indicar un valor o un rango (--desde / --hasta)")
+
+    try:
+        filas = Ejecutar_Consulta(
+            args.reporte,
+            args.columna,
+            args.valor,
+            args.desde,
+            args.hasta,
+            args.limite,
+            args.csv
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(e)
+        sys.exit(2)
+
+    sys.exit(0 if filas else 1)
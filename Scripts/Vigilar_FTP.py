@@ -0,0 +1,158 @@
+import os
+import time
+import argparse
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+from src.log.logging import configurar_logging, guardar_metricas, iniciar_metricas
+from src.Consolidacion.config import opcion_int
+from src.Consolidacion.motor import EXTENSIONES, Opciones, consolidar_reportes_ftp
+from src.Consolidacion.reportes import REPORTES_FTP
+
+# =============================================================
+# ENV
+# =============================================================
+load_dotenv(".env")
+
+PREFIJOS = tuple(reporte.prefijo for reporte in REPORTES_FTP)
+
+
+# =============================================================
+# DETECTAR ARCHIVOS COMPLETOS (TAMAÑO ESTABLE)
+# =============================================================
+# Un archivo se considera terminado de escribir cuando su tamaño y
+# mtime no cambian durante `lecturas_estables` sondeos seguidos.
+def detectar_listos(
+    ruta_ftp: Path,
+    estado: dict[Path, tuple[int, float, int]],
+    lecturas_estables: int,
+    fallidos: dict[Path, tuple[int, float]]
+) -> list[Path]:
+    listos = []
+    presentes = set()
+
+    for archivo in ruta_ftp.iterdir():
+        if archivo.is_dir() or archivo.suffix.lower() not in EXTENSIONES:
+            continue
+        if not archivo.name.upper().startswith(PREFIJOS):
+            continue
+
+        try:
+            stat = archivo.stat()
+        except FileNotFoundError:
+            continue
+
+        presentes.add(archivo)
+        firma = (stat.st_size, stat.st_mtime)
+        anterior = estado.get(archivo)
+
+        if anterior and anterior[:2] == firma and stat.st_size > 0:
+            conteo = anterior[2] + 1
+        else:
+            conteo = 0
+
+        estado[archivo] = (*firma, conteo)
+
+        # Un archivo que ya falló no se reintenta hasta que cambie
+        if fallidos.get(archivo) == firma:
+            continue
+
+        if conteo >= lecturas_estables:
+            listos.append(archivo)
+
+    for registro in (estado, fallidos):
+        for archivo in list(registro):
+            if archivo not in presentes:
+                del registro[archivo]
+
+    return listos
+
+
+# =============================================================
+# PROCESO PRINCIPAL – VIGILANCIA FTP
+# =============================================================
+def Ejecutar_Vigilancia(
+    intervalo: int | None = None,
+    lecturas_estables: int | None = None
+):
+
+    Archivo = Path(__file__).stem
+    configurar_logging(Archivo)
+
+    intervalo = opcion_int("VIGILANCIA_INTERVALO", intervalo, defecto=10)
+    lecturas_estables = opcion_int("VIGILANCIA_LECTURAS_ESTABLES", lecturas_estables, defecto=2)
+
+    ruta_ftp = Path(os.getenv("RUTA_FTP_FLEXY"))
+
+    logging.info(
+        f"👀 Vigilando {ruta_ftp} | Intervalo: {intervalo}s | "
+        f"Lecturas estables: {lecturas_estables}"
+    )
+
+    estado: dict[Path, tuple[int, float, int]] = {}
+    fallidos: dict[Path, tuple[int, float]] = {}
+
+    try:
+        while True:
+            try:
+                listos = detectar_listos(ruta_ftp, estado, lecturas_estables, fallidos)
+
+                if listos:
+                    logging.info(f"📥 {len(listos)} archivo(s) listos")
+
+                    # Una línea de métricas por lote (si no, las etapas se
+                    # acumulan en memoria hasta que se detiene el proceso)
+                    iniciar_metricas(Archivo)
+                    try:
+                        # Siempre incremental: cada lote se agrega al consolidado
+                        opciones = Opciones.desde_entorno(incremental=True)
+                        resultados = consolidar_reportes_ftp(REPORTES_FTP, opciones, listos)
+                    finally:
+                        guardar_metricas()
+
+                    for resultado in resultados:
+                        # Error del reporte completo (SQL caído, disco): se reintenta
+                        if resultado.error is not None:
+                            continue
+
+                        # Lo que no se movió a Procesado quedó con error
+                        archivos = resultado.procesados + [a for a, _ in resultado.fallidos]
+                        for archivo in archivos:
+                            anterior = estado.pop(archivo, None)
+                            if archivo.exists() and anterior:
+                                fallidos[archivo] = anterior[:2]
+                                logging.warning(f"⚠ {archivo.name} queda en espera hasta que cambie")
+
+            except Exception as e:
+                # Un ciclo con error no detiene la vigilancia
+                logging.error(f"❌ Error en ciclo de vigilancia: {e}")
+
+            time.sleep(intervalo)
+
+    except KeyboardInterrupt:
+        logging.info("🛑 Vigilancia detenida")
+
+
+# =============================================================
+# MAIN
+# =============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vigilancia de la carpeta FTP")
+    parser.add_argument(
+        "--intervalo",
+        type=int,
+        default=None,
+        help="Segundos entre sondeos de la carpeta"
+    )
+    parser.add_argument(
+        "--lecturas-estables",
+        type=int,
+        default=None,
+        help="Sondeos con tamaño sin cambios para considerar un archivo completo"
+    )
+    args = parser.parse_args()
+
+    Ejecutar_Vigilancia(
+        intervalo=args.intervalo,
+        lecturas_estables=args.lecturas_estables
+    )
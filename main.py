@@ -1,6 +1,66 @@
-import os
+import sys
+import argparse
+import logging
+from pathlib import Path
 from dotenv import load_dotenv
+from src.log.logging import configurar_logging
+from src.Consolidacion.motor import Opciones, agregar_argumentos, consolidar_reportes_ftp, informar_resumen
+from src.Consolidacion.reportes import REPORTES_FTP
 
+# =============================================================
+# ENV
+# =============================================================
+load_dotenv(".env")
+
+NOMBRES_FTP = [reporte.nombre for reporte in REPORTES_FTP]
+
+
+# =============================================================
+# PROCESO PRINCIPAL – TODOS LOS REPORTES FTP
+# =============================================================
+# Un solo proceso: la carpeta FTP se recorre una vez y cada archivo va
+# a su reporte por prefijo. Imports, cachés (codificación, encabezados,
+# Excel) y el pool SQL se comparten entre reportes.
+def Ejecutar_Consolidados(
+    reportes: list[str] | None = None,
+    opciones: Opciones | None = None
+) -> bool:
+
+    Archivo = Path(__file__).stem
+    configurar_logging(Archivo)
+
+    seleccion = [r for r in REPORTES_FTP if not reportes or r.nombre in reportes]
+    logging.info(f"🚀 Iniciando consolidados FTP – {', '.join(r.nombre for r in seleccion)}")
+
+    opciones = opciones or Opciones.desde_entorno()
+
+    try:
+        resultados = consolidar_reportes_ftp(seleccion, opciones)
+    except Exception as e:
+        logging.error(f"❌ Error general en consolidados FTP: {e}")
+        return False
+
+    correcto = informar_resumen(resultados)
+    logging.info("🏁 Consolidados FTP finalizados" + ("" if correcto else " con errores"))
+    return correcto
+
+
+# =============================================================
+# MAIN
+# =============================================================
 if __name__ == "__main__":
-    load_dotenv()
-    print("🚀 Proyecto iniciado correctamente")
+    parser = argparse.ArgumentParser(description="Consolidados FTP (todos los reportes en un proceso)")
+    parser.add_argument(
+        "--reportes",
+        nargs="+",
+        choices=NOMBRES_FTP,
+        default=None,
+        help="Reportes a consolidar (por defecto todos)"
+    )
+    agregar_argumentos(parser)
+    args = parser.parse_args()
+
+    correcto = Ejecutar_Consolidados(args.reportes, Opciones.desde_args(args))
+
+    # Código de salida para el programador de tareas: 1 si algo falló
+    sys.exit(0 if correcto else 1)
@@ -0,0 +1,209 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# =============================================================
+# GENERADOR DE ARCHIVOS SINTÉTICOS (PICKING / PARTES / HISTÓRICO)
+# =============================================================
+# Reproduce los dos esquemas de encabezado que llegan por FTP, con
+# tildes en latin-1 y una fracción configurable de filas duplicadas.
+EMPRESAS = ["VILLA", "DISTRIBUIDORA AÑAÑUCA", "COMERCIAL PEÑALOLÉN", "LOGÍSTICA SUR"]
+PICKERS = ["José Muñoz", "María Ñancupil", "Inés Gómez", "Andrés Pérez", "Begoña Díaz"]
+ESTADOS_GESTION = ["CERRADA", "EN PROCESO", "ANULADA"]
+TIPOS_GESTION = ["Despacho", "Reposición", "Devolución"]
+MOVIMIENTOS = ["Ingreso", "Salida", "Ajuste", "Transferencia"]
+PRODUCTOS = ["Café Grano", "Azúcar Rubia", "Té Limón", "Jamón Serrano", "Piñones"]
+
+ENCABEZADOS_PICKING = [
+    {
+        "Fecha_Creacion_Gestion": "Fecha Creacion Gestion",
+        "Nro_Gestion": "Nro. Gestion",
+        "Est_Gestion": "Estado Gestion",
+        "Nro_OP": "Nro. OP",
+        "Nro_Orden": "Nro. Orden",
+        "Est_OP": "Estado OP",
+        "Nro_Documento": "Nro. Documento",
+        "Tipo_Gestion": "Tipo Gestion",
+        "Picker": "Picker",
+        "Fecha_Inicio_Picker": "Fecha Inicio Picker",
+        "Fecha_Cierre_Picker": "Fecha Cierre Picker",
+        "Tiempo_Recorrido_Picker": "Tiempo Recorrido Picker",
+        "Tiempo_Mov_Prom_Picker": "Tiempo Promedio Movimiento Picker",
+        "Nro_Codigos": "Nro. Productos",
+        "Nro_Ubicaciones": "Nro. Ubicaciones",
+        "Cantidad_Solicitada": "Cantidad Solicitada",
+        "Cantidad_Picking": "Cantidad Picking",
+        "Glosa": "Glosa",
+        "Empresa": "Empresa"
+    },
+    {
+        "Fecha_Creacion_Gestion": "Fecha Creación Gestion",
+        "Nro_Gestion": "Nro Gestión",
+        "Est_Gestion": "Estado Gestión",
+        "Nro_OP": "Nro OP",
+        "Nro_Orden": "Nro Orden",
+        "Est_OP": "Estado OP",
+        "Nro_Documento": "Nro Documento",
+        "Tipo_Gestion": "Tipo Gestión",
+        "Picker": "Picker",
+        "Fecha_Inicio_Picker": "Fecha Inicio Picker",
+        "Fecha_Cierre_Picker": "Fecha Cierre Picker",
+        "Tiempo_Recorrido_Picker": "Tiempo Recorrido Picker",
+        "Tiempo_Mov_Prom_Picker": "Tiempo Movimiento Prom. Picker",
+        "Nro_Codigos": "Nro Códigos",
+        "Nro_Ubicaciones": "Nro Ubicaciones",
+        "Cantidad_Solicitada": "Cantidad Solicitada",
+        "Cantidad_Picking": "Cantidad Picking",
+        "Glosa": "Glosa",
+        "Empresa": "Empresa"
+    }
+]
+
+ENCABEZADOS_PARTES = [
+    {
+        "Fecha": "Fecha",
+        "Movimiento": "Movimiento",
+        "Nro_Pedido": "Nro. Pedido",
+        "Estado": "Estado",
+        "Codigo": "Código",
+        "Producto": "Producto",
+        "Bultos_Totales": "Bultos Totales",
+        "Ingresos": "Ingresos",
+        "Salidas": "Salidas",
+        "Nro_Orden": "Nro. Orden",
+        "Empresa": "Empresa"
+    },
+    {
+        "Fecha": "Fecha",
+        "Movimiento": "Mov. Almacén",
+        "Nro_Pedido": "Nro Pedido",
+        "Estado": "Estado",
+        "Codigo": "Código Producto",
+        "Producto": "Producto",
+        "Bultos_Totales": "Bultos Totales",
+        "Ingresos": "Ingresos",
+        "Salidas": "Salidas",
+        "Nro_Orden": "Nro Orden",
+        "Empresa": "Empresa"
+    }
+]
+
+
+def _fechas(rng: np.random.Generator, filas: int, formato: str) -> pd.Series:
+    base = np.datetime64("2024-01-01T00:00:00")
+    segundos = rng.integers(0, 365 * 24 * 3600, filas)
+    return pd.Series(base + segundos.astype("timedelta64[s]")).dt.strftime(formato)
+
+
+def _duraciones(rng: np.random.Generator, filas: int, maximo: int) -> pd.Series:
+    # Duraciones HH:MM:SS menores a un día, como las exporta el WMS
+    segundos = rng.integers(0, maximo, filas)
+    return pd.Series(pd.to_datetime(segundos, unit="s")).dt.strftime("%H:%M:%S")
+
+
+def _elegir(rng: np.random.Generator, valores: list[str], filas: int) -> np.ndarray:
+    return np.asarray(valores, dtype=object)[rng.integers(0, len(valores), filas)]
+
+
+def _con_duplicados(df: pd.DataFrame, rng: np.random.Generator, ratio: float) -> pd.DataFrame:
+    n_dup = int(len(df) * ratio)
+    if not n_dup:
+        return df
+    # Reemplaza filas al azar por copias de otras filas del mismo archivo
+    destino = rng.choice(len(df), n_dup, replace=False)
+    origen = rng.integers(0, len(df), n_dup)
+    df.iloc[destino] = df.iloc[origen].to_numpy()
+    return df
+
+
+def generar_picking(filas: int, rng: np.random.Generator, duplicados: float = 0.0) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "Fecha_Creacion_Gestion": _fechas(rng, filas, "%Y-%m-%d %H:%M:%S"),
+        "Nro_Gestion": rng.integers(1, filas // 3 + 2, filas).astype(str),
+        "Est_Gestion": _elegir(rng, ESTADOS_GESTION, filas),
+        "Nro_OP": rng.integers(100000, 999999, filas).astype(str),
+        "Nro_Orden": rng.integers(1, filas // 2 + 2, filas).astype(str),
+        "Est_OP": _elegir(rng, ESTADOS_GESTION, filas),
+        "Nro_Documento": rng.integers(1, 10**7, filas).astype(str),
+        "Tipo_Gestion": _elegir(rng, TIPOS_GESTION, filas),
+        "Picker": _elegir(rng, PICKERS, filas),
+        "Fecha_Inicio_Picker": _fechas(rng, filas, "%Y-%m-%d %H:%M:%S"),
+        "Fecha_Cierre_Picker": _fechas(rng, filas, "%Y-%m-%d %H:%M:%S"),
+        "Tiempo_Recorrido_Picker": _duraciones(rng, filas, 4 * 3600),
+        "Tiempo_Mov_Prom_Picker": _duraciones(rng, filas, 600),
+        "Nro_Codigos": rng.integers(1, 40, filas).astype(str),
+        "Nro_Ubicaciones": rng.integers(1, 60, filas).astype(str),
+        "Cantidad_Solicitada": rng.integers(1, 500, filas).astype(str),
+        "Cantidad_Picking": rng.integers(0, 500, filas).astype(str),
+        "Glosa": _elegir(rng, ["Pedido urgente", "Reposición góndola", "Devolución cliente", ""], filas),
+        "Empresa": _elegir(rng, EMPRESAS, filas)
+    })
+    return _con_duplicados(df, rng, duplicados)
+
+
+def generar_partes(filas: int, rng: np.random.Generator, duplicados: float = 0.0) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "Fecha": _fechas(rng, filas, "%d-%m-%Y"),
+        "Movimiento": _elegir(rng, MOVIMIENTOS, filas),
+        "Nro_Pedido": rng.integers(1, filas // 4 + 2, filas).astype(str),
+        "Estado": _elegir(rng, ["Confirmado", "Pendiente", "Anulado"], filas),
+        "Codigo": np.char.add("P", rng.integers(1000, 9999, filas).astype(str)),
+        "Producto": _elegir(rng, PRODUCTOS, filas),
+        "Bultos_Totales": rng.integers(1, 50, filas).astype(str),
+        "Ingresos": rng.integers(0, 100, filas).astype(str),
+        "Salidas": rng.integers(0, 100, filas).astype(str),
+        "Nro_Orden": rng.integers(1, filas // 2 + 2, filas).astype(str),
+        "Empresa": _elegir(rng, EMPRESAS, filas)
+    })
+    return _con_duplicados(df, rng, duplicados)
+
+
+# =============================================================
+# ESCRITURA DE LOTES
+# =============================================================
+def _escribir(df: pd.DataFrame, ruta: Path, encoding: str = "latin-1") -> Path:
+    if ruta.suffix == ".xlsx":
+        df.to_excel(ruta, index=False, engine="openpyxl")
+    else:
+        df.to_csv(ruta, index=False, sep=",", encoding=encoding)
+    return ruta
+
+
+def generar_lote(
+    directorio: Path,
+    filas: int,
+    archivos: int,
+    duplicados: float = 0.1,
+    formatos: tuple[str, ...] = ("csv", "xlsx"),
+    semilla: int = 0
+) -> dict[str, list[Path]]:
+    directorio.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(semilla)
+
+    generados: dict[str, list[Path]] = {"PICKING": [], "PARTES": [], "CHECKING_": [], "PICKING_": []}
+
+    for i in range(archivos):
+        formato = formatos[i % len(formatos)]
+        esquema = i % 2
+
+        df = generar_picking(filas, rng, duplicados)
+        df = df.rename(columns=ENCABEZADOS_PICKING[esquema])
+        generados["PICKING"].append(
+            _escribir(df, directorio / f"PROD_ANALISIS_PICKING_{i:03d}.{formato}")
+        )
+        generados["PICKING_"].append(
+            # El histórico se exporta a mano desde Excel (UTF-8)
+            _escribir(df, directorio / f"PICKING_{2020 + i}.{formato}", "utf-8")
+        )
+
+        df = generar_partes(filas, rng, duplicados)
+        df = df.rename(columns=ENCABEZADOS_PARTES[esquema])
+        generados["PARTES"].append(
+            _escribir(df, directorio / f"PROD_ANALISIS_PARTES_{i:03d}.{formato}")
+        )
+        generados["CHECKING_"].append(
+            _escribir(df, directorio / f"CHECKING_{2020 + i}.{formato}", "utf-8")
+        )
+
+    return generados
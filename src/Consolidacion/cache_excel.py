@@ -0,0 +1,105 @@
+import os
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from src.Consolidacion.config import opcion_bool, opcion_int
+from src.Consolidacion.manifiesto import hash_archivo
+
+# =============================================================
+# CACHÉ DE EXCEL PARSEADOS (POR HASH DE CONTENIDO)
+# =============================================================
+# openpyxl es por lejos el paso más lento. El frame leído y limpio
+# (todo texto, sin espacios) se guarda en Feather con el hash del
+# contenido como nombre: un re-drop, una re-ejecución o el mismo libro
+# en el histórico se leen desde la caché. Cada acierto actualiza el
+# mtime y se expulsan los menos usados cuando se pasa del límite.
+# Sin pyarrow la caché queda desactivada y se lee el Excel directo.
+EXTENSIONES_EXCEL = [".xlsx", ".xls"]
+
+_sin_pyarrow_informado = False
+
+
+def _importar_feather():
+    global _sin_pyarrow_informado
+    try:
+        from pyarrow import feather
+    except ImportError:
+        if not _sin_pyarrow_informado:
+            _sin_pyarrow_informado = True
+            logging.warning("⚠ Caché de Excel desactivada: requiere pyarrow (pip install pyarrow)")
+        return None
+    return feather
+
+
+def ruta_cache_excel() -> Path:
+    # Junto a los consolidados (no depende de la carpeta desde donde se corre);
+    # la comparten el FTP y el histórico
+    return Path(os.getenv("RUTA_CACHE_EXCEL") or Path(os.getenv("RUTA_OUTPUT") or ".") / "Cache" / "Excel")
+
+
+def _leer_excel(archivo: Path) -> pd.DataFrame:
+    # openpyxl solo lee .xlsx; para .xls (histórico) pandas elige el motor
+    motor = "openpyxl" if archivo.suffix.lower() == ".xlsx" else None
+    df = pd.read_excel(archivo, dtype=str, engine=motor)
+    return df.apply(lambda col: col.astype(str).str.strip())
+
+
+def _expulsar(directorio: Path, limite_bytes: int) -> None:
+    entradas = []
+    for ruta in directorio.glob("*.feather"):
+        try:
+            estado = ruta.stat()
+        except FileNotFoundError:
+            continue
+        entradas.append((estado.st_mtime, estado.st_size, ruta))
+
+    total = sum(tamano for _, tamano, _ in entradas)
+
+    # Menos usados primero
+    for _, tamano, ruta in sorted(entradas, key=lambda e: e[0]):
+        if total <= limite_bytes:
+            break
+        ruta.unlink(missing_ok=True)
+        total -= tamano
+        logging.info(f"🧹 Caché Excel: expulsado {ruta.name}")
+
+
+def leer_excel_cacheado(archivo: Path, cache: bool | None = None) -> pd.DataFrame:
+    cache = opcion_bool("CACHE_EXCEL", cache, defecto=True)
+    feather = _importar_feather() if cache else None
+
+    if feather is None:
+        return _leer_excel(archivo)
+
+    directorio = ruta_cache_excel()
+    directorio.mkdir(parents=True, exist_ok=True)
+    ruta = directorio / f"{hash_archivo(archivo)}.feather"
+
+    try:
+        df = feather.read_feather(ruta)
+        os.utime(ruta)
+        logging.info(f"⚡ Caché Excel: {archivo.name}")
+        return df
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"⚠ Caché Excel dañada para {archivo.name}, se vuelve a leer: {e}")
+        ruta.unlink(missing_ok=True)
+
+    df = _leer_excel(archivo)
+
+    # Escritura atómica: varios procesos pueden leer el mismo libro
+    temporal = ruta.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        feather.write_feather(df, temporal)
+        os.replace(temporal, ruta)
+    except Exception as e:
+        # Encabezados no texto, tipos raros...: se sigue sin caché
+        temporal.unlink(missing_ok=True)
+        logging.warning(f"⚠ No se pudo cachear {archivo.name}: {e}")
+        return df
+
+    _expulsar(directorio, opcion_int("CACHE_EXCEL_MB", defecto=1024) * 1024 * 1024)
+    return df
@@ -0,0 +1,138 @@
+import os
+import re
+import json
+import codecs
+import logging
+from pathlib import Path
+
+# =============================================================
+# DETECCIÓN DE CODIFICACIÓN (MUESTRA + CACHÉ POR ORIGEN)
+# =============================================================
+# Solo se leen los primeros KB del archivo:
+#   1. BOM -> utf-8-sig / utf-16
+#   2. UTF-8 estricto sobre la muestra (recortando un carácter partido
+#      al final) -> utf-8
+#   3. Muestra solo ASCII -> lo último visto para el mismo origen
+#   4. chardet -> latin-1 para las occidentales de un byte (nunca falla)
+# El resultado se recuerda por origen (prefijo del nombre, p. ej.
+# PROD_ANALISIS_PICKING) y se guarda en disco entre corridas.
+# Los lectores decodifican estricto: si más adelante aparece un byte que
+# la muestra no anticipó, se relee en latin-1 (corregir_codificacion).
+POR_DEFECTO = "latin-1"
+TAMANO_MUESTRA = 8 * 1024
+
+# Lo que chardet suele devolver para archivos en español de Windows
+_OCCIDENTALES = {"iso-8859-1", "windows-1252", "iso-8859-15", "ascii"}
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16")
+]
+
+_por_origen: dict[str, str] | None = None
+
+
+def ruta_cache_codificacion() -> Path:
+    return Path(
+        os.getenv("RUTA_CACHE_CODIFICACION")
+        or Path(os.getenv("RUTA_OUTPUT") or ".") / "Cache" / "codificaciones.json"
+    )
+
+
+def origen_archivo(archivo: Path) -> str:
+    # Todo lo anterior al primer dígito: PROD_ANALISIS_PARTES_20240501 -> PROD_ANALISIS_PARTES
+    return re.match(r"\D*", archivo.stem).group().strip("_- ").upper() or archivo.stem.upper()
+
+
+def _cache() -> dict[str, str]:
+    global _por_origen
+    if _por_origen is None:
+        try:
+            _por_origen = json.loads(ruta_cache_codificacion().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _por_origen = {}
+    return _por_origen
+
+
+def _recordar(origen: str, codificacion: str) -> None:
+    cache = _cache()
+    if cache.get(origen) == codificacion:
+        return
+
+    if origen in cache:
+        logging.warning(f"⚠ {origen} cambió de codificación: {cache[origen]} → {codificacion}")
+    cache[origen] = codificacion
+
+    ruta = ruta_cache_codificacion()
+    try:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        temporal = ruta.with_suffix(f".{os.getpid()}.tmp")
+        temporal.write_text(json.dumps(cache, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporal, ruta)
+    except OSError as e:
+        logging.warning(f"⚠ No se pudo guardar la caché de codificaciones: {e}")
+
+
+def _es_utf8(muestra: bytes, completa: bool) -> bool:
+    try:
+        muestra.decode("utf-8")
+        return True
+    except UnicodeDecodeError as e:
+        # Un carácter multibyte cortado por el tamaño de la muestra
+        return not completa and e.reason == "unexpected end of data" and e.start >= len(muestra) - 3
+
+
+def _chardet(muestra: bytes) -> str | None:
+    try:
+        import chardet
+    except ImportError:
+        return None
+
+    resultado = chardet.detect(muestra)
+    codificacion = (resultado.get("encoding") or "").lower()
+    if not codificacion or (resultado.get("confidence") or 0) < 0.5:
+        return None
+    if codificacion in _OCCIDENTALES:
+        return POR_DEFECTO
+
+    try:
+        return codecs.lookup(codificacion).name
+    except LookupError:
+        return None
+
+
+def detectar_codificacion(archivo: Path) -> str:
+    with open(archivo, "rb") as f:
+        muestra = f.read(TAMANO_MUESTRA)
+        completa = len(muestra) < TAMANO_MUESTRA
+
+    for bom, codificacion in _BOMS:
+        if muestra.startswith(bom):
+            return codificacion
+
+    origen = origen_archivo(archivo)
+
+    if muestra.isascii():
+        return _cache().get(origen, POR_DEFECTO)
+
+    if _es_utf8(muestra, completa):
+        codificacion = "utf-8"
+    else:
+        codificacion = _chardet(muestra) or POR_DEFECTO
+
+    _recordar(origen, codificacion)
+    return codificacion
+
+
+def corregir_codificacion(archivo: Path, codificacion: str, error: UnicodeDecodeError) -> str:
+    # latin-1 decodifica cualquier byte: si también falla, es otro problema
+    if codificacion == POR_DEFECTO:
+        raise error
+
+    logging.warning(
+        f"⚠ {archivo.name}: bytes que no son {codificacion} después de la muestra "
+        f"({error.reason}); se relee en {POR_DEFECTO}"
+    )
+    _recordar(origen_archivo(archivo), POR_DEFECTO)
+    return POR_DEFECTO
@@ -0,0 +1,158 @@
+import gzip
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+# =============================================================
+# SALIDA CSV COMPRIMIDA (GZIP / ZSTD EN BLOQUES PARALELOS)
+# =============================================================
+# El texto que escribe to_csv se junta en bloques de unos MB; cada
+# bloque se comprime en un hilo (zlib y zstd sueltan el GIL) como un
+# miembro gzip / frame zstd independiente y se escribe en orden. Un
+# archivo con varios miembros / frames es válido y pandas lo lee igual.
+# Cada append (corrida incremental) agrega miembros al final.
+# zstandard es opcional: solo se exige si se pide salida zstd.
+EXTENSIONES = {"gzip": ".gz", "zstd": ".zst"}
+NIVEL_DEFECTO = {"gzip": 6, "zstd": 3}
+
+
+def _importar_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("❌ Salida zstd requiere zstandard (pip install zstandard)") from e
+    return zstandard
+
+
+@dataclass(frozen=True)
+class Compresion:
+    formato: str
+    # 0 = nivel por defecto del formato
+    nivel: int = 0
+    hilos: int = 4
+
+    def __post_init__(self):
+        if self.formato not in EXTENSIONES:
+            raise ValueError(f"❌ Compresión no soportada: {self.formato} (gzip / zstd)")
+
+    def nivel_efectivo(self) -> int:
+        return self.nivel or NIVEL_DEFECTO[self.formato]
+
+
+def ruta_comprimida(salida: Path, compresion: Compresion | None) -> Path:
+    if compresion is None:
+        return salida
+    return salida.with_name(salida.name + EXTENSIONES[compresion.formato])
+
+
+def ruta_base(salida: Path) -> Path:
+    # Consolidado.csv.gz -> Consolidado.csv (Parquet, delta: mismo nombre)
+    return salida.with_suffix("") if salida.suffix in EXTENSIONES.values() else salida
+
+
+class SalidaComprimida:
+    # Objeto tipo archivo de texto para to_csv. tell() cierra el bloque en
+    # curso y devuelve la posición en el archivo comprimido: truncar ahí
+    # deja un archivo válido (así se deshace un archivo que falló a mitad).
+
+    def __init__(
+        self,
+        ruta: Path,
+        modo: str,
+        compresion: Compresion,
+        tamano_bloque: int = 4 * 1024 * 1024
+    ):
+        self.compresion = compresion
+        self.nivel = compresion.nivel_efectivo()
+        self.tamano_bloque = tamano_bloque
+        self.hilos = max(compresion.hilos, 1)
+
+        if compresion.formato == "zstd":
+            self._zstd = _importar_zstandard()
+            # Un compresor por hilo: ZstdCompressor no es seguro entre hilos
+            self._locales = threading.local()
+
+        self._archivo = open(ruta, "ab" if modo == "a" else "wb")
+        self._pool = ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix="compresion")
+        self._pendientes: deque = deque()
+        self._partes: list[str] = []
+        self._tamano = 0
+
+    def _comprimir(self, datos: bytes) -> bytes:
+        if self.compresion.formato == "gzip":
+            return gzip.compress(datos, compresslevel=self.nivel, mtime=0)
+
+        compresor = getattr(self._locales, "compresor", None)
+        if compresor is None:
+            compresor = self._locales.compresor = self._zstd.ZstdCompressor(level=self.nivel)
+        return compresor.compress(datos)
+
+    def _escribir_primero(self) -> None:
+        self._archivo.write(self._pendientes.popleft().result())
+
+    def _enviar(self) -> None:
+        if not self._partes:
+            return
+        datos = "".join(self._partes).encode("utf-8")
+        self._partes = []
+        self._tamano = 0
+
+        self._pendientes.append(self._pool.submit(self._comprimir, datos))
+        # Cola acotada: la serialización no va más de 2 bloques por hilo adelante
+        while len(self._pendientes) > self.hilos * 2:
+            self._escribir_primero()
+
+    def write(self, texto: str) -> int:
+        self._partes.append(texto)
+        self._tamano += len(texto)
+        if self._tamano >= self.tamano_bloque:
+            self._enviar()
+        return len(texto)
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        self._enviar()
+        while self._pendientes:
+            self._escribir_primero()
+        self._archivo.flush()
+
+    def tell(self) -> int:
+        self.flush()
+        return self._archivo.tell()
+
+    def seek(self, posicion: int) -> int:
+        self.flush()
+        return self._archivo.seek(posicion)
+
+    def truncate(self) -> int:
+        return self._archivo.truncate()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *_):
+        if tipo is None:
+            self.close()
+            return
+        # Con error no hace falta terminar de comprimir lo pendiente
+        self._pendientes.clear()
+        self._partes = []
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._archivo.close()
+
+
+def abrir_salida(ruta: Path, modo: str = "w", compresion: Compresion | None = None):
+    if compresion is None:
+        return open(ruta, modo, encoding="utf-8", newline="")
+    return SalidaComprimida(ruta, modo, compresion)
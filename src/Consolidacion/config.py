@@ -0,0 +1,26 @@
+import os
+
+# =============================================================
+# OPCIONES DE EJECUCIÓN (ARGUMENTO > VARIABLE DE ENTORNO)
+# =============================================================
+_VERDADEROS = {"1", "true", "si", "sí", "s", "yes", "y"}
+
+
+def opcion_bool(nombre_env: str, valor: bool | None = None, defecto: bool = False) -> bool:
+    if valor is not None:
+        return bool(valor)
+    texto = os.getenv(nombre_env, "").strip().lower()
+    return texto in _VERDADEROS if texto else defecto
+
+
+def opcion_int(nombre_env: str, valor: int | None = None, defecto: int = 0) -> int:
+    if valor is not None:
+        return int(valor)
+    texto = os.getenv(nombre_env, "").strip()
+    return int(texto) if texto else defecto
+
+
+def opcion_texto(nombre_env: str, valor: str | None = None, defecto: str = "") -> str:
+    if valor is not None:
+        return str(valor).strip().lower()
+    return os.getenv(nombre_env, "").strip().lower() or defecto
@@ -0,0 +1,102 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.Consolidacion.config import opcion_bool, opcion_int, opcion_texto
+from src.Consolidacion.indice_hash import hash_filas
+
+# =============================================================
+# DEDUPLICACIÓN POR HASH DE FILA
+# =============================================================
+# En vez de que drop_duplicates arme tablas sobre columnas de texto, se
+# hashea cada fila (o la clave de negocio) a 64 bits, o 128 con un
+# segundo hash de otra clave, y se deduplica sobre ese arreglo compacto.
+# Con verificación, cada fila marcada como duplicada se compara contra
+# la que se conserva: si en realidad difiere (colisión) se conserva.
+CLAVE_HASH_2 = "fedcba9876543210"
+
+
+def _iguales(a: pd.Series, b: pd.Series) -> np.ndarray:
+    if isinstance(a.dtype, pd.CategoricalDtype):
+        # Misma columna, mismas categorías: alcanza con los códigos
+        return a.cat.codes.to_numpy() == b.cat.codes.to_numpy()
+
+    a = a.reset_index(drop=True)
+    b = b.reset_index(drop=True)
+    nulos = (a.isna() & b.isna()).to_numpy()
+    # eq con Int64 / boolean devuelve NA (no False) donde hay nulos
+    return a.eq(b).fillna(False).to_numpy(dtype=bool) | nulos
+
+
+def _verificar(
+    df: pd.DataFrame,
+    columnas: list[str],
+    codigos: np.ndarray,
+    duplicadas: np.ndarray,
+    conservar: str
+) -> np.ndarray:
+    filas = np.flatnonzero(duplicadas)
+    if not len(filas):
+        return duplicadas
+
+    # Fila que se conserva para cada hash (primera o última aparición)
+    orden = np.arange(len(codigos))
+    if conservar == "last":
+        orden = orden[::-1]
+    _, primeras = np.unique(codigos[orden], return_index=True)
+    representante = np.empty(codigos.max() + 1, dtype=np.int64)
+    representante[np.unique(codigos[orden])] = orden[primeras]
+
+    referencias = representante[codigos[filas]]
+    coinciden = np.ones(len(filas), dtype=bool)
+    for col in columnas:
+        serie = df[col]
+        coinciden &= _iguales(serie.iloc[filas], serie.iloc[referencias])
+
+    colisiones = int((~coinciden).sum())
+    if colisiones:
+        logging.warning(f"⚠ Dedup: {colisiones} colisiones de hash verificadas, se conservan")
+        duplicadas = duplicadas.copy()
+        duplicadas[filas[~coinciden]] = False
+
+    return duplicadas
+
+
+def deduplicar(
+    df: pd.DataFrame,
+    columnas: list[str] | None = None,
+    conservar: str | None = None,
+    bits: int | None = None,
+    verificar: bool | None = None
+) -> pd.DataFrame:
+    conservar = opcion_texto("DEDUP_CONSERVAR", conservar, defecto="first")
+    bits = opcion_int("DEDUP_BITS", bits, defecto=64)
+    verificar = opcion_bool("DEDUP_VERIFICAR", verificar)
+
+    if conservar not in ("first", "last"):
+        raise ValueError(f"conservar debe ser 'first' o 'last': {conservar}")
+    if bits not in (64, 128):
+        raise ValueError(f"DEDUP_BITS debe ser 64 o 128: {bits}")
+
+    if df.empty:
+        return df
+
+    columnas = list(df.columns) if columnas is None else list(columnas)
+
+    hashes = hash_filas(df, columnas)
+    if bits == 128:
+        # Dos uint64 independientes -> una sola clave de 16 bytes
+        pares = np.empty((len(df), 2), dtype=np.uint64)
+        pares[:, 0] = hashes
+        pares[:, 1] = hash_filas(df, columnas, CLAVE_HASH_2)
+        codigos = np.unique(pares.view("V16").ravel(), return_inverse=True)[1].ravel()
+    else:
+        codigos = pd.factorize(hashes)[0]
+
+    duplicadas = pd.Series(codigos).duplicated(keep=conservar).to_numpy()
+
+    if verificar:
+        duplicadas = _verificar(df, columnas, codigos, duplicadas, conservar)
+
+    return df[~duplicadas]
@@ -0,0 +1,159 @@
+import os
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.Consolidacion.compresion import ruta_base
+from src.Consolidacion.indice_hash import ConjuntoHashes, hash_filas, preparar_incremental
+
+# =============================================================
+# DELTA POR CORRIDA (SOLO FILAS VISTAS POR PRIMERA VEZ)
+# =============================================================
+# Cada corrida deja en la carpeta Delta:
+#   <consolidado>_DELTA_<AAAAMMDD_HHMMSS>.csv   filas nuevas de la corrida
+#   <consolidado>_CORRIDA_<AAAAMMDD_HHMMSS>.json archivos origen y conteos
+# Así las cargas posteriores leen solo lo del día y no el consolidado.
+# - Corrida incremental: el delta es lo que se agrega al consolidado.
+# - Corrida completa: se compara contra el índice de hashes (.idx) de la
+#   versión anterior (la exportación lo reescribe con el nuevo).
+def ruta_delta(ruta_salida: Path) -> Path:
+    return Path(os.getenv("RUTA_DELTA") or ruta_salida / "Delta")
+
+
+class EscritorDelta:
+
+    def __init__(
+        self,
+        salida: Path,
+        directorio: Path,
+        clave: list[str] | None = None,
+        tipos: dict[str, str] | None = None,
+        incremental: bool = False
+    ):
+        self.salida = salida
+        self.clave = clave
+        self.incremental = incremental
+
+        self.inicio = datetime.now()
+        self.sello = self.inicio.strftime("%Y%m%d_%H%M%S")
+        self.directorio = directorio
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.nombre = ruta_base(salida).stem
+        self.ruta: Path | None = directorio / f"{self.nombre}_DELTA_{self.sello}.csv"
+        self._temporal = self.ruta.with_suffix(".tmp")
+
+        # Completa: hay que leer el índice antes de que se pise el consolidado
+        self._previas = None
+        if not incremental:
+            self._previas = ConjuntoHashes(preparar_incremental(salida, clave, tipos))
+
+        self._f = None
+        self.filas = 0
+
+    def _abrir(self) -> None:
+        if self._f is None:
+            self._f = open(self._temporal, "w", encoding="utf-8", newline="")
+
+    def escribir(self, df: pd.DataFrame) -> None:
+        self._abrir()
+
+        nuevas = df
+        if not self.incremental:
+            # Al delta van las filas que no estaban en el consolidado anterior
+            nuevas = df[~self._previas.contiene(hash_filas(df, self.clave))]
+
+        nuevas.to_csv(self._f, header=self._f.tell() == 0, index=False, sep="|")
+        self.filas += len(nuevas)
+
+    # Permite descartar lo escrito de un archivo que falló a mitad
+    def marca(self) -> tuple[int, int]:
+        self._abrir()
+        self._f.flush()
+        return self._f.tell(), self.filas
+
+    def deshacer(self, marca: tuple[int, int]) -> None:
+        posicion, self.filas = marca
+        self._f.seek(posicion)
+        self._f.truncate()
+
+    def _cerrar_archivos(self) -> None:
+        if self._f is not None:
+            self._f.close()
+        self._f = None
+
+    def confirmar(self) -> int:
+        escrito = self._f is not None
+        self._cerrar_archivos()
+
+        if escrito:
+            os.replace(self._temporal, self.ruta)
+        else:
+            self.ruta = None
+
+        logging.info(f"🆕 Delta {self.nombre}: {self.ruta} | Filas nuevas: {self.filas}")
+        return self.filas
+
+    def descartar(self) -> None:
+        self._cerrar_archivos()
+        self._temporal.unlink(missing_ok=True)
+        self.ruta = None
+
+
+def exportar_delta(escritor: EscritorDelta, df: pd.DataFrame) -> int:
+    try:
+        escritor.escribir(df)
+    except Exception:
+        escritor.descartar()
+        raise
+    return escritor.confirmar()
+
+
+# =============================================================
+# REGISTRO DE LA CORRIDA (JSON AL LADO DEL DELTA)
+# =============================================================
+def registrar_corrida(
+    escritor: EscritorDelta,
+    reporte: str,
+    modo: str,
+    procesados: list[Path],
+    leidas: dict[str, int],
+    fallidos: list[tuple[Path, str]],
+    filas: int,
+    totales: dict[str, float]
+) -> Path:
+    # Se llama antes de mover los archivos a Procesado (tamaño y mtime)
+    def origen(archivo: Path) -> dict:
+        stat = archivo.stat()
+        return {
+            "archivo": archivo.name,
+            "tamano": stat.st_size,
+            "mtime": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+            "filas": leidas.get(archivo.name)
+        }
+
+    registro = {
+        "reporte": reporte,
+        "corrida": escritor.sello,
+        "inicio": escritor.inicio.isoformat(timespec="seconds"),
+        "fin": datetime.now().isoformat(timespec="seconds"),
+        "modo": modo,
+        "incremental": escritor.incremental,
+        "consolidado": str(escritor.salida),
+        "delta": escritor.ruta.name if escritor.ruta else None,
+        "archivos": [origen(archivo) for archivo in procesados],
+        "fallidos": [{"archivo": archivo.name, "error": error} for archivo, error in fallidos],
+        "filas_leidas": int(sum(leidas.values())),
+        "filas_exportadas": int(filas),
+        "filas_delta": int(escritor.filas),
+        "totales": {col: float(total) for col, total in totales.items()}
+    }
+
+    ruta = escritor.directorio / f"{escritor.nombre}_CORRIDA_{escritor.sello}.json"
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(registro, f, ensure_ascii=False, indent=2)
+
+    logging.info(f"🧾 Registro de corrida {reporte}: {ruta.name}")
+    return ruta
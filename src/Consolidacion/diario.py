@@ -0,0 +1,216 @@
+import os
+import json
+import shutil
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from src.Consolidacion.indice_hash import ruta_indice
+
+# =============================================================
+# DIARIO DE CORRIDA (LEÍDO -> CONFIRMADO -> MOVIDO)
+# =============================================================
+# Un JSON por reporte en la carpeta Diario, mientras dura la corrida:
+#   en_curso:   se está leyendo / exportando; se guarda el tamaño del
+#               CSV para deshacer un append a medias
+#   confirmado: el consolidado ya se escribió; faltan mover archivos
+# Al terminar de mover todo se borra. Si una corrida muere, la siguiente
+# deshace la exportación incompleta o termina de mover lo confirmado.
+# Una incremental deshecha también pierde lo que ya había agregado fuera
+# del CSV: índice de consulta y KPI se borran (se reconstruyen desde el
+# CSV) y se eliminan sus partes Parquet y su delta.
+# Opcional (DIARIO_INTERMEDIOS): reutilizar los archivos ya parseados
+# (pickle por tamaño + mtime).
+EN_CURSO = "en_curso"
+CONFIRMADO = "confirmado"
+
+
+def ruta_diario(ruta_salida: Path) -> Path:
+    return Path(os.getenv("RUTA_DIARIO") or ruta_salida / "Diario")
+
+
+def _tamano(ruta: Path) -> int | None:
+    return ruta.stat().st_size if ruta.exists() else None
+
+
+def _truncar(ruta: Path, tamano: int | None) -> None:
+    if tamano is None:
+        ruta.unlink(missing_ok=True)
+    elif ruta.exists() and ruta.stat().st_size > tamano:
+        with open(ruta, "r+b") as f:
+            f.truncate(tamano)
+
+
+def _borrar_tablas(ruta: Path, tablas: list[str]) -> None:
+    if not ruta.exists():
+        return
+    cnx = sqlite3.connect(ruta, timeout=30)
+    try:
+        for tabla in tablas:
+            cnx.execute(f'DROP TABLE IF EXISTS "{tabla}"')
+        cnx.commit()
+    finally:
+        cnx.close()
+
+
+def _borrar_desde(archivos, sello: str, inicio: slice) -> None:
+    # Sellos AAAAMMDD_HHMMSS en el nombre: se ordenan como texto
+    for archivo in archivos:
+        if archivo.name[inicio] >= sello:
+            archivo.unlink(missing_ok=True)
+
+
+# =============================================================
+# LECTURA CON INTERMEDIOS (NIVEL MÓDULO: VA AL POOL DE PROCESOS)
+# =============================================================
+def leer_con_diario(archivo: Path, directorio: Path, leer: Callable[[Path], pd.DataFrame]) -> pd.DataFrame:
+    stat = archivo.stat()
+    cache = directorio / f"{archivo.name}.{stat.st_size}.{stat.st_mtime_ns}.pkl"
+
+    if cache.exists():
+        logging.info(f"♻ {archivo.name}: se reutiliza lo parseado en la corrida interrumpida")
+        return pd.read_pickle(cache)
+
+    df = leer(archivo)
+    # Temporal + rename: un pickle a medias nunca se toma como válido
+    temporal = cache.with_suffix(".tmp")
+    df.to_pickle(temporal)
+    os.replace(temporal, cache)
+    return df
+
+
+class Diario:
+
+    def __init__(self, directorio: Path, reporte: str, salida: Path):
+        directorio.mkdir(parents=True, exist_ok=True)
+        self.ruta = directorio / f"{reporte}.json"
+        self.intermedios = directorio / reporte
+
+        self.reporte = reporte
+        self.salida = salida
+        self.registro: dict = {}
+        # Confirmados de la corrida anterior que no se pudieron mover
+        self._arrastre: list[str] = []
+        self._bloqueo = threading.Lock()
+
+    def _guardar(self) -> None:
+        temporal = self.ruta.with_suffix(".tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(self.registro, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self.ruta)
+
+    def lector(self, leer: Callable[[Path], pd.DataFrame]) -> Callable[[Path], pd.DataFrame]:
+        self.intermedios.mkdir(parents=True, exist_ok=True)
+        return partial(leer_con_diario, directorio=self.intermedios, leer=leer)
+
+    # ---------------------------------------------------------
+    # Corrida anterior interrumpida
+    # ---------------------------------------------------------
+    def recuperar(self, ruta_procesado: Path | None, mover: Callable[[Path, Path], bool]) -> set[str]:
+        # Devuelve los archivos ya confirmados (no se vuelven a consolidar)
+        if not self.ruta.exists():
+            return set()
+
+        with open(self.ruta, encoding="utf-8") as f:
+            anterior = json.load(f)
+
+        if anterior["estado"] == EN_CURSO:
+            logging.warning(
+                f"⚠ {self.reporte}: la corrida {anterior['corrida']} no llegó a confirmar; "
+                f"se deshace su exportación y se retoma"
+            )
+            if anterior["incremental"]:
+                _truncar(self.salida, anterior["tamano_csv"])
+                # El .idx pudo quedar adelantado o reconstruido: se rehace desde el CSV
+                ruta_indice(self.salida).unlink(missing_ok=True)
+                self._deshacer_derivados(anterior.get("derivados", {}), anterior["corrida"])
+            # Completa: el consolidado anterior sigue intacto (escritura atómica)
+            self.salida.with_suffix(".tmp").unlink(missing_ok=True)
+            self.ruta.unlink()
+            return set()
+
+        # Confirmado: solo faltaba mover a Procesado
+        confirmados = set(anterior["archivos"])
+        pendientes = confirmados - set(anterior["movidos"])
+        logging.warning(
+            f"⚠ {self.reporte}: la corrida {anterior['corrida']} quedó sin mover "
+            f"{len(pendientes)} archivo(s) a Procesado; se completa"
+        )
+
+        self.registro = anterior
+        carpeta = Path(anterior["carpeta"])
+        for nombre in sorted(pendientes):
+            archivo = carpeta / nombre
+            if not archivo.exists() or ruta_procesado is None or mover(archivo, ruta_procesado):
+                self.movido(nombre)
+
+        self.cerrar()
+        if self.registro:
+            self._arrastre = sorted(confirmados - set(self.registro["movidos"]))
+        return confirmados
+
+    def _deshacer_derivados(self, derivados: dict, corrida: str) -> None:
+        # Sin esto la corrida que retoma vuelve a sumar lo mismo
+        if "consulta" in derivados:
+            ruta, tabla = derivados["consulta"]
+            _borrar_tablas(Path(ruta), [tabla])
+        if "kpi" in derivados:
+            ruta, tablas = derivados["kpi"]
+            _borrar_tablas(Path(ruta), tablas)
+        if "parquet" in derivados:
+            # parte_<AAAAMMDD_HHMMSS>_<n>_<i>.parquet
+            _borrar_desde(Path(derivados["parquet"]).rglob("parte_*.parquet"), corrida, slice(6, 21))
+        if "delta" in derivados:
+            directorio, nombre = derivados["delta"]
+            _borrar_desde(Path(directorio).glob(f"{nombre}_DELTA_*.csv"), corrida, slice(-19, -4))
+
+    # ---------------------------------------------------------
+    # Corrida actual
+    # ---------------------------------------------------------
+    def iniciar(self, archivos: list[Path], incremental: bool, derivados: dict | None = None) -> None:
+        self.registro = {
+            "reporte": self.reporte,
+            "corrida": datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "estado": EN_CURSO,
+            "incremental": incremental,
+            "carpeta": str(archivos[0].parent),
+            "tamano_csv": _tamano(self.salida),
+            # Destinos fuera del CSV que una incremental a medias deja sucios
+            "derivados": derivados or {},
+            "leidos": [archivo.name for archivo in archivos],
+            "archivos": list(self._arrastre),
+            "movidos": []
+        }
+        self._guardar()
+
+    def confirmar(self, procesados: list[Path]) -> None:
+        self.registro["estado"] = CONFIRMADO
+        self.registro["archivos"] = self._arrastre + [archivo.name for archivo in procesados]
+        self._guardar()
+
+    def movido(self, nombre: str) -> None:
+        # Los movimientos van en paralelo
+        with self._bloqueo:
+            self.registro["movidos"].append(nombre)
+            self._guardar()
+
+    def cerrar(self) -> None:
+        # Con archivos sin mover el diario queda para la próxima corrida
+        pendientes = set(self.registro["archivos"]) - set(self.registro["movidos"])
+        if pendientes:
+            logging.warning(f"⚠ {self.reporte}: {len(pendientes)} archivo(s) sin mover quedan en el diario")
+            return
+        self.terminar()
+
+    def terminar(self) -> None:
+        self.ruta.unlink(missing_ok=True)
+        shutil.rmtree(self.intermedios, ignore_errors=True)
+        self.registro = {}
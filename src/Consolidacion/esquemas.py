@@ -0,0 +1,243 @@
+import re
+import logging
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from src.Consolidacion.codificacion import detectar_codificacion
+from src.Consolidacion.tipos import CATEGORIA, DURACION, FECHA, NUMERO, tipar_columnas
+
+# =============================================================
+# REGISTRO DE ESQUEMAS POR TIPO DE REPORTE
+# =============================================================
+# Los alias se comparan por una clave normalizada (sin tildes, sin
+# puntos, minúsculas, "_" = espacio, mojibake reparado), así que
+# "Nro. Gestion", "Nro Gestión" y "Nro GestiÃ³n" son el mismo encabezado.
+# Las columnas sin tipo declarado quedan como texto.
+@dataclass(frozen=True)
+class Esquema:
+    nombre: str
+    columnas: tuple[str, ...]
+    alias: dict[str, str]
+    calculadas: tuple[str, ...] = ("Archivo_Origen",)
+    tipos: dict[str, str] = field(default_factory=dict, compare=False)
+    _mapa: dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        mapa = {}
+        for col in self.columnas:
+            if col not in self.calculadas:
+                mapa[clave_encabezado(col)] = col
+        for origen, destino in self.alias.items():
+            mapa[clave_encabezado(origen)] = destino
+        object.__setattr__(self, "_mapa", mapa)
+
+    def __hash__(self):
+        return hash(self.nombre)
+
+    def destino(self, encabezado: str) -> str | None:
+        return self._mapa.get(clave_encabezado(encabezado))
+
+
+def _reparar_mojibake(texto: str) -> str:
+    try:
+        return texto.encode("latin-1").decode("utf-8")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return texto
+
+
+@lru_cache(maxsize=4096)
+def clave_encabezado(encabezado: str) -> str:
+    texto = _reparar_mojibake(str(encabezado).strip())
+    texto = unicodedata.normalize("NFKD", texto)
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = texto.lower().replace(".", " ").replace("_", " ")
+    return re.sub(r"\s+", " ", texto).strip()
+
+
+ESQUEMA_PICKING = Esquema(
+    nombre="PICKING",
+    columnas=(
+        "Nro_Gestion",
+        "Glosa",
+        "Est_Gestion",
+        "Nro_OP",
+        "Nro_Orden",
+        "Est_OP",
+        "Nro_Documento",
+        "Tipo_Gestion",
+        "Picker",
+        "Fecha_Inicio_Picker",
+        "Fecha_Cierre_Picker",
+        "Tiempo_Recorrido_Picker",
+        "Tiempo_Mov_Prom_Picker",
+        "Nro_Codigos",
+        "Nro_Ubicaciones",
+        "Cantidad_Solicitada",
+        "Cantidad_Picking",
+        "Fecha_Creacion_Gestion",
+        "Archivo_Origen",
+        "Empresa"
+    ),
+    alias={
+        "Fecha Creación Gestion": "Fecha_Creacion_Gestion",
+        "Nro. Gestion": "Nro_Gestion",
+        "Estado Gestión": "Est_Gestion",
+        "Nro. OP": "Nro_OP",
+        "Nro. Orden": "Nro_Orden",
+        "Estado OP": "Est_OP",
+        "Nro. Documento": "Nro_Documento",
+        "Tipo Gestión": "Tipo_Gestion",
+        "Tiempo Recorrido Picker": "Tiempo_Recorrido_Picker",
+        "Tiempo Promedio Movimiento Picker": "Tiempo_Mov_Prom_Picker",
+        "Tiempo Movimiento Prom. Picker": "Tiempo_Mov_Prom_Picker",
+        "Nro. Productos": "Nro_Codigos",
+        "Nro Códigos": "Nro_Codigos",
+        "Nro. Ubicaciones": "Nro_Ubicaciones"
+    },
+    tipos={
+        "Est_Gestion": CATEGORIA,
+        "Est_OP": CATEGORIA,
+        "Tipo_Gestion": CATEGORIA,
+        "Picker": CATEGORIA,
+        "Empresa": CATEGORIA,
+        "Archivo_Origen": CATEGORIA,
+        "Nro_Codigos": NUMERO,
+        "Nro_Ubicaciones": NUMERO,
+        "Cantidad_Solicitada": NUMERO,
+        "Cantidad_Picking": NUMERO,
+        "Tiempo_Recorrido_Picker": DURACION,
+        "Tiempo_Mov_Prom_Picker": DURACION,
+        "Fecha_Creacion_Gestion": FECHA,
+        "Fecha_Inicio_Picker": FECHA,
+        "Fecha_Cierre_Picker": FECHA
+    }
+)
+
+ESQUEMA_PARTES = Esquema(
+    nombre="PARTES",
+    columnas=(
+        "Fecha",
+        "Movimiento",
+        "Nro_Pedido",
+        "Estado",
+        "Codigo",
+        "Producto",
+        "Bultos_Totales",
+        "Ingresos",
+        "Salidas",
+        "Nro_Orden",
+        "Empresa",
+        "Archivo_Origen"
+    ),
+    alias={
+        "Mov. Almacén": "Movimiento",
+        "Nro. Pedido": "Nro_Pedido",
+        "Código Producto": "Codigo",
+        "Código": "Codigo",
+        "Nro. Orden": "Nro_Orden"
+    },
+    tipos={
+        "Movimiento": CATEGORIA,
+        "Estado": CATEGORIA,
+        "Producto": CATEGORIA,
+        "Empresa": CATEGORIA,
+        "Archivo_Origen": CATEGORIA,
+        "Bultos_Totales": NUMERO,
+        "Ingresos": NUMERO,
+        "Salidas": NUMERO,
+        "Fecha": FECHA
+    }
+)
+
+ESQUEMAS = {
+    esquema.nombre: esquema
+    for esquema in [ESQUEMA_PICKING, ESQUEMA_PARTES]
+}
+
+
+# =============================================================
+# PLAN POR FIRMA DE ENCABEZADO (CACHEADO)
+# =============================================================
+@dataclass(frozen=True)
+class PlanLectura:
+    usecols: tuple[str, ...]
+    renombrar: dict[str, str]
+    faltantes: tuple[str, ...]
+    desconocidas: tuple[str, ...]
+
+
+_derivas_informadas: set[tuple] = set()
+
+
+def _informar_deriva(esquema: Esquema, desconocidas: tuple[str, ...], faltantes: tuple[str, ...]) -> None:
+    # Un mismo archivo pasa por el lector (encabezado completo) y por el
+    # normalizador (ya proyectado): cada deriva se informa una sola vez
+    for tipo, columnas in [("desconocidas", desconocidas), ("faltantes", faltantes)]:
+        if columnas and (esquema.nombre, tipo, columnas) not in _derivas_informadas:
+            _derivas_informadas.add((esquema.nombre, tipo, columnas))
+            logging.warning(f"⚠ Deriva de esquema {esquema.nombre} | Columnas {tipo}: {list(columnas)}")
+
+
+@lru_cache(maxsize=256)
+def plan_para(esquema: Esquema, encabezados: tuple[str, ...]) -> PlanLectura:
+    usecols = []
+    renombrar = {}
+    desconocidas = []
+
+    for encabezado in encabezados:
+        destino = esquema.destino(encabezado)
+        if destino is None:
+            desconocidas.append(encabezado)
+        elif destino not in renombrar.values():
+            # Si dos encabezados apuntan al mismo destino gana el primero
+            usecols.append(encabezado)
+            renombrar[encabezado] = destino
+
+    faltantes = tuple(
+        col for col in esquema.columnas
+        if col not in esquema.calculadas and col not in renombrar.values()
+    )
+
+    _informar_deriva(esquema, tuple(desconocidas), faltantes)
+
+    return PlanLectura(tuple(usecols), renombrar, faltantes, tuple(desconocidas))
+
+
+def encabezados_archivo(archivo: Path, encoding: str | None = None) -> tuple[str, ...]:
+    sufijo = archivo.suffix.lower()
+
+    if sufijo in [".csv", ".txt"]:
+        df = pd.read_csv(
+            archivo,
+            encoding=encoding or detectar_codificacion(archivo),
+            sep=",",
+            dtype=str,
+            nrows=0
+        )
+    elif sufijo == ".xlsx":
+        df = pd.read_excel(archivo, dtype=str, engine="openpyxl", nrows=0)
+    else:
+        raise ValueError(f"Formato no soportado: {archivo.name}")
+
+    return tuple(df.columns)
+
+
+def aplicar_esquema(df: pd.DataFrame, esquema: Esquema, archivo_origen: str) -> pd.DataFrame:
+    plan = plan_para(esquema, tuple(df.columns))
+
+    df = df[list(plan.usecols)].rename(columns=plan.renombrar)
+    df["Archivo_Origen"] = archivo_origen
+
+    for col in plan.faltantes:
+        df[col] = None
+
+    return tipar_columnas(
+        df[list(esquema.columnas)],
+        esquema.tipos,
+        firma=(esquema.nombre, tuple(plan.usecols)),
+        origen=archivo_origen
+    )
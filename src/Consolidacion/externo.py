@@ -0,0 +1,168 @@
+import shutil
+import logging
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from src.log.logging import medir_etapa
+from src.Consolidacion.dedup import deduplicar
+from src.Consolidacion.indice_hash import _hash_columna
+from src.Consolidacion.tipos import concatenar
+
+# =============================================================
+# DEDUPLICACIÓN FUERA DE MEMORIA (PARTICIONES EN DISCO)
+# =============================================================
+# 1. Cada frame que entra se reparte por hash de fila en N particiones
+#    que se guardan en disco, con su número de fila global.
+# 2. Cada partición se deduplica sola: una fila y todas sus copias caen
+#    siempre en la misma partición.
+# 3. Las particiones deduplicadas se mezclan por número de fila y salen
+#    por ventanas, en el mismo orden que concat + drop_duplicates.
+# En memoria queda un archivo, una partición o una ventana a la vez.
+COLUMNA_FILA = "_Fila"
+
+
+def hash_particion(df: pd.DataFrame) -> np.ndarray:
+    # XOR de (columna, valor) ignorando nulos: una fila de un archivo al
+    # que le falta una columna cae donde caería con esa columna vacía.
+    # El valor se hashea como en hash_filas (Int64 y Float64 iguales,
+    # categorías por su valor): la misma fila cae en la misma partición
+    # aunque cada archivo la haya tipado distinto.
+    hashes = np.zeros(len(df), dtype=np.uint64)
+    for col in df.columns:
+        serie = df[col]
+        h = _hash_columna(serie)
+        h ^= pd.util.hash_array(np.array([col], dtype=object))[0]
+        h[serie.isna().to_numpy()] = 0
+        hashes ^= h
+    return hashes
+
+
+class DedupExterno:
+
+    def __init__(
+        self,
+        particiones: int = 16,
+        filas_por_bloque: int = 500_000,
+        directorio: Path | None = None,
+        clave: list[str] | None = None
+    ):
+        self.particiones = max(particiones, 1)
+        self.filas_por_bloque = max(filas_por_bloque, 1)
+        self.directorio = Path(tempfile.mkdtemp(prefix="dedup_", dir=directorio))
+        # Clave de negocio: reparte y deduplica solo por esas columnas
+        self.clave = clave
+
+        # Unión de columnas en orden de aparición (como pd.concat)
+        self.columnas: list[str] = []
+        self.filas = 0
+        self._bloques = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    # ---------------------------------------------------------
+    # 1. Reparto a disco
+    # ---------------------------------------------------------
+    def agregar(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        self.columnas += [c for c in df.columns if c not in self.columnas]
+
+        reparto = df if self.clave is None else df[self.clave]
+        destino = hash_particion(reparto) % np.uint64(self.particiones)
+        df = df.assign(**{COLUMNA_FILA: np.arange(self.filas, self.filas + len(df))})
+
+        for p in np.unique(destino):
+            df[destino == p].to_pickle(self.directorio / f"p{p:03d}_{self._bloques:06d}.pkl")
+
+        self._bloques += 1
+        self.filas += len(df)
+
+    # ---------------------------------------------------------
+    # 2. Dedup por partición
+    # ---------------------------------------------------------
+    def _deduplicar_particion(self, p: int) -> tuple[int, int]:
+        rutas = sorted(self.directorio.glob(f"p{p:03d}_*.pkl"))
+        if not rutas:
+            return 0, 0
+
+        # Los bloques están en orden de llegada: la partición queda
+        # ordenada por número de fila y "first"/"last" se respetan
+        df = concatenar(
+            [pd.read_pickle(r).reindex(columns=self.columnas + [COLUMNA_FILA]) for r in rutas]
+        )
+        for r in rutas:
+            r.unlink()
+
+        entrada = len(df)
+        df = deduplicar(df, self.clave or self.columnas)
+
+        tamano = max(self.filas_por_bloque // self.particiones, 1)
+        for k, inicio in enumerate(range(0, len(df), tamano)):
+            df.iloc[inicio:inicio + tamano].to_pickle(self.directorio / f"d{p:03d}_{k:06d}.pkl")
+
+        return entrada, len(df)
+
+    def deduplicar(self) -> int:
+        filas = 0
+        for p in range(self.particiones):
+            with medir_etapa("deduplicacion_particion", f"particion_{p}") as m:
+                m["filas_entrada"], m["filas_salida"] = self._deduplicar_particion(p)
+            filas += m["filas_salida"]
+        return filas
+
+    # ---------------------------------------------------------
+    # 3. Mezcla por número de fila
+    # ---------------------------------------------------------
+    def _bloques_particion(self, p: int) -> Iterator[pd.DataFrame]:
+        for ruta in sorted(self.directorio.glob(f"d{p:03d}_*.pkl")):
+            df = pd.read_pickle(ruta)
+            ruta.unlink()
+            yield df
+
+    def resultado(self) -> Iterator[pd.DataFrame]:
+        lectores = [self._bloques_particion(p) for p in range(self.particiones)]
+        pendientes: list[pd.DataFrame | None] = [None] * self.particiones
+
+        for inicio in range(0, self.filas, self.filas_por_bloque):
+            fin = inicio + self.filas_por_bloque
+            ventana = []
+
+            for p, lector in enumerate(lectores):
+                df = pendientes[p]
+
+                # Se carga hasta pasar el fin de la ventana (o agotar)
+                while df is None or df.empty or df[COLUMNA_FILA].iloc[-1] < fin:
+                    siguiente = next(lector, None)
+                    if siguiente is None:
+                        break
+                    df = siguiente if df is None or df.empty else pd.concat([df, siguiente])
+
+                if df is None or df.empty:
+                    continue
+
+                corte = int(np.searchsorted(df[COLUMNA_FILA].to_numpy(), fin))
+                ventana.append(df.iloc[:corte])
+                pendientes[p] = df.iloc[corte:]
+
+            ventana = [df for df in ventana if not df.empty]
+            if not ventana:
+                continue
+
+            yield (
+                pd.concat(ventana)
+                .sort_values(COLUMNA_FILA)
+                .drop(columns=COLUMNA_FILA)
+                .reset_index(drop=True)
+            )
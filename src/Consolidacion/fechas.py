@@ -0,0 +1,140 @@
+import logging
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# =============================================================
+# PARSEO DE FECHAS CON FORMATO DETECTADO
+# =============================================================
+# El formato se detecta una vez sobre una muestra y se cachea por firma
+# de encabezado + columna; el resto del archivo (y los siguientes con el
+# mismo encabezado) se parsea con formato fijo, vectorizado.
+TAMANO_MUESTRA = 200
+
+# Texto que el lector deja en celdas vacías: no cuenta como inválido
+_NULOS = ["", "nan", "NaN", "NaT", "None", "none", "null", "NULL"]
+
+_formatos: dict[tuple, str | None] = {}
+
+# Tokens de ancho fijo que se pueden reordenar a ISO por posición
+_ANCHOS = {"%Y": 4, "%m": 2, "%d": 2, "%H": 2, "%M": 2, "%S": 2}
+
+
+def _muestra(texto: pd.Series) -> pd.Series:
+    if len(texto) <= TAMANO_MUESTRA:
+        return texto
+    # Repartida en todo el archivo, no solo las primeras filas
+    posiciones = np.linspace(0, len(texto) - 1, TAMANO_MUESTRA).astype(int)
+    return texto.iloc[posiciones]
+
+
+def _aciertos(muestra: pd.Series, formato: str) -> int:
+    return int(pd.to_datetime(muestra, format=formato, errors="coerce").notna().sum())
+
+
+def detectar_formato(muestra: pd.Series) -> str | None:
+    candidatos = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for valor in muestra.unique()[:20]:
+            # Sin dayfirst primero: en empate se conserva el criterio anterior
+            for dayfirst in (False, True):
+                formato = guess_datetime_format(valor, dayfirst=dayfirst)
+                if formato and formato not in candidatos:
+                    candidatos.append(formato)
+
+    mejor, mejor_aciertos = None, 0
+    for formato in candidatos:
+        aciertos = _aciertos(muestra, formato)
+        if aciertos > mejor_aciertos:
+            mejor, mejor_aciertos = formato, aciertos
+
+    return mejor
+
+
+def _a_iso(texto: pd.Series, formato: str) -> tuple[pd.Series, str] | None:
+    # Formatos como %d-%m-%Y %H:%M:%S van por strptime (lento); si todos
+    # los valores tienen el ancho esperado se reordenan a ISO por posición
+    # y pandas los parsea por la ruta rápida (y sigue validando el rango).
+    posiciones, largo, j = {}, 0, 0
+    while j < len(formato):
+        token = formato[j:j + 2]
+        if token in _ANCHOS:
+            posiciones[token] = largo
+            largo += _ANCHOS[token]
+            j += 2
+        elif formato[j] == "%":
+            return None
+        else:
+            largo += 1
+            j += 1
+
+    if not {"%Y", "%m", "%d"} <= posiciones.keys():
+        return None
+
+    partes = ["%Y", "%m", "%d"]
+    formato_iso = "%Y-%m-%d"
+    separador = " "
+    for token in ["%H", "%M", "%S"]:
+        if token not in posiciones:
+            break
+        partes.append(token)
+        formato_iso += separador + token
+        separador = ":"
+
+    # Ya es ISO (o no es de ancho fijo): se parsea tal cual
+    if formato_iso == formato or not (texto.str.len() == largo).all():
+        return None
+
+    def parte(token):
+        inicio = posiciones[token]
+        return texto.str.slice(inicio, inicio + _ANCHOS[token])
+
+    iso = parte("%Y") + "-" + parte("%m") + "-" + parte("%d")
+    for token, separador in zip(partes[3:], [" ", ":", ":"]):
+        iso = iso + separador + parte(token)
+
+    return iso, formato_iso
+
+
+def parsear_fechas(serie: pd.Series, clave: tuple | None = None, origen: str | None = None) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+
+    texto = serie.astype(object).where(serie.notna(), "").astype(str).str.strip()
+    nulos = texto.isin(_NULOS)
+    muestra = _muestra(texto[~nulos])
+
+    if not len(muestra):
+        return pd.Series(pd.NaT, index=serie.index, name=serie.name, dtype="datetime64[ns]")
+
+    formato = _formatos.get(clave) if clave is not None else None
+
+    # El formato cacheado se revalida contra la muestra del archivo nuevo
+    if formato is None or _aciertos(muestra, formato) < len(muestra):
+        formato = detectar_formato(muestra)
+        if clave is not None and formato is not None:
+            _formatos[clave] = formato
+
+    if formato is not None:
+        iso = _a_iso(texto[~nulos], formato)
+        if iso is not None:
+            fechas = pd.to_datetime(iso[0], format=iso[1], errors="coerce").reindex(texto.index)
+        else:
+            fechas = pd.to_datetime(texto.mask(nulos), format=formato, errors="coerce")
+    else:
+        # Sin formato reconocible: inferencia de pandas (comportamiento anterior)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            fechas = pd.to_datetime(texto.mask(nulos), errors="coerce")
+
+    coercidos = int((fechas.isna() & ~nulos).sum())
+    if coercidos:
+        logging.warning(
+            f"⚠ {origen or 'Fechas'} | {serie.name}: {coercidos} valores no son fecha "
+            f"(formato {formato or 'inferido'}) y quedan vacíos"
+        )
+
+    return fechas
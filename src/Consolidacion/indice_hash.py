@@ -0,0 +1,262 @@
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.Consolidacion.compresion import Compresion, abrir_salida
+from src.Consolidacion.tipos import tipar_columnas
+
+# =============================================================
+# HASH POR FILA (ESTABLE ENTRE CORRIDAS)
+# =============================================================
+# Cada columna se lleva a una forma canónica antes de hashear, para
+# que el mismo valor produzca el mismo hash aunque cambie el dtype
+# (categoría vs texto, datetime en us vs ns, int vs float).
+_NULO = "\x00<NA>"
+_SEMILLA = np.uint64(0x345678)
+_MULTIPLICADOR = np.uint64(1000003)
+
+# Clave por defecto de pandas: los índices persistidos dependen de ella.
+# Otra clave da un segundo hash independiente (dedup de 128 bits).
+CLAVE_HASH = "0123456789123456"
+
+
+def _hash_columna(serie: pd.Series, clave: str = CLAVE_HASH) -> np.ndarray:
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        categorias = _hash_columna(pd.Series(serie.cat.categories, dtype=object), clave)
+        nulo = pd.util.hash_array(np.array([_NULO], dtype=object), hash_key=clave)[0]
+        codigos = serie.cat.codes.to_numpy()
+        if not len(categorias):
+            return np.full(len(serie), nulo, dtype=np.uint64)
+        return np.where(codigos >= 0, categorias[codigos], nulo)
+
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        valores = serie.astype("datetime64[ns]").to_numpy().view("i8")
+        return pd.util.hash_array(valores, hash_key=clave)
+
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        valores = serie.astype("float64").to_numpy()
+        return pd.util.hash_array(valores, hash_key=clave)
+
+    valores = (
+        serie.astype(object)
+        .where(serie.notna(), _NULO)
+        .astype(str)
+        .to_numpy(dtype=object)
+    )
+    return pd.util.hash_array(valores, hash_key=clave, categorize=True)
+
+
+def hash_filas(
+    df: pd.DataFrame,
+    columnas: list[str] | None = None,
+    clave: str = CLAVE_HASH
+) -> np.ndarray:
+    columnas = list(df.columns) if columnas is None else list(columnas)
+
+    resultado = np.full(len(df), _SEMILLA, dtype=np.uint64)
+    for col in columnas:
+        resultado = (resultado * _MULTIPLICADOR) ^ _hash_columna(df[col], clave)
+
+    return resultado
+
+
+# =============================================================
+# ÍNDICE PERSISTENTE (UINT64 AL LADO DEL CONSOLIDADO)
+# =============================================================
+# Subir la versión cuando cambie cómo se hashea una columna (p. ej.
+# cantidades, timestamps o tiempos del picker que pasan de texto a
+# número/fecha/segundos): los índices anteriores se reconstruyen desde
+# el consolidado.
+VERSION_INDICE = 4
+
+
+def ruta_indice(salida: Path) -> Path:
+    return salida.with_suffix(".idx")
+
+
+def ruta_version(salida: Path) -> Path:
+    return salida.with_suffix(".idx.version")
+
+
+def version_indice(salida: Path) -> int:
+    try:
+        return int(ruta_version(salida).read_text().strip())
+    except (OSError, ValueError):
+        # Índices previos al versionado
+        return 1
+
+
+def cargar_indice(ruta: Path) -> np.ndarray:
+    if not ruta.exists():
+        return np.empty(0, dtype=np.uint64)
+    return np.fromfile(ruta, dtype="<u8").astype(np.uint64, copy=False)
+
+
+def agregar_al_indice(ruta: Path, hashes: np.ndarray) -> None:
+    with open(ruta, "ab") as f:
+        hashes.astype("<u8", copy=False).tofile(f)
+
+
+def invalidar_indice(salida: Path) -> None:
+    # Antes de reemplazar el consolidado: si la corrida muere en el medio,
+    # la próxima incremental reconstruye en vez de confiar en un .idx viejo
+    ruta_indice(salida).unlink(missing_ok=True)
+    ruta_version(salida).unlink(missing_ok=True)
+
+
+def escribir_indice(salida: Path, hashes: np.ndarray) -> None:
+    # Corrida completa: el índice pasa a ser el del consolidado reescrito
+    ruta_idx = ruta_indice(salida)
+    temporal = ruta_idx.with_suffix(".idx.tmp")
+    temporal.unlink(missing_ok=True)
+    agregar_al_indice(temporal, hashes)
+    temporal.replace(ruta_idx)
+    ruta_version(salida).write_text(str(VERSION_INDICE))
+
+
+def reconstruir_indice(
+    salida: Path,
+    columnas: list[str] | None = None,
+    tipos: dict[str, str] | None = None,
+    filas_por_bloque: int = 500_000
+) -> None:
+    # Se relee el consolidado con los mismos tipos del pipeline: vacío
+    # = nulo, "nan" literal sigue siendo texto (así lo escribe el lector)
+    ruta_idx = ruta_indice(salida)
+    temporal = ruta_idx.with_suffix(".idx.tmp")
+    temporal.unlink(missing_ok=True)
+
+    filas = 0
+    with pd.read_csv(
+        salida,
+        sep="|",
+        dtype=str,
+        encoding="utf-8",
+        keep_default_na=False,
+        na_values=[""],
+        chunksize=filas_por_bloque
+    ) as lector:
+        for bloque in lector:
+            bloque = tipar_columnas(bloque, tipos or {})
+            agregar_al_indice(temporal, hash_filas(bloque, columnas))
+            filas += len(bloque)
+
+    if filas:
+        temporal.replace(ruta_idx)
+    else:
+        temporal.unlink(missing_ok=True)
+        ruta_idx.unlink(missing_ok=True)
+
+    ruta_version(salida).write_text(str(VERSION_INDICE))
+    logging.info(f"🔑 Índice {ruta_idx.name} reconstruido desde {salida.name} | Filas: {filas}")
+
+
+def filtrar_nuevas(
+    df: pd.DataFrame,
+    indice: np.ndarray,
+    columnas: list[str] | None = None
+) -> tuple[pd.DataFrame, np.ndarray]:
+    hashes = hash_filas(df, columnas)
+
+    # Duplicados dentro del lote + filas ya vistas en corridas previas
+    mascara = ~pd.Series(hashes).duplicated().to_numpy()
+    if len(indice):
+        mascara &= ~np.isin(hashes, indice)
+
+    return df[mascara], hashes[mascara]
+
+
+# =============================================================
+# CONJUNTO DE HASHES VISTOS (ORDENADO + BUFFER)
+# =============================================================
+# Para lecturas por bloques: consultar y agregar hashes sin reordenar
+# todo el histórico en cada bloque.
+class ConjuntoHashes:
+
+    def __init__(self, inicial: np.ndarray | None = None):
+        base = np.empty(0, dtype=np.uint64) if inicial is None else inicial
+        self._ordenado = np.unique(base.astype(np.uint64, copy=False))
+        self._pendientes: list[np.ndarray] = []
+        self._n_pendientes = 0
+
+    def __len__(self) -> int:
+        return len(self._ordenado) + self._n_pendientes
+
+    def contiene(self, hashes: np.ndarray) -> np.ndarray:
+        mascara = np.zeros(len(hashes), dtype=bool)
+        if len(self._ordenado):
+            pos = np.searchsorted(self._ordenado, hashes)
+            pos[pos == len(self._ordenado)] = 0
+            mascara |= self._ordenado[pos] == hashes
+        if self._pendientes:
+            mascara |= np.isin(hashes, np.concatenate(self._pendientes))
+        return mascara
+
+    def valores(self) -> np.ndarray:
+        return np.concatenate([self._ordenado, *self._pendientes])
+
+    def agregar(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        self._pendientes.append(hashes.astype(np.uint64, copy=False))
+        self._n_pendientes += len(hashes)
+
+        if self._n_pendientes > max(100_000, len(self._ordenado) // 4):
+            self._ordenado = np.unique(
+                np.concatenate([self._ordenado, *self._pendientes])
+            )
+            self._pendientes = []
+            self._n_pendientes = 0
+
+
+# =============================================================
+# EXPORTAR EN MODO INCREMENTAL (APPEND)
+# =============================================================
+def preparar_incremental(
+    salida: Path,
+    columnas: list[str] | None = None,
+    tipos: dict[str, str] | None = None
+) -> np.ndarray:
+    ruta_idx = ruta_indice(salida)
+
+    if ruta_idx.exists() and not salida.exists():
+        logging.warning(f"⚠ Índice sin consolidado, se reinicia: {ruta_idx.name}")
+        ruta_idx.unlink()
+
+    if not salida.exists():
+        ruta_version(salida).write_text(str(VERSION_INDICE))
+
+    elif not ruta_idx.exists() or version_indice(salida) != VERSION_INDICE:
+        logging.warning(
+            f"⚠ {salida.name} sin índice de hashes vigente: se reconstruye desde el "
+            f"consolidado (solo en esta corrida)"
+        )
+        reconstruir_indice(salida, columnas, tipos)
+
+    return cargar_indice(ruta_idx)
+
+
+def exportar_incremental(
+    df: pd.DataFrame,
+    salida: Path,
+    columnas: list[str] | None = None,
+    tipos: dict[str, str] | None = None,
+    compresion: Compresion | None = None
+) -> pd.DataFrame:
+    ruta_idx = ruta_indice(salida)
+
+    indice = preparar_incremental(salida, columnas, tipos)
+    df_nuevas, hashes = filtrar_nuevas(df, indice, columnas)
+
+    encabezado = not salida.exists()
+    with abrir_salida(salida, "a", compresion) as f:
+        df_nuevas.to_csv(f, header=encabezado, index=False, sep="|")
+    agregar_al_indice(ruta_idx, hashes)
+
+    logging.info(
+        f"🔑 Índice {ruta_idx.name} | Previas: {len(indice)} | "
+        f"Lote: {len(df)} | Nuevas: {len(df_nuevas)}"
+    )
+    return df_nuevas
@@ -0,0 +1,116 @@
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+# =============================================================
+# HASH DE CONTENIDO
+# =============================================================
+def hash_archivo(ruta: Path, tamano_bloque: int = 1024 * 1024) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(ruta, "rb") as f:
+        while bloque := f.read(tamano_bloque):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+# =============================================================
+# MANIFIESTO + CACHÉ DE FRAMES POR ARCHIVO
+# =============================================================
+# Por archivo se guarda: ruta, tamaño, mtime, hash, filas, columnas y
+# el frame ya leído y limpio. Si tamaño y mtime no cambian se usa la
+# caché sin abrir el archivo; si solo cambia el mtime y el hash es el
+# mismo, también.
+class Manifiesto:
+
+    def __init__(self, directorio: Path):
+        self.directorio = directorio
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.ruta = directorio / "manifiesto.json"
+
+        self.entradas: dict[str, dict] = {}
+        if self.ruta.exists():
+            with open(self.ruta, encoding="utf-8") as f:
+                self.entradas = json.load(f)
+
+        self.vistos: set[str] = set()
+        self.cambios: set[str] = set()
+
+    def _ruta_cache(self, entrada: dict) -> Path:
+        return self.directorio / entrada["cache"]
+
+    def _entrada_vigente(self, archivo: Path) -> dict | None:
+        stat = archivo.stat()
+        entrada = self.entradas.get(archivo.name)
+
+        if not entrada or not self._ruta_cache(entrada).exists():
+            return None
+        if entrada["tamano"] != stat.st_size:
+            return None
+        if entrada["mtime"] == stat.st_mtime:
+            return entrada
+
+        # Mismo tamaño pero otro mtime: se confirma por contenido
+        if entrada["hash"] == hash_archivo(archivo):
+            entrada["mtime"] = stat.st_mtime
+            return entrada
+        return None
+
+    def vigente(self, archivo: Path) -> bool:
+        self.vistos.add(archivo.name)
+        return self._entrada_vigente(archivo) is not None
+
+    def obtener(self, archivo: Path, leer: Callable[[Path], pd.DataFrame]) -> pd.DataFrame:
+        clave = archivo.name
+        self.vistos.add(clave)
+
+        entrada = self._entrada_vigente(archivo)
+        if entrada:
+            return pd.read_pickle(self._ruta_cache(entrada))
+
+        # Nuevo o modificado: se parsea y se guarda en caché
+        stat = archivo.stat()
+        df = leer(archivo)
+        contenido = hash_archivo(archivo)
+
+        anterior = self.entradas.get(clave)
+        if anterior:
+            self._ruta_cache(anterior).unlink(missing_ok=True)
+
+        entrada = {
+            "ruta": str(archivo),
+            "tamano": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": contenido,
+            "filas": len(df),
+            "columnas": list(df.columns),
+            "cache": f"{archivo.stem}_{contenido}.pkl"
+        }
+        df.to_pickle(self._ruta_cache(entrada))
+
+        self.entradas[clave] = entrada
+        self.cambios.add(clave)
+        logging.info(f"🗂 Caché actualizada: {archivo.name} | Filas: {len(df)}")
+
+        return df
+
+    def purgar(self, prefijo: str) -> None:
+        # Archivos que ya no están en la carpeta histórica
+        for clave in [c for c in self.entradas if c.upper().startswith(prefijo) and c not in self.vistos]:
+            entrada = self.entradas.pop(clave)
+            self._ruta_cache(entrada).unlink(missing_ok=True)
+            self.cambios.add(clave)
+            logging.info(f"🗑 Eliminado del manifiesto: {clave}")
+
+    def hubo_cambios(self, prefijo: str) -> bool:
+        return any(c.upper().startswith(prefijo) for c in self.cambios)
+
+    def guardar(self) -> None:
+        temporal = self.ruta.with_suffix(".tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(self.entradas, f, ensure_ascii=False, indent=2)
+        os.replace(temporal, self.ruta)
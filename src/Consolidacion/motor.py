@@ -0,0 +1,932 @@
+import os
+import time
+import argparse
+import logging
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.log.logging import medir_etapa
+from src.Consolidacion.config import opcion_bool, opcion_int, opcion_texto
+from src.Consolidacion.cache_excel import EXTENSIONES_EXCEL, leer_excel_cacheado
+from src.Consolidacion.codificacion import corregir_codificacion, detectar_codificacion
+from src.Consolidacion.compresion import Compresion, abrir_salida, ruta_base, ruta_comprimida
+from src.Consolidacion.dedup import deduplicar
+from src.Consolidacion.diario import Diario, ruta_diario
+from src.Consolidacion.delta import EscritorDelta, exportar_delta, registrar_corrida, ruta_delta
+from src.Consolidacion.esquemas import Esquema, aplicar_esquema, encabezados_archivo, plan_para
+from src.Consolidacion.externo import DedupExterno
+from src.Consolidacion.indice_hash import escribir_indice, exportar_incremental, hash_filas, invalidar_indice
+from src.Consolidacion.manifiesto import Manifiesto
+from src.Consolidacion.paralelo import procesar_archivos
+from src.Consolidacion.parquet import EscritorParquet, exportar_parquet, ruta_parquet
+from src.Consolidacion.pipeline import TareasFondo, adelantar
+from src.Consolidacion.streaming import consolidar_por_bloques
+from src.Consolidacion.tipos import concatenar
+from src.Database.conexion_sql import obtener_pool
+from src.Database.cargador_sql import CargaSQL, cargar_consolidado
+from src.Database.agregados import (
+    Agregado,
+    AgregadosKPI,
+    actualizar_agregados,
+    existen_agregados,
+    reconstruir_agregados,
+    ruta_kpi,
+    totales_kpi,
+)
+from src.Database.consulta import (
+    IndiceConsulta,
+    actualizar_consulta,
+    existe_tabla,
+    reconstruir_consulta,
+    ruta_consulta,
+)
+
+# =============================================================
+# MOTOR DE CONSOLIDACIÓN (UN REPORTE = UNA DECLARACIÓN)
+# =============================================================
+# Cada reporte declara prefijo, esquema, clave de dedup, columnas para
+# Parquet y salida. Lectura, cachés, paralelismo, dedup y exportación
+# son los mismos para todos: una mejora acá llega a todos los reportes.
+EXTENSIONES = (".csv", ".txt", ".xlsx")
+
+
+@dataclass(frozen=True)
+class Reporte:
+    nombre: str
+    prefijo: str
+    salida: str
+    esquema: Esquema | None = None
+    # Clave de negocio para dedup y upsert SQL (None = fila completa)
+    clave: tuple[str, ...] | None = None
+    # Candidatas para particionar el Parquet por mes (la primera presente)
+    particion_fecha: tuple[str, ...] = ()
+    columnas_fecha: tuple[str, ...] = ()
+    columnas_numericas: tuple[str, ...] = ()
+    # Totales que se informan en el log
+    columnas_suma: tuple[str, ...] = ()
+    # Ajuste posterior a la normalización (por bloque o sobre el concat)
+    tipar: Callable[[pd.DataFrame], pd.DataFrame] | None = field(default=None, compare=False)
+    extensiones: tuple[str, ...] = EXTENSIONES
+    tabla_sql: str | None = None
+    # Columnas indexadas en el índice de consulta local (vacío = sin índice)
+    claves_consulta: tuple[str, ...] = ()
+    # Tablas KPI por grupo y día, mantenidas con el delta de cada corrida
+    agregados: tuple[Agregado, ...] = ()
+
+    def tabla(self) -> str:
+        return os.getenv(f"TABLA_SQL_{self.nombre}", self.tabla_sql or self.nombre)
+
+    def columna_fecha(self, columnas) -> str | None:
+        return next((c for c in self.particion_fecha if c in columnas), None)
+
+
+@dataclass(frozen=True)
+class Opciones:
+    incremental: bool = False
+    workers: int = 1
+    filas_por_bloque: int = 0
+    parquet: bool = False
+    sql: bool = False
+    lote_sql: int = 10_000
+    adelanto: int = 2
+    fuera_de_memoria: bool = False
+    particiones: int = 16
+    consulta: bool = False
+    kpi: bool = False
+    delta: bool = False
+    # Diario de corrida: deshacer / retomar una corrida FTP interrumpida
+    diario: bool = True
+    # Guardar cada archivo parseado para no releerlo al retomar (pickle)
+    intermedios: bool = False
+    # CSV comprimido (gzip / zstd); None = sin comprimir
+    compresion: Compresion | None = None
+
+    @classmethod
+    def desde_entorno(
+        cls,
+        incremental: bool | None = None,
+        workers: int | None = None,
+        filas_por_bloque: int | None = None,
+        parquet: bool | None = None,
+        sql: bool | None = None,
+        fuera_de_memoria: bool | None = None,
+        particiones: int | None = None,
+        consulta: bool | None = None,
+        kpi: bool | None = None,
+        delta: bool | None = None,
+        diario: bool | None = None,
+        compresion: str | None = None,
+        nivel_compresion: int | None = None
+    ) -> "Opciones":
+        # Argumento > variable de entorno > valor por defecto
+        formato = opcion_texto("COMPRESION_SALIDA", compresion)
+        return cls(
+            incremental=opcion_bool("MODO_INCREMENTAL", incremental),
+            workers=opcion_int("WORKERS_LECTURA", workers, defecto=1),
+            filas_por_bloque=opcion_int("FILAS_POR_BLOQUE", filas_por_bloque),
+            parquet=opcion_bool("SALIDA_PARQUET", parquet),
+            sql=opcion_bool("CARGA_SQL", sql),
+            lote_sql=opcion_int("LOTE_SQL", defecto=10_000),
+            adelanto=opcion_int("LECTURA_ADELANTADA", defecto=2),
+            fuera_de_memoria=opcion_bool("FUERA_DE_MEMORIA", fuera_de_memoria),
+            particiones=opcion_int("PARTICIONES_DEDUP", particiones, defecto=16),
+            consulta=opcion_bool("INDICE_CONSULTA", consulta),
+            kpi=opcion_bool("AGREGADOS_KPI", kpi),
+            delta=opcion_bool("SALIDA_DELTA", delta),
+            diario=opcion_bool("DIARIO_CORRIDA", diario, defecto=True),
+            intermedios=opcion_bool("DIARIO_INTERMEDIOS"),
+            compresion=Compresion(
+                formato,
+                opcion_int("NIVEL_COMPRESION", nivel_compresion),
+                opcion_int("HILOS_COMPRESION", defecto=min(4, os.cpu_count() or 1))
+            ) if formato not in ("", "no", "none") else None
+        )
+
+    @classmethod
+    def desde_args(cls, args: argparse.Namespace, **valores) -> "Opciones":
+        # Flags de agregar_argumentos; las no definidas o sin usar (None) van
+        # al entorno. `valores` fija opciones propias del script.
+        argumentos = {nombre: getattr(args, nombre, None) for nombre in ARGUMENTOS}
+        argumentos.update(valores)
+        return cls.desde_entorno(**argumentos)
+
+
+# =============================================================
+# FLAGS COMUNES DE LOS SCRIPTS
+# =============================================================
+# dest = parámetro de Opciones.desde_entorno; default None = "no se pasó"
+ARGUMENTOS = {
+    "incremental": (["--incremental"], dict(
+        action="store_true",
+        help="Agrega solo filas nuevas al consolidado (índice de hashes)"
+    )),
+    "workers": (["--workers"], dict(
+        type=int,
+        help="Procesos para leer y normalizar archivos en paralelo"
+    )),
+    "filas_por_bloque": (["--bloque"], dict(
+        metavar="FILAS",
+        type=int,
+        help="Filas por bloque para leer CSV/TXT en streaming (0 = desactivado)"
+    )),
+    "parquet": (["--parquet"], dict(
+        action="store_true",
+        help="Además del CSV, genera Parquet particionado por mes y Empresa"
+    )),
+    "sql": (["--sql"], dict(
+        action="store_true",
+        help="Carga los consolidados en SQL Server (staging + upsert)"
+    )),
+    "fuera_de_memoria": (["--fuera-de-memoria"], dict(
+        action="store_true",
+        help="Deduplica por particiones en disco (memoria acotada)"
+    )),
+    "particiones": (["--particiones"], dict(
+        type=int,
+        help="Cantidad de particiones en disco para --fuera-de-memoria (por defecto 16)"
+    )),
+    "consulta": (["--consulta"], dict(
+        action="store_true",
+        help="Mantiene el índice de consulta local (SQLite) sobre las claves de búsqueda del reporte"
+    )),
+    "kpi": (["--kpi"], dict(
+        action="store_true",
+        help="Mantiene las tablas KPI agregadas por día (SQLite, solo con el delta de cada corrida)"
+    )),
+    "delta": (["--delta"], dict(
+        action="store_true",
+        help="Escribe además el delta de la corrida (solo filas nuevas) y su registro JSON en la carpeta Delta"
+    )),
+    "diario": (["--sin-diario"], dict(
+        action="store_false",
+        help="No lleva el diario de corrida (sin deshacer / retomar una corrida interrumpida)"
+    )),
+    "compresion": (["--compresion"], dict(
+        choices=["gzip", "zstd"],
+        help="Escribe el consolidado comprimido (.csv.gz / .csv.zst), en bloques paralelos"
+    )),
+    "nivel_compresion": (["--nivel-compresion"], dict(
+        type=int,
+        help="Nivel de compresión (por defecto gzip 6, zstd 3)"
+    ))
+}
+
+
+def agregar_argumentos(parser: argparse.ArgumentParser, omitir: tuple[str, ...] = ()) -> None:
+    # Un solo lugar para las flags: todos los scripts aceptan las mismas
+    for nombre, (flags, extra) in ARGUMENTOS.items():
+        if nombre not in omitir:
+            parser.add_argument(*flags, dest=nombre, default=None, **extra)
+
+
+@dataclass
+class Resultado:
+    nombre: str
+    archivos: int = 0
+    procesados: list[Path] = field(default_factory=list)
+    fallidos: list[tuple[Path, str]] = field(default_factory=list)
+    filas: int = 0
+    totales: dict[str, float] = field(default_factory=dict)
+    # Filas leídas por archivo procesado (registro de corrida)
+    leidas: dict[str, int] = field(default_factory=dict)
+    omitido: bool = False
+    # Error que cortó el reporte completo (no el de un archivo)
+    error: str | None = None
+
+    @property
+    def correcto(self) -> bool:
+        return self.error is None and not self.fallidos
+
+
+# =============================================================
+# LECTOR GENÉRICO (CSV / TXT / XLSX / XLS)
+# =============================================================
+def leer_archivo_generico(archivo: Path, esquema: Esquema | None = None) -> pd.DataFrame:
+    sufijo = archivo.suffix.lower()
+
+    if sufijo in EXTENSIONES_EXCEL:
+        # Libro completo (cacheado por contenido), proyectado al esquema
+        df = leer_excel_cacheado(archivo)
+        if esquema is not None:
+            df = df[list(plan_para(esquema, tuple(df.columns)).usecols)]
+        return df
+
+    if sufijo not in [".csv", ".txt"]:
+        raise ValueError(f"Formato no soportado: {archivo.name}")
+
+    def leer(codificacion: str) -> pd.DataFrame:
+        # Con esquema solo se parsean las columnas que el reporte usa
+        usecols = None
+        if esquema is not None:
+            usecols = list(plan_para(esquema, encabezados_archivo(archivo, codificacion)).usecols)
+
+        return pd.read_csv(
+            archivo,
+            encoding=codificacion,
+            sep=",",
+            dtype=str,
+            usecols=usecols
+        )
+
+    # Codificación detectada sobre los primeros KB (cacheada por origen)
+    codificacion = detectar_codificacion(archivo)
+    try:
+        df = leer(codificacion)
+    except UnicodeDecodeError as e:
+        df = leer(corregir_codificacion(archivo, codificacion, e))
+
+    # Limpieza básica
+    return df.apply(lambda col: col.astype(str).str.strip())
+
+
+def normalizar(df: pd.DataFrame, archivo_origen: str, esquema: Esquema | None = None) -> pd.DataFrame:
+    # Sin esquema (histórico) se conservan las columnas tal cual
+    if esquema is None:
+        df["Archivo_Origen"] = archivo_origen
+        return df
+    return aplicar_esquema(df, esquema, archivo_origen)
+
+
+# =============================================================
+# DETECTAR ARCHIVOS (UN RECORRIDO PARA VARIOS REPORTES)
+# =============================================================
+def detectar_archivos(candidatos: list[Path], reportes: list[Reporte]) -> dict[str, list[Path]]:
+    encontrados = {reporte.nombre: [] for reporte in reportes}
+
+    for archivo in sorted(candidatos):
+        if archivo.is_dir():
+            continue
+
+        nombre = archivo.name.upper()
+        for reporte in reportes:
+            if nombre.startswith(reporte.prefijo) and archivo.suffix.lower() in reporte.extensiones:
+                logging.info(f"✓ {reporte.nombre}: {archivo.name}")
+                encontrados[reporte.nombre].append(archivo)
+                break
+
+    return encontrados
+
+
+# =============================================================
+# MOVER A PROCESADO (REEMPLAZO + TIMESTAMP)
+# =============================================================
+def mover_a_procesado(archivo: Path, ruta_procesado: Path) -> bool:
+    destino = ruta_procesado / archivo.name
+
+    try:
+        with medir_etapa("mover_procesado", archivo.name):
+            if destino.exists():
+                destino.unlink()
+
+            archivo.rename(destino)
+
+            # 🔧 Forzar actualización de fecha modificación
+            now = time.time()
+            os.utime(destino, (now, now))
+
+            logging.info(
+                f"📦 Archivo movido a Procesado (reemplazado y actualizado): {archivo.name}"
+            )
+        return True
+
+    except Exception as e:
+        logging.error(f"❌ Error moviendo archivo {archivo.name}: {e}")
+        return False
+
+
+def _mover_con_diario(archivo: Path, ruta_procesado: Path, diario: Diario | None) -> None:
+    if mover_a_procesado(archivo, ruta_procesado) and diario is not None:
+        diario.movido(archivo.name)
+
+
+# =============================================================
+# MODOS DE CONSOLIDACIÓN
+# =============================================================
+def _totales(reporte: Reporte, df: pd.DataFrame) -> dict[str, float]:
+    return {col: df[col].sum() for col in reporte.columnas_suma}
+
+
+def _exportar_csv(
+    df: pd.DataFrame,
+    salida: Path,
+    clave: list[str] | None = None,
+    compresion: Compresion | None = None
+) -> None:
+    # Temporal + rename: si la corrida muere a mitad queda el consolidado anterior
+    temporal = salida.with_suffix(".tmp")
+    try:
+        with abrir_salida(temporal, "w", compresion) as f:
+            df.to_csv(f, index=False, sep="|")
+        hashes = hash_filas(df, clave)
+    except Exception:
+        temporal.unlink(missing_ok=True)
+        raise
+
+    # El .idx acompaña al consolidado: una incremental posterior no puede
+    # confiar en el índice de una corrida anterior
+    invalidar_indice(salida)
+    os.replace(temporal, salida)
+    escribir_indice(salida, hashes)
+
+
+def _en_memoria(
+    reporte: Reporte,
+    archivos: list[Path],
+    leer,
+    salida: Path,
+    opciones: Opciones,
+    workers: int,
+    delta: EscritorDelta | None = None
+) -> Resultado:
+    resultado = Resultado(reporte.nombre, len(archivos))
+
+    # Un archivo con error se informa y queda en la carpeta; el resto sigue
+    leidos, resultado.fallidos = procesar_archivos(
+        archivos,
+        leer,
+        partial(normalizar, esquema=reporte.esquema),
+        workers,
+        opciones.adelanto
+    )
+    if not leidos:
+        return resultado
+
+    dfs = [df for _, df in leidos]
+    resultado.procesados = [archivo for archivo, _ in leidos]
+    resultado.leidas = {archivo.name: len(df) for archivo, df in leidos}
+    clave = list(reporte.clave) if reporte.clave else None
+
+    with medir_etapa("concat", reporte.nombre, sum(len(df) for df in dfs)) as m:
+        df_final = concatenar(dfs)
+        if reporte.tipar is not None:
+            df_final = reporte.tipar(df_final)
+        m["filas_salida"] = len(df_final)
+    del dfs
+
+    # CSV, Parquet y SQL son independientes: se escriben en paralelo
+    with TareasFondo() as fondo:
+        if opciones.incremental:
+            # Solo se agregan las filas que no están en el índice de hashes
+            with medir_etapa("exportacion_incremental", reporte.nombre, len(df_final)) as m:
+                tipos = reporte.esquema.tipos if reporte.esquema is not None else None
+                df_final = exportar_incremental(df_final, salida, clave, tipos, opciones.compresion)
+                m["filas_salida"] = len(df_final)
+        else:
+            with medir_etapa("deduplicacion", reporte.nombre, len(df_final)) as m:
+                df_final = deduplicar(df_final, clave)
+                m["filas_salida"] = len(df_final)
+
+            fondo.enviar(
+                partial(_exportar_csv, df_final, salida, clave, opciones.compresion),
+                "exportacion_csv",
+                reporte.nombre,
+                len(df_final)
+            )
+
+        if delta is not None:
+            fondo.enviar(partial(exportar_delta, delta, df_final), "delta", reporte.nombre, len(df_final))
+
+        if opciones.parquet:
+            fondo.enviar(
+                partial(
+                    exportar_parquet,
+                    df_final,
+                    salida,
+                    reporte.columna_fecha(df_final.columns),
+                    list(reporte.columnas_numericas),
+                    list(reporte.columnas_fecha) or None,
+                    opciones.incremental
+                ),
+                "parquet",
+                reporte.nombre,
+                len(df_final)
+            )
+
+        if opciones.sql:
+            fondo.enviar(
+                partial(cargar_consolidado, df_final, obtener_pool(), reporte.tabla(), clave, opciones.lote_sql),
+                "sql",
+                reporte.nombre,
+                len(df_final)
+            )
+
+        if _con_consulta(reporte, opciones):
+            fondo.enviar(
+                partial(
+                    actualizar_consulta,
+                    df_final,
+                    ruta_consulta(salida.parent),
+                    reporte.nombre,
+                    list(reporte.claves_consulta),
+                    opciones.incremental
+                ),
+                "indice_consulta",
+                reporte.nombre,
+                len(df_final)
+            )
+
+        if _con_kpi(reporte, opciones):
+            fondo.enviar(
+                partial(
+                    actualizar_agregados,
+                    df_final,
+                    ruta_kpi(salida.parent),
+                    list(reporte.agregados),
+                    opciones.incremental
+                ),
+                "kpi",
+                reporte.nombre,
+                len(df_final)
+            )
+
+        fondo.esperar()
+
+    resultado.filas = len(df_final)
+    resultado.totales = _totales(reporte, df_final)
+    return resultado
+
+
+def _destinos(
+    reporte: Reporte,
+    salida: Path,
+    columnas,
+    opciones: Opciones,
+    delta: EscritorDelta | None = None
+) -> dict:
+    # Etapa -> destino (escribir / marca / deshacer); en el orden de cierre
+    destinos = {}
+
+    if delta is not None:
+        destinos["delta"] = delta
+
+    if opciones.parquet:
+        destinos["parquet"] = EscritorParquet(
+            ruta_parquet(salida),
+            reporte.columna_fecha(columnas),
+            list(reporte.columnas_numericas),
+            list(reporte.columnas_fecha) or None,
+            opciones.incremental
+        )
+
+    if opciones.sql:
+        destinos["sql"] = CargaSQL(
+            obtener_pool(),
+            reporte.tabla(),
+            list(reporte.clave) if reporte.clave else None,
+            opciones.lote_sql
+        )
+
+    if _con_consulta(reporte, opciones):
+        destinos["indice_consulta"] = IndiceConsulta(
+            ruta_consulta(salida.parent),
+            reporte.nombre,
+            list(reporte.claves_consulta),
+            opciones.incremental
+        )
+
+    if _con_kpi(reporte, opciones):
+        destinos["kpi"] = AgregadosKPI(
+            ruta_kpi(salida.parent),
+            list(reporte.agregados),
+            opciones.incremental
+        )
+
+    return destinos
+
+
+def _con_consulta(reporte: Reporte, opciones: Opciones) -> bool:
+    return opciones.consulta and bool(reporte.claves_consulta)
+
+
+def _con_kpi(reporte: Reporte, opciones: Opciones) -> bool:
+    return opciones.kpi and bool(reporte.agregados)
+
+
+def _derivados(reporte: Reporte, salida: Path, ruta_salida: Path, opciones: Opciones) -> dict:
+    # Para el diario: dónde deshacer lo que una incremental a medias ya agregó
+    derivados = {}
+    if opciones.parquet:
+        derivados["parquet"] = str(ruta_parquet(salida))
+    if opciones.delta:
+        derivados["delta"] = [str(ruta_delta(ruta_salida)), ruta_base(salida).stem]
+    if _con_consulta(reporte, opciones):
+        derivados["consulta"] = [str(ruta_consulta(salida.parent)), reporte.nombre]
+    if _con_kpi(reporte, opciones):
+        derivados["kpi"] = [str(ruta_kpi(salida.parent)), [a.nombre for a in reporte.agregados]]
+    return derivados
+
+
+def _descartar_destinos(destinos: dict) -> None:
+    # SQL no necesita: su staging se vacía al inicio de la próxima carga
+    for destino in destinos.values():
+        if hasattr(destino, "descartar"):
+            destino.descartar()
+
+
+def _cerrar_destinos(destinos: dict, filas: int, nombre: str) -> None:
+    with TareasFondo() as fondo:
+        for etapa, destino in destinos.items():
+            # Parquet cierra su dataset; el resto confirma la carga
+            cerrar = destino.cerrar if etapa == "parquet" else destino.confirmar
+            fondo.enviar(cerrar, etapa, nombre, filas)
+        fondo.esperar()
+
+
+def _por_bloques(
+    reporte: Reporte,
+    archivos: list[Path],
+    salida: Path,
+    opciones: Opciones,
+    delta: EscritorDelta | None = None
+) -> Resultado:
+    resultado = Resultado(reporte.nombre, len(archivos))
+
+    # Con esquema las columnas de salida se conocen de antemano
+    columnas = reporte.esquema.columnas if reporte.esquema is not None else ()
+    destinos = _destinos(reporte, salida, columnas, opciones, delta)
+
+    (
+        resultado.procesados,
+        resultado.fallidos,
+        resultado.filas,
+        resultado.totales,
+        resultado.leidas
+    ) = consolidar_por_bloques(
+        archivos,
+        partial(normalizar, esquema=reporte.esquema),
+        salida,
+        opciones.filas_por_bloque,
+        clave=list(reporte.clave) if reporte.clave else None,
+        tipar=reporte.tipar,
+        incremental=opciones.incremental,
+        columnas_suma=list(reporte.columnas_suma),
+        destinos=list(destinos.values()),
+        esquema=reporte.esquema,
+        adelanto=opciones.adelanto,
+        compresion=opciones.compresion
+    )
+
+    if not resultado.procesados:
+        _descartar_destinos(destinos)
+        return resultado
+
+    _cerrar_destinos(destinos, resultado.filas, reporte.nombre)
+    return resultado
+
+
+def _lecturas(archivos: list[Path], leer, reporte: Reporte):
+    # Generador para adelantar(): lee y normaliza el archivo siguiente en un hilo
+    for archivo in archivos:
+        try:
+            with medir_etapa("lectura", archivo.name) as m:
+                df = leer(archivo)
+                m["filas_salida"] = len(df)
+            with medir_etapa("normalizacion", archivo.name, len(df)) as m:
+                df = normalizar(df, archivo.name, reporte.esquema)
+                if reporte.tipar is not None:
+                    df = reporte.tipar(df)
+                m["filas_salida"] = len(df)
+        except Exception as e:
+            logging.error(f"❌ Error procesando archivo {archivo.name}: {e}")
+            yield archivo, e
+            continue
+        yield archivo, df
+
+
+def _fuera_de_memoria(
+    reporte: Reporte,
+    archivos: list[Path],
+    leer,
+    salida: Path,
+    opciones: Opciones,
+    delta: EscritorDelta | None = None
+) -> Resultado:
+    # Cada archivo se reparte a disco por hash de fila, cada partición se
+    # deduplica sola y el resultado se escribe por ventanas a CSV / Parquet
+    # / SQL. En memoria nunca está todo el consolidado junto.
+    resultado = Resultado(reporte.nombre, len(archivos))
+    directorio = os.getenv("RUTA_TEMPORAL_DEDUP") or salida.parent
+    filas_por_bloque = opciones.filas_por_bloque or 500_000
+
+    clave = list(reporte.clave) if reporte.clave else None
+
+    with DedupExterno(opciones.particiones, filas_por_bloque, directorio, clave) as externo:
+        for archivo, df in adelantar(_lecturas(archivos, leer, reporte), opciones.adelanto):
+            if isinstance(df, Exception):
+                resultado.fallidos.append((archivo, str(df)))
+                continue
+            with medir_etapa("particion", archivo.name, len(df)):
+                externo.agregar(df)
+            resultado.procesados.append(archivo)
+            resultado.leidas[archivo.name] = len(df)
+            del df
+
+        if not resultado.procesados:
+            return resultado
+
+        with medir_etapa("deduplicacion", reporte.nombre, externo.filas) as m:
+            m["filas_salida"] = externo.deduplicar()
+
+        destinos = _destinos(reporte, salida, externo.columnas, opciones, delta)
+
+        temporal = salida.with_suffix(".tmp")
+        totales = {col: 0.0 for col in reporte.columnas_suma}
+        filas = 0
+        hashes = []
+        try:
+            with medir_etapa("exportacion", reporte.nombre, m["filas_salida"]) as e:
+                with abrir_salida(temporal, "w", opciones.compresion) as f:
+                    for df in externo.resultado():
+                        df.to_csv(f, header=filas == 0, index=False, sep="|")
+                        hashes.append(hash_filas(df, clave))
+                        for destino in destinos.values():
+                            destino.escribir(df)
+                        for col, total in _totales(reporte, df).items():
+                            totales[col] += total
+                        filas += len(df)
+
+                    # Sin filas: solo el encabezado, como el modo en memoria
+                    if filas == 0:
+                        pd.DataFrame(columns=externo.columnas).to_csv(f, index=False, sep="|")
+                e["filas_salida"] = filas
+        except Exception:
+            temporal.unlink(missing_ok=True)
+            _descartar_destinos(destinos)
+            raise
+
+        invalidar_indice(salida)
+        os.replace(temporal, salida)
+        escribir_indice(salida, np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64))
+        _cerrar_destinos(destinos, filas, reporte.nombre)
+
+    resultado.filas = filas
+    resultado.totales = totales
+    return resultado
+
+
+# =============================================================
+# CONSOLIDAR UN REPORTE
+# =============================================================
+def consolidar(
+    reporte: Reporte,
+    archivos: list[Path],
+    ruta_salida: Path,
+    opciones: Opciones,
+    ruta_procesado: Path | None = None,
+    manifiesto: Manifiesto | None = None
+) -> Resultado:
+    salida = ruta_comprimida(ruta_salida / reporte.salida, opciones.compresion)
+
+    diario = None
+    if opciones.diario and ruta_procesado is not None:
+        # Lo que una corrida anterior ya confirmó no se vuelve a consolidar
+        diario = Diario(ruta_diario(ruta_salida), reporte.nombre, salida)
+        confirmados = diario.recuperar(ruta_procesado, mover_a_procesado)
+        archivos = [archivo for archivo in archivos if archivo.name not in confirmados]
+
+    if manifiesto:
+        vigentes = all([manifiesto.vigente(a) for a in archivos])
+        manifiesto.purgar(reporte.prefijo)
+
+    if not archivos:
+        logging.warning(f"⚠ No se encontraron archivos {reporte.nombre}")
+        return Resultado(reporte.nombre)
+
+    if manifiesto:
+        # Nada nuevo, modificado ni eliminado: el consolidado ya está al día
+        if (
+            vigentes
+            and not manifiesto.hubo_cambios(reporte.prefijo)
+            and salida.exists()
+            and (not opciones.parquet or ruta_parquet(salida).exists())
+        ):
+            logging.info(f"⏭ {reporte.nombre} sin cambios, se conserva: {salida}")
+            return Resultado(reporte.nombre, len(archivos), omitido=True)
+
+    if _con_consulta(reporte, opciones) and opciones.incremental and salida.exists():
+        # Primera corrida incremental con índice: se parte del consolidado
+        ruta = ruta_consulta(salida.parent)
+        if not existe_tabla(ruta, reporte.nombre):
+            tipos = reporte.esquema.tipos if reporte.esquema is not None else None
+            reconstruir_consulta(salida, ruta, reporte.nombre, list(reporte.claves_consulta), tipos)
+
+    if _con_kpi(reporte, opciones) and opciones.incremental and salida.exists():
+        # Ídem KPI: el delta solo sirve si el agregado ya cubre el consolidado
+        ruta = ruta_kpi(salida.parent)
+        if not existen_agregados(ruta, list(reporte.agregados)):
+            tipos = reporte.esquema.tipos if reporte.esquema is not None else None
+            reconstruir_agregados(salida, ruta, list(reporte.agregados), tipos)
+
+    leer = partial(leer_archivo_generico, esquema=reporte.esquema)
+    workers = opciones.workers
+
+    if manifiesto:
+        # Manifiesto + caché: solo se parsean archivos nuevos o modificados.
+        # El manifiesto vive en este proceso: sin pool de procesos.
+        leer = partial(manifiesto.obtener, leer=leer)
+        workers = 1
+
+    if diario is not None:
+        diario.iniciar(archivos, opciones.incremental, _derivados(reporte, salida, ruta_salida, opciones))
+        if opciones.intermedios:
+            leer = diario.lector(leer)
+
+    delta = None
+    if opciones.delta:
+        # Antes de exportar: en corrida completa compara contra el consolidado anterior
+        delta = EscritorDelta(
+            salida,
+            ruta_delta(ruta_salida),
+            list(reporte.clave) if reporte.clave else None,
+            reporte.esquema.tipos if reporte.esquema is not None else None,
+            opciones.incremental
+        )
+
+    try:
+        if opciones.fuera_de_memoria and not opciones.incremental:
+            resultado = _fuera_de_memoria(reporte, archivos, leer, salida, opciones, delta)
+            modo = "generado fuera de memoria"
+        elif opciones.filas_por_bloque > 0 and manifiesto is None:
+            resultado = _por_bloques(reporte, archivos, salida, opciones, delta)
+            modo = "generado por bloques"
+        else:
+            resultado = _en_memoria(reporte, archivos, leer, salida, opciones, workers, delta)
+            modo = "actualizado" if opciones.incremental else "generado"
+    except Exception:
+        if delta is not None:
+            delta.descartar()
+        raise
+
+    if resultado.fallidos:
+        logging.warning(f"⚠ Archivos {reporte.nombre} con error: {len(resultado.fallidos)}")
+
+    if not resultado.procesados:
+        if delta is not None:
+            delta.descartar()
+        if diario is not None:
+            diario.terminar()
+        logging.warning(f"⚠ Ningún archivo {reporte.nombre} se pudo procesar")
+        return resultado
+
+    if diario is not None:
+        diario.confirmar(resultado.procesados)
+
+    if _con_kpi(reporte, opciones):
+        # Totales de todo el consolidado desde el agregado, sin releerlo
+        agregado = next(
+            (a for a in reporte.agregados if set(reporte.columnas_suma) <= set(a.sumas)),
+            None
+        )
+        if agregado is not None and reporte.columnas_suma:
+            resultado.totales = totales_kpi(ruta_kpi(ruta_salida), agregado, list(reporte.columnas_suma))
+
+    totales = "".join(f" | {col}: {total}" for col, total in resultado.totales.items())
+    logging.info(f"✅ Consolidado {reporte.nombre} {modo}: {salida} | Filas: {resultado.filas}{totales}")
+
+    if delta is not None:
+        registrar_corrida(
+            delta,
+            reporte.nombre,
+            modo,
+            resultado.procesados,
+            resultado.leidas,
+            resultado.fallidos,
+            resultado.filas,
+            resultado.totales
+        )
+
+    # Solo después de exportar; los movimientos van en paralelo
+    if ruta_procesado is not None:
+        with TareasFondo() as fondo:
+            for archivo in resultado.procesados:
+                fondo.enviar(partial(_mover_con_diario, archivo, ruta_procesado, diario))
+            fondo.esperar()
+
+    if diario is not None:
+        diario.cerrar()
+
+    logging.info(f"🏁 Proceso {reporte.nombre} finalizado correctamente")
+    return resultado
+
+
+# =============================================================
+# REPORTES DE LA CARPETA FTP
+# =============================================================
+def rutas_ftp() -> tuple[Path, Path, Path]:
+    ruta_ftp = os.getenv("RUTA_FTP_FLEXY")
+    ruta_output = os.getenv("RUTA_OUTPUT")
+
+    if not ruta_ftp or not ruta_output:
+        raise ValueError("❌ Revisar variables de entorno")
+
+    ruta_ftp, ruta_output = Path(ruta_ftp), Path(ruta_output)
+    ruta_output.mkdir(parents=True, exist_ok=True)
+    ruta_procesado = ruta_ftp / "Procesado"
+    ruta_procesado.mkdir(exist_ok=True)
+
+    return ruta_ftp, ruta_output, ruta_procesado
+
+
+def consolidar_ftp(
+    reporte: Reporte,
+    opciones: Opciones,
+    archivos: list[Path] | None = None
+) -> Resultado:
+    ruta_ftp, ruta_output, ruta_procesado = rutas_ftp()
+
+    # Sin lista explícita (modo vigilancia) se recorre la carpeta FTP
+    candidatos = list(ruta_ftp.iterdir()) if archivos is None else list(archivos)
+    encontrados = detectar_archivos(candidatos, [reporte])[reporte.nombre]
+
+    return consolidar(reporte, encontrados, ruta_output, opciones, ruta_procesado)
+
+
+def consolidar_reportes_ftp(
+    reportes: list[Reporte],
+    opciones: Opciones,
+    archivos: list[Path] | None = None
+) -> list[Resultado]:
+    ruta_ftp, ruta_output, ruta_procesado = rutas_ftp()
+
+    # Un solo recorrido de la carpeta: cada archivo va a su reporte por prefijo
+    candidatos = list(ruta_ftp.iterdir()) if archivos is None else list(archivos)
+    encontrados = detectar_archivos(candidatos, reportes)
+
+    resultados = []
+    for reporte in reportes:
+        try:
+            resultados.append(
+                consolidar(reporte, encontrados[reporte.nombre], ruta_output, opciones, ruta_procesado)
+            )
+        except Exception as e:
+            # Un reporte con error no frena a los demás
+            logging.error(f"❌ Error en consolidado {reporte.nombre}: {e}")
+            resultados.append(Resultado(reporte.nombre, len(encontrados[reporte.nombre]), error=str(e)))
+
+    return resultados
+
+
+# =============================================================
+# RESUMEN DE LA EJECUCIÓN
+# =============================================================
+def informar_resumen(resultados: list[Resultado]) -> bool:
+    for r in resultados:
+        if r.error is not None:
+            estado = f"❌ {r.error}"
+        elif r.omitido:
+            estado = "⏭ sin cambios"
+        elif r.fallidos:
+            estado = f"⚠ {len(r.fallidos)} archivo(s) con error"
+        else:
+            estado = "✅"
+        logging.info(
+            f"📊 {r.nombre} | Archivos: {r.archivos} | Procesados: {len(r.procesados)} | "
+            f"Filas: {r.filas} | {estado}"
+        )
+
+    return all(r.correcto for r in resultados)
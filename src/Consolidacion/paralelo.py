@@ -0,0 +1,103 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from src.log.logging import medicion, registrar_etapa
+from src.Consolidacion.pipeline import adelantar
+
+# =============================================================
+# LECTURA + NORMALIZACIÓN DE ARCHIVOS (SECUENCIAL O EN POOL)
+# =============================================================
+# Las funciones de lectura/normalización deben ser de nivel módulo
+# para que el pool pueda enviarlas a los procesos hijos. En modo
+# secuencial un hilo lee el archivo siguiente mientras se normaliza
+# el actual.
+Lector = Callable[[Path], pd.DataFrame]
+Normalizador = Callable[[pd.DataFrame, str], pd.DataFrame]
+
+
+def _leer(archivo: Path, leer: Lector) -> tuple[pd.DataFrame, dict]:
+    with medicion("lectura", archivo.name) as m:
+        df = leer(archivo)
+        m["filas_salida"] = len(df)
+    return df, m
+
+
+def _normalizar(archivo: Path, df: pd.DataFrame, normalizar: Normalizador) -> tuple[pd.DataFrame, dict]:
+    with medicion("normalizacion", archivo.name, len(df)) as m:
+        df = normalizar(df, archivo.name)
+        m["filas_salida"] = len(df)
+    return df, m
+
+
+def _leer_y_normalizar(
+    archivo: Path,
+    leer: Lector,
+    normalizar: Normalizador
+) -> tuple[pd.DataFrame, list[dict]]:
+    # Las mediciones vuelven al proceso principal junto con el resultado
+    df, lectura = _leer(archivo, leer)
+    df, normalizacion = _normalizar(archivo, df, normalizar)
+    return df, [lectura, normalizacion]
+
+
+def _lecturas(archivos: list[Path], leer: Lector):
+    # El error de lectura viaja como valor: el resto de archivos sigue
+    for i, archivo in enumerate(archivos):
+        try:
+            df, registro = _leer(archivo, leer)
+        except Exception as e:
+            yield i, e, None
+            continue
+        yield i, df, registro
+
+
+def procesar_archivos(
+    archivos: list[Path],
+    leer: Lector,
+    normalizar: Normalizador,
+    workers: int = 1,
+    adelanto: int = 2
+) -> tuple[list[tuple[Path, pd.DataFrame]], list[tuple[Path, str]]]:
+    resultados: dict[int, pd.DataFrame] = {}
+    errores: dict[int, str] = {}
+
+    if workers <= 1 or len(archivos) <= 1:
+        for i, df, lectura in adelantar(_lecturas(archivos, leer), adelanto):
+            if isinstance(df, Exception):
+                errores[i] = str(df)
+                continue
+            try:
+                registrar_etapa(lectura)
+                resultados[i], normalizacion = _normalizar(archivos[i], df, normalizar)
+                registrar_etapa(normalizacion)
+            except Exception as e:
+                errores[i] = str(e)
+    else:
+        workers = min(workers, len(archivos))
+        logging.info(f"⚙ Procesando {len(archivos)} archivos con {workers} procesos")
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = {
+                pool.submit(_leer_y_normalizar, archivo, leer, normalizar): i
+                for i, archivo in enumerate(archivos)
+            }
+            for futuro in as_completed(futuros):
+                i = futuros[futuro]
+                try:
+                    resultados[i], registros = futuro.result()
+                    for registro in registros:
+                        registrar_etapa(registro)
+                except Exception as e:
+                    errores[i] = str(e)
+
+    for i in sorted(errores):
+        logging.error(f"❌ Error procesando archivo {archivos[i].name}: {errores[i]}")
+
+    # Orden determinístico: el mismo de la lista de entrada
+    ok = [(archivos[i], resultados[i]) for i in sorted(resultados)]
+    fallidos = [(archivos[i], errores[i]) for i in sorted(errores)]
+    return ok, fallidos
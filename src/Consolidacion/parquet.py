@@ -0,0 +1,161 @@
+import shutil
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.Consolidacion.compresion import ruta_base
+
+# =============================================================
+# SALIDA PARQUET PARTICIONADA (MES / EMPRESA)
+# =============================================================
+# Dataset estilo hive: <destino>/Mes=2024-05/Empresa=VILLA/*.parquet
+# pyarrow es opcional: solo se exige si se pide salida Parquet.
+SIN_VALOR = "SIN_DATO"
+
+
+def _importar_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError("❌ Salida Parquet requiere pyarrow (pip install pyarrow)") from e
+    return pa, ds
+
+
+def ruta_parquet(salida: Path) -> Path:
+    return ruta_base(salida).with_suffix(".parquet")
+
+
+def detectar_columna(df: pd.DataFrame, candidatos: list[str]) -> str | None:
+    return next((c for c in candidatos if c in df.columns), None)
+
+
+def _tipar_para_parquet(
+    df: pd.DataFrame,
+    columnas_fecha: list[str],
+    columnas_numericas: list[str]
+) -> pd.DataFrame:
+    df = df.copy()
+
+    for col in df.columns:
+        if col in columnas_fecha:
+            df[col] = pd.to_datetime(df[col], errors="coerce").astype("datetime64[ms]")
+        elif col in columnas_numericas:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        elif pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].astype("datetime64[ms]")
+        elif not pd.api.types.is_numeric_dtype(df[col]):
+            # Texto uniforme entre corridas (evita columnas "null" en Arrow)
+            df[col] = df[col].astype("string")
+
+    return df
+
+
+class EscritorParquet:
+
+    def __init__(
+        self,
+        destino: Path,
+        columna_fecha: str | None,
+        columnas_numericas: list[str] | None = None,
+        columnas_fecha: list[str] | None = None,
+        incremental: bool = False
+    ):
+        self._pa, self._ds = _importar_pyarrow()
+
+        self.destino = destino
+        self.columna_fecha = columna_fecha
+        self.columnas_numericas = columnas_numericas or []
+        self.columnas_fecha = columnas_fecha or ([columna_fecha] if columna_fecha else [])
+        self.incremental = incremental
+
+        # Reescritura completa: se arma en un directorio temporal y se
+        # intercambia al cerrar, para no mezclar particiones viejas
+        self._trabajo = destino if incremental else destino.with_name(destino.name + ".tmp")
+        if not incremental and self._trabajo.exists():
+            shutil.rmtree(self._trabajo)
+
+        self._prefijo = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._partes = 0
+        self._escritos: list[tuple[str, int]] = []
+        self.filas = 0
+
+    def escribir(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        df = _tipar_para_parquet(df, self.columnas_fecha, self.columnas_numericas)
+
+        particiones = []
+        if self.columna_fecha:
+            df["Mes"] = (
+                df[self.columna_fecha]
+                .dt.strftime("%Y-%m")
+                .fillna(SIN_VALOR)
+            )
+            particiones.append("Mes")
+        if "Empresa" in df.columns:
+            df["Empresa"] = df["Empresa"].fillna(SIN_VALOR).replace({"": SIN_VALOR, "nan": SIN_VALOR})
+            particiones.append("Empresa")
+
+        tabla = self._pa.Table.from_pandas(df, preserve_index=False)
+
+        self._ds.write_dataset(
+            tabla,
+            self._trabajo,
+            format="parquet",
+            partitioning=particiones or None,
+            partitioning_flavor="hive" if particiones else None,
+            basename_template=f"parte_{self._prefijo}_{self._partes}_{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_visitor=lambda archivo: self._escritos.append(
+                (archivo.path, archivo.metadata.num_rows)
+            )
+        )
+
+        self._partes += 1
+        self.filas += len(df)
+
+    # Permite descartar lo escrito de un archivo que falló a mitad
+    def marca(self) -> int:
+        return len(self._escritos)
+
+    def deshacer(self, marca: int) -> None:
+        for ruta, filas in self._escritos[marca:]:
+            Path(ruta).unlink(missing_ok=True)
+            self.filas -= filas
+        del self._escritos[marca:]
+
+    def cerrar(self) -> None:
+        if not self.incremental:
+            if self.destino.exists():
+                shutil.rmtree(self.destino)
+            if self._trabajo.exists():
+                self._trabajo.rename(self.destino)
+
+        logging.info(f"🧱 Parquet {self.destino.name} | Filas escritas: {self.filas}")
+
+    def descartar(self) -> None:
+        if not self.incremental and self._trabajo.exists():
+            shutil.rmtree(self._trabajo)
+
+
+def exportar_parquet(
+    df: pd.DataFrame,
+    salida: Path,
+    columna_fecha: str | None,
+    columnas_numericas: list[str] | None = None,
+    columnas_fecha: list[str] | None = None,
+    incremental: bool = False
+) -> None:
+    escritor = EscritorParquet(
+        ruta_parquet(salida),
+        columna_fecha,
+        columnas_numericas,
+        columnas_fecha,
+        incremental
+    )
+    escritor.escribir(df)
+    escritor.cerrar()
@@ -0,0 +1,180 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+import pandas as pd
+
+from src.log.logging import medir_etapa
+
+# =============================================================
+# PIPELINE CON HILOS (LECTURA ADELANTADA + ESCRITURA EN FONDO)
+# =============================================================
+# Leer es sobre todo disco / red y el parser de CSV suelta el GIL:
+# mientras se normaliza un archivo (o bloque) un hilo ya lee el
+# siguiente. Las colas son acotadas: la lectura nunca va más de N
+# elementos adelante y la memoria no crece sin límite.
+T = TypeVar("T")
+
+_FIN = object()
+
+
+class _Error:
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def adelantar(origen: Iterable[T], tamano: int = 2) -> Iterator[T]:
+    # tamano = 0: sin hilo, igual que iterar el origen directamente
+    if tamano <= 0:
+        yield from origen
+        return
+
+    cola: queue.Queue = queue.Queue(maxsize=tamano)
+    detener = threading.Event()
+
+    def poner(elemento) -> bool:
+        while not detener.is_set():
+            try:
+                cola.put(elemento, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producir():
+        try:
+            for elemento in origen:
+                if not poner(elemento):
+                    return
+            poner(_FIN)
+        except BaseException as e:
+            poner(_Error(e))
+
+    hilo = threading.Thread(target=producir, name="lectura_adelantada", daemon=True)
+    hilo.start()
+
+    try:
+        while True:
+            elemento = cola.get()
+            if elemento is _FIN:
+                return
+            if isinstance(elemento, _Error):
+                raise elemento.error
+            yield elemento
+    finally:
+        # El consumidor cortó antes (error o break): se libera al productor
+        detener.set()
+        hilo.join()
+
+
+class DestinoEnFondo:
+    # Envuelve un destino (Parquet, SQL: escribir / marca / deshacer) y
+    # escribe en su propio hilo. marca() y vaciar() esperan a que la cola
+    # se vacíe, así un error queda dentro del archivo que lo produjo.
+
+    def __init__(self, destino, tamano: int = 2):
+        self.destino = destino
+        self._error: BaseException | None = None
+        self._hilo = None
+
+        if tamano > 0:
+            self._cola: queue.Queue = queue.Queue(maxsize=tamano)
+            self._hilo = threading.Thread(
+                target=self._trabajar,
+                name=f"destino_{type(destino).__name__}",
+                daemon=True
+            )
+            self._hilo.start()
+
+    def _trabajar(self) -> None:
+        while True:
+            df = self._cola.get()
+            try:
+                if df is _FIN:
+                    return
+                # Tras un error se descarta el resto hasta que se informe
+                if self._error is None:
+                    self.destino.escribir(df)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._cola.task_done()
+
+    def _revisar(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def escribir(self, df: pd.DataFrame) -> None:
+        if self._hilo is None:
+            self.destino.escribir(df)
+            return
+        self._revisar()
+        self._cola.put(df)
+
+    def vaciar(self) -> None:
+        if self._hilo is not None:
+            self._cola.join()
+            self._revisar()
+
+    def marca(self) -> int:
+        self.vaciar()
+        return self.destino.marca()
+
+    def deshacer(self, marca: int) -> None:
+        if self._hilo is not None:
+            # Se deshace igual: el error pendiente ya no importa
+            self._cola.join()
+            self._error = None
+        self.destino.deshacer(marca)
+
+    def detener(self) -> None:
+        if self._hilo is not None:
+            self._cola.put(_FIN)
+            self._hilo.join()
+            self._hilo = None
+
+
+class TareasFondo:
+    # Tareas independientes (exportar CSV / Parquet / SQL, mover a
+    # Procesado) en paralelo; esperar() propaga el primer error.
+
+    def __init__(self, hilos: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=max(hilos, 1), thread_name_prefix="fondo")
+        self._futuros = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self._pool.shutdown(wait=True)
+
+    def enviar(
+        self,
+        funcion: Callable[[], object],
+        etapa: str | None = None,
+        archivo: str | None = None,
+        filas_entrada: int | None = None
+    ) -> None:
+        if etapa is not None:
+            self._futuros.append(self._pool.submit(self._medir, funcion, etapa, archivo, filas_entrada))
+        else:
+            self._futuros.append(self._pool.submit(funcion))
+
+    @staticmethod
+    def _medir(funcion, etapa, archivo, filas_entrada):
+        with medir_etapa(etapa, archivo, filas_entrada):
+            return funcion()
+
+    def esperar(self) -> None:
+        futuros, self._futuros = self._futuros, []
+        errores = []
+        for futuro in futuros:
+            try:
+                futuro.result()
+            except Exception as e:
+                errores.append(e)
+        if errores:
+            raise errores[0]
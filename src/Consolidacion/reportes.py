@@ -0,0 +1,140 @@
+import pandas as pd
+
+from src.Consolidacion.esquemas import ESQUEMA_PARTES, ESQUEMA_PICKING
+from src.Consolidacion.motor import Reporte
+from src.Database.agregados import Agregado
+from src.Consolidacion.tipos import transformar_categorias
+
+# =============================================================
+# REGISTRO DE REPORTES
+# =============================================================
+# Todo lo propio de cada reporte está acá; el resto lo resuelve el motor.
+
+
+# =============================================================
+# NORMALIZAR TIPOS PARTES (CRÍTICO)
+# =============================================================
+def tipar_partes(df: pd.DataFrame) -> pd.DataFrame:
+    for col in ["Bultos_Totales", "Ingresos", "Salidas"]:
+        df[col] = (
+            pd.to_numeric(df[col], errors="coerce")
+            .fillna(0)
+        )
+
+    # Sobre las categorías: una vez por valor distinto, no por fila
+    for col in ["Movimiento", "Estado", "Producto", "Empresa"]:
+        df[col] = transformar_categorias(
+            df[col],
+            lambda valores: valores.astype(str).str.strip().str.upper()
+        )
+
+    return df
+
+
+REPORTE_PICKING = Reporte(
+    nombre="PICKING",
+    prefijo="PROD_ANALISIS_PICKING",
+    salida="PROD_ANALISIS_PICKING_CONSOLIDADO.csv",
+    esquema=ESQUEMA_PICKING,
+    particion_fecha=("Fecha_Creacion_Gestion",),
+    columnas_fecha=(
+        "Fecha_Creacion_Gestion",
+        "Fecha_Inicio_Picker",
+        "Fecha_Cierre_Picker"
+    ),
+    columnas_numericas=(
+        "Nro_Codigos",
+        "Nro_Ubicaciones",
+        "Cantidad_Solicitada",
+        "Cantidad_Picking",
+        "Tiempo_Recorrido_Picker",
+        "Tiempo_Mov_Prom_Picker"
+    ),
+    tabla_sql="PROD_ANALISIS_PICKING",
+    claves_consulta=("Nro_Gestion", "Nro_Orden"),
+    # Productividad por Picker y día de cierre: gestiones, unidades y recorrido
+    agregados=(
+        Agregado(
+            nombre="KPI_PICKER_DIA",
+            grupo=("Picker",),
+            columna_fecha="Fecha_Cierre_Picker",
+            sumas=("Cantidad_Solicitada", "Cantidad_Picking", "Tiempo_Recorrido_Picker"),
+            conteo="Gestiones"
+        ),
+    )
+)
+
+REPORTE_PARTES = Reporte(
+    nombre="PARTES",
+    prefijo="PROD_ANALISIS_PARTES",
+    salida="PROD_ANALISIS_PARTES_CONSOLIDADO.csv",
+    esquema=ESQUEMA_PARTES,
+    # Clave de negocio: todas las columnas salvo Archivo_Origen
+    clave=(
+        "Fecha",
+        "Movimiento",
+        "Nro_Pedido",
+        "Estado",
+        "Codigo",
+        "Producto",
+        "Bultos_Totales",
+        "Ingresos",
+        "Salidas",
+        "Nro_Orden",
+        "Empresa"
+    ),
+    particion_fecha=("Fecha",),
+    columnas_numericas=("Bultos_Totales", "Ingresos", "Salidas"),
+    columnas_suma=("Ingresos", "Salidas"),
+    tipar=tipar_partes,
+    tabla_sql="PROD_ANALISIS_PARTES",
+    claves_consulta=("Nro_Pedido", "Nro_Orden", "Codigo"),
+    agregados=(
+        Agregado(
+            nombre="KPI_PARTES_DIA",
+            grupo=("Codigo", "Empresa"),
+            columna_fecha="Fecha",
+            sumas=("Ingresos", "Salidas"),
+            conteo="Movimientos"
+        ),
+    )
+)
+
+# Históricos: sin esquema, se consolidan las columnas tal cual vienen
+COLUMNAS_FECHA_HISTORICO = (
+    "Fecha",
+    "Fecha Creacion Gestion",
+    "Fecha Creación Gestion",
+    "Fecha_Creacion_Gestion"
+)
+
+EXTENSIONES_HISTORICO = (".xlsx", ".xls", ".csv")
+
+REPORTE_CHECKING_HISTORICO = Reporte(
+    nombre="CHECKING_HISTORICO",
+    prefijo="CHECKING_",
+    salida="Checking_Historico_Consolidado.csv",
+    particion_fecha=COLUMNAS_FECHA_HISTORICO,
+    extensiones=EXTENSIONES_HISTORICO
+)
+
+REPORTE_PICKING_HISTORICO = Reporte(
+    nombre="PICKING_HISTORICO",
+    prefijo="PICKING_",
+    salida="Picking_Historico_Consolidado.csv",
+    particion_fecha=COLUMNAS_FECHA_HISTORICO,
+    extensiones=EXTENSIONES_HISTORICO
+)
+
+# Reportes que llegan a la carpeta FTP (RUTA_FTP_FLEXY)
+REPORTES_FTP = [REPORTE_PICKING, REPORTE_PARTES]
+
+REPORTES = {
+    reporte.nombre: reporte
+    for reporte in [
+        REPORTE_PICKING,
+        REPORTE_PARTES,
+        REPORTE_CHECKING_HISTORICO,
+        REPORTE_PICKING_HISTORICO
+    ]
+}
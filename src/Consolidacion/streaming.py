@@ -0,0 +1,216 @@
+import os
+import logging
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from src.log.logging import medir_etapa
+from src.Consolidacion.cache_excel import leer_excel_cacheado
+from src.Consolidacion.codificacion import corregir_codificacion, detectar_codificacion
+from src.Consolidacion.compresion import Compresion, abrir_salida
+from src.Consolidacion.esquemas import Esquema, encabezados_archivo, plan_para
+from src.Consolidacion.pipeline import DestinoEnFondo, adelantar
+from src.Consolidacion.indice_hash import (
+    ConjuntoHashes,
+    agregar_al_indice,
+    escribir_indice,
+    hash_filas,
+    invalidar_indice,
+    preparar_incremental,
+    ruta_indice,
+)
+
+# =============================================================
+# LECTURA POR BLOQUES (MEMORIA ACOTADA)
+# =============================================================
+# CSV / TXT se leen de a N filas; XLSX no se puede leer por partes
+# con pandas y entra como un único bloque.
+def limpiar_texto(df: pd.DataFrame) -> pd.DataFrame:
+    return df.apply(lambda col: col.astype(str).str.strip())
+
+
+def leer_por_bloques(
+    archivo: Path,
+    filas_por_bloque: int,
+    esquema: Esquema | None = None
+) -> Iterator[pd.DataFrame]:
+    sufijo = archivo.suffix.lower()
+
+    if sufijo == ".xlsx":
+        # Libro completo (cacheado por contenido), proyectado al esquema
+        df = leer_excel_cacheado(archivo)
+        if esquema is not None:
+            df = df[list(plan_para(esquema, tuple(df.columns)).usecols)]
+        yield df
+        return
+
+    if sufijo not in [".csv", ".txt"]:
+        raise ValueError(f"Formato no soportado: {archivo.name}")
+
+    codificacion = detectar_codificacion(archivo)
+    # Filas ya entregadas y sus columnas: si la decodificación falla a
+    # mitad, se sigue en latin-1 desde ahí (lo entregado ya es válido)
+    entregadas = 0
+    columnas = None
+
+    while True:
+        try:
+            usecols = None
+            if esquema is not None:
+                usecols = list(plan_para(esquema, encabezados_archivo(archivo, codificacion)).usecols)
+
+            with pd.read_csv(
+                archivo,
+                encoding=codificacion,
+                sep=",",
+                dtype=str,
+                usecols=usecols,
+                skiprows=range(1, entregadas + 1) if entregadas else None,
+                chunksize=filas_por_bloque
+            ) as lector:
+                for bloque in lector:
+                    if columnas is None:
+                        columnas = bloque.columns
+                    else:
+                        # Mismo encabezado, quizá decodificado distinto
+                        bloque.columns = columnas
+                    entregadas += len(bloque)
+                    yield limpiar_texto(bloque)
+            return
+
+        except UnicodeDecodeError as e:
+            codificacion = corregir_codificacion(archivo, codificacion, e)
+
+
+# =============================================================
+# CONSOLIDAR POR BLOQUES (NORMALIZAR + DEDUP + ESCRITURA)
+# =============================================================
+def consolidar_por_bloques(
+    archivos: list[Path],
+    normalizar: Callable[[pd.DataFrame, str], pd.DataFrame],
+    salida: Path,
+    filas_por_bloque: int,
+    clave: list[str] | None = None,
+    tipar: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+    incremental: bool = False,
+    columnas_suma: list[str] | None = None,
+    destinos: list | None = None,
+    esquema: Esquema | None = None,
+    adelanto: int = 0,
+    compresion: Compresion | None = None
+) -> tuple[list[Path], list[tuple[Path, str]], int, dict[str, float], dict[str, int]]:
+    # Destinos extra (Parquet, SQL): escribir(df), marca(), deshacer(marca)
+    # Con adelanto > 0 el bloque siguiente se lee y los destinos escriben
+    # en hilos aparte mientras se normaliza y exporta el actual
+    columnas_suma = columnas_suma or []
+    destinos = [DestinoEnFondo(destino, adelanto) for destino in destinos or []]
+
+    tipos = esquema.tipos if esquema is not None else None
+    indice = (
+        preparar_incremental(salida, clave, tipos)
+        if incremental else np.empty(0, dtype=np.uint64)
+    )
+    vistos = ConjuntoHashes(indice)
+    hashes_nuevos: list[np.ndarray] = []
+
+    procesados: list[Path] = []
+    fallidos: list[tuple[Path, str]] = []
+    filas = 0
+    totales = {col: 0.0 for col in columnas_suma}
+    # Filas leídas por archivo (antes de dedup)
+    leidas: dict[str, int] = {}
+
+    # Reescritura completa: se escribe a un temporal y se reemplaza al
+    # final, para no dejar el consolidado vacío si fallan todos los archivos
+    modo = "a" if incremental and salida.exists() else "w"
+    archivo_salida = salida if modo == "a" else salida.with_suffix(".tmp")
+    encabezado = modo == "w"
+
+    try:
+        with abrir_salida(archivo_salida, modo, compresion) as f:
+            for archivo in archivos:
+                # Si el archivo falla a mitad, se descarta lo escrito de él
+                posicion = f.tell()
+                marcas = [destino.marca() for destino in destinos]
+                locales = ConjuntoHashes()
+                filas_archivo = 0
+                totales_archivo = {col: 0.0 for col in columnas_suma}
+
+                with medir_etapa("consolidacion_bloques", archivo.name, 0) as m:
+                    try:
+                        bloques = adelantar(leer_por_bloques(archivo, filas_por_bloque, esquema), adelanto)
+                        for bloque in bloques:
+                            m["filas_entrada"] += len(bloque)
+                            df = normalizar(bloque, archivo.name)
+                            if tipar is not None:
+                                df = tipar(df)
+
+                            hashes = hash_filas(df, clave)
+                            mascara = ~pd.Series(hashes).duplicated().to_numpy()
+                            mascara &= ~vistos.contiene(hashes)
+                            mascara &= ~locales.contiene(hashes)
+
+                            df = df[mascara]
+                            locales.agregar(hashes[mascara])
+
+                            df.to_csv(f, header=encabezado, index=False, sep="|")
+                            encabezado = False
+
+                            for destino in destinos:
+                                destino.escribir(df)
+
+                            filas_archivo += len(df)
+                            for col in columnas_suma:
+                                totales_archivo[col] += df[col].sum()
+
+                        # Lo pendiente en los hilos de los destinos es parte de este archivo
+                        for destino in destinos:
+                            destino.vaciar()
+
+                    except Exception as e:
+                        f.seek(posicion)
+                        f.truncate()
+                        for destino, marca in zip(destinos, marcas):
+                            destino.deshacer(marca)
+                        encabezado = posicion == 0 and modo == "w"
+                        m["ok"] = False
+                        fallidos.append((archivo, str(e)))
+                        logging.error(f"❌ Error procesando archivo {archivo.name}: {e}")
+                        continue
+
+                    m["filas_salida"] = filas_archivo
+
+                nuevos = locales.valores()
+                vistos.agregar(nuevos)
+                hashes_nuevos.append(nuevos)
+
+                procesados.append(archivo)
+                leidas[archivo.name] = m["filas_entrada"]
+                filas += filas_archivo
+                for col in columnas_suma:
+                    totales[col] += totales_archivo[col]
+
+                logging.info(f"🧩 {archivo.name} procesado por bloques | Filas nuevas: {filas_archivo}")
+    finally:
+        for destino in destinos:
+            destino.detener()
+
+    nuevos = np.concatenate(hashes_nuevos) if hashes_nuevos else np.empty(0, dtype=np.uint64)
+
+    if archivo_salida != salida:
+        if procesados:
+            if not incremental:
+                invalidar_indice(salida)
+            os.replace(archivo_salida, salida)
+        else:
+            archivo_salida.unlink()
+
+    if incremental and hashes_nuevos:
+        agregar_al_indice(ruta_indice(salida), nuevos)
+    elif not incremental and procesados:
+        # Reescritura completa: el .idx de una corrida incremental previa ya no sirve
+        escribir_indice(salida, nuevos)
+
+    return procesados, fallidos, filas, totales, leidas
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.Consolidacion import cache_excel
+
+
+@pytest.mark.parametrize("sufijo, motor", [(".xlsx", "openpyxl"), (".XLSX", "openpyxl"), (".xls", None)])
+def test_motor_segun_extension(monkeypatch, sufijo: str, motor: str | None):
+    usados = []
+
+    def leer(archivo, **kwargs):
+        usados.append(kwargs.get("engine"))
+        return pd.DataFrame({"a": [" x "]})
+
+    monkeypatch.setattr(cache_excel.pd, "read_excel", leer)
+    df = cache_excel._leer_excel(Path(f"libro{sufijo}"))
+
+    assert usados == [motor]
+    assert df["a"].tolist() == ["x"]
@@ -0,0 +1,43 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from src.Consolidacion import codificacion
+from src.Consolidacion.motor import leer_archivo_generico
+from src.Consolidacion.streaming import leer_por_bloques
+
+
+@pytest.fixture
+def archivo(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setenv("RUTA_CACHE_CODIFICACION", str(tmp_path / "codificaciones.json"))
+    monkeypatch.setattr(codificacion, "_por_origen", None)
+
+    # La muestra (8 KB) es UTF-8 válido; el byte latin-1 aparece después
+    ruta = tmp_path / "PROD_ANALISIS_PRUEBA_1.csv"
+    filas = ["Codigo,Glosa", "0,año"] + [f"{i},texto" for i in range(1, 2000)] + ["2000,camión"]
+    ruta.write_bytes(
+        "\n".join(filas[:-1]).encode("utf-8") + b"\n" + filas[-1].encode("latin-1") + b"\n"
+    )
+    return ruta
+
+
+def test_relee_en_latin1_si_falla_despues_de_la_muestra(archivo: Path, caplog):
+    with caplog.at_level(logging.WARNING):
+        df = leer_archivo_generico(archivo)
+
+    assert len(df) == 2001
+    assert df["Glosa"].iloc[-1] == "camión"
+    assert not df["Glosa"].str.contains("�").any()
+    assert archivo.name in caplog.text
+    assert codificacion._cache()["PROD_ANALISIS_PRUEBA"] == "latin-1"
+
+
+def test_por_bloques_sigue_en_latin1_sin_repetir_filas(archivo: Path):
+    bloques = list(leer_por_bloques(archivo, 500))
+    codigos = [c for bloque in bloques for c in bloque["Codigo"]]
+
+    assert codigos == [str(i) for i in range(2001)]
+    # Lo entregado antes del error queda como UTF-8
+    assert bloques[0]["Glosa"].iloc[0] == "año"
+    assert bloques[-1]["Glosa"].iloc[-1] == "camión"
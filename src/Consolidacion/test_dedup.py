@@ -0,0 +1,15 @@
+import pandas as pd
+
+from src.Consolidacion.dedup import deduplicar
+
+
+def test_verificar_con_nulos_int64():
+    df = pd.DataFrame({
+        "a": pd.array([1, None, 1, None, 2], dtype="Int64"),
+        "b": pd.array([True, None, True, None, None], dtype="boolean"),
+        "c": ["x", "y", "x", "y", "z"],
+    })
+
+    resultado = deduplicar(df, verificar=True)
+
+    assert resultado.index.tolist() == [0, 1, 4]
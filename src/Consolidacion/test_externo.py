@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.Consolidacion.esquemas import Esquema
+from src.Consolidacion.motor import Opciones, Reporte, consolidar
+from src.Consolidacion.tipos import NUMERO
+
+ESQUEMA = Esquema(
+    nombre="PRUEBA",
+    columnas=("Codigo", "Cantidad", "Archivo_Origen"),
+    alias={},
+    tipos={"Cantidad": NUMERO}
+)
+REPORTE = Reporte(
+    nombre="PRUEBA",
+    prefijo="PRUEBA",
+    salida="PRUEBA_CONSOLIDADO.csv",
+    esquema=ESQUEMA,
+    clave=("Codigo", "Cantidad")
+)
+
+
+def _archivos(carpeta: Path) -> list[Path]:
+    carpeta.mkdir(parents=True, exist_ok=True)
+    # El primero se tipa Int64; el segundo Float64 por el 2.5
+    enteros = pd.DataFrame({"Codigo": [f"C{i}" for i in range(12)], "Cantidad": range(12)})
+    decimales = pd.DataFrame({"Codigo": [f"C{i}" for i in range(8)] + ["X"], "Cantidad": [*range(8), 2.5]})
+
+    archivos = [carpeta / "PRUEBA_1.csv", carpeta / "PRUEBA_2.csv"]
+    enteros.to_csv(archivos[0], index=False)
+    decimales.to_csv(archivos[1], index=False)
+    return archivos
+
+
+@pytest.mark.parametrize(
+    "opciones",
+    [
+        Opciones(diario=False),
+        Opciones(diario=False, filas_por_bloque=5),
+        Opciones(diario=False, fuera_de_memoria=True, particiones=8),
+    ],
+    ids=["memoria", "bloques", "fuera_de_memoria"],
+)
+def test_dedup_con_tipos_numericos_mezclados(tmp_path: Path, opciones: Opciones):
+    salida = tmp_path / "salida"
+    salida.mkdir()
+    consolidar(REPORTE, _archivos(tmp_path / "ftp"), salida, opciones)
+
+    df = pd.read_csv(salida / REPORTE.salida, sep="|")
+    assert len(df) == 13
+    assert df["Archivo_Origen"].value_counts().to_dict() == {"PRUEBA_1.csv": 12, "PRUEBA_2.csv": 1}
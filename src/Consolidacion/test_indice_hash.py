@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.Consolidacion.indice_hash import ruta_indice
+from src.Consolidacion.motor import Opciones, Reporte, consolidar
+
+REPORTE = Reporte(nombre="PRUEBA", prefijo="PRUEBA", salida="PRUEBA_CONSOLIDADO.csv", clave=("id",))
+
+
+def _escribir(carpeta: Path, nombre: str, desde: int, hasta: int) -> list[Path]:
+    carpeta.mkdir(parents=True, exist_ok=True)
+    archivo = carpeta / nombre
+    pd.DataFrame({"id": range(desde, hasta), "valor": [f"v{i}" for i in range(desde, hasta)]}).to_csv(
+        archivo, index=False
+    )
+    return [archivo]
+
+
+# Completa (en memoria / por bloques / fuera de memoria) -> incremental -> incremental
+@pytest.mark.parametrize(
+    "completa",
+    [
+        Opciones(diario=False),
+        Opciones(diario=False, filas_por_bloque=7),
+        Opciones(diario=False, fuera_de_memoria=True, particiones=2),
+    ],
+    ids=["memoria", "bloques", "fuera_de_memoria"],
+)
+def test_completa_reescribe_indice(tmp_path: Path, completa: Opciones):
+    incremental = Opciones(diario=False, incremental=True)
+    salida = tmp_path / REPORTE.salida
+
+    # Índice de una incremental previa que la completa tiene que descartar
+    consolidar(REPORTE, _escribir(tmp_path / "a", "PRUEBA_0.csv", 0, 10), tmp_path, incremental)
+    assert ruta_indice(salida).exists()
+
+    consolidar(REPORTE, _escribir(tmp_path / "b", "PRUEBA_1.csv", 0, 20), tmp_path, completa)
+    consolidar(REPORTE, _escribir(tmp_path / "c", "PRUEBA_2.csv", 10, 30), tmp_path, incremental)
+    consolidar(REPORTE, _escribir(tmp_path / "d", "PRUEBA_3.csv", 25, 40), tmp_path, incremental)
+
+    df = pd.read_csv(salida, sep="|")
+    assert not df["id"].duplicated().any()
+    assert sorted(df["id"]) == list(range(40))
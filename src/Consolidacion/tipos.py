@@ -0,0 +1,177 @@
+import logging
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.Consolidacion.fechas import parsear_fechas
+
+# =============================================================
+# TIPOS EN MEMORIA POR COLUMNA
+# =============================================================
+# "categoria": texto de baja cardinalidad (Empresa, Estado, Picker...)
+# "numero":    Int64 si todos los valores son enteros, si no Float64
+# "fecha":     datetime64 con formato detectado (valores inválidos -> NaT)
+# "duracion":  segundos (Int64 / Float64) desde HH:MM:SS, MM:SS o número
+# Las categorías hashean igual que el texto (ver indice_hash), así que
+# tipar no cambia los índices de corridas previas.
+CATEGORIA = "categoria"
+NUMERO = "numero"
+FECHA = "fecha"
+DURACION = "duracion"
+
+# [D día(s)[,]] H:MM[:SS[.fff]]; también "1 day, 02:03:04" (timedelta
+# de openpyxl). Con dos partes es MM:SS: el WMS no exporta HH:MM.
+_PATRON_DURACION = (
+    r"^(?:(?P<dias>\d+)\s*(?:d|day|days|dia|dias|día|días)?,?\s+)?"
+    r"(?P<a>\d+):(?P<b>\d{1,2})(?::(?P<c>\d{1,2}(?:\.\d+)?))?$"
+)
+
+
+def a_numero(serie: pd.Series) -> pd.Series:
+    valores = pd.to_numeric(serie, errors="coerce")
+    if pd.api.types.is_integer_dtype(valores):
+        return valores.astype("Int64")
+
+    presentes = valores.dropna()
+    if np.isfinite(presentes).all() and (presentes % 1 == 0).all():
+        return valores.astype("Int64")
+    return valores.astype("Float64")
+
+
+def _hhmmss_fijo(texto: pd.Series) -> np.ndarray:
+    # Caso típico del WMS: "HH:MM:SS" de ancho fijo. Se calcula sobre
+    # los bytes con numpy, sin regex ni parseo por fila
+    try:
+        bytes_ = texto.to_numpy(dtype="S8")
+    except UnicodeEncodeError:
+        return np.full(len(texto), np.nan)
+
+    c = np.frombuffer(bytes_.tobytes(), dtype=np.uint8).reshape(-1, 8).astype(np.int64) - ord("0")
+    digitos = c[:, [0, 1, 3, 4, 6, 7]]
+    validos = (
+        ((digitos >= 0) & (digitos <= 9)).all(axis=1)
+        & (c[:, 2] == ord(":") - ord("0"))
+        & (c[:, 5] == ord(":") - ord("0"))
+    )
+    valores = (
+        (digitos[:, 0] * 10 + digitos[:, 1]) * 3600
+        + (digitos[:, 2] * 10 + digitos[:, 3]) * 60
+        + digitos[:, 4] * 10 + digitos[:, 5]
+    ).astype("float64")
+    valores[~validos] = np.nan
+    return valores
+
+
+def a_segundos(serie: pd.Series, origen: str | None = None) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(serie):
+        return a_numero(serie)
+
+    texto = serie.astype(object).where(serie.notna(), "").astype(str).str.strip()
+    nulos = texto.isin(["", "nan", "NaN", "None", "NaT", "null", "NULL"])
+    segundos = pd.Series(np.nan, index=texto.index, name=serie.name)
+
+    # Del camino más rápido al más general, cada uno sobre lo que queda
+    pendientes = ~nulos & (texto.str.len() == 8)
+    if pendientes.any():
+        segundos[pendientes] = _hhmmss_fijo(texto[pendientes])
+
+    # Un número suelto ya son segundos
+    pendientes = segundos.isna() & ~nulos
+    if pendientes.any():
+        segundos[pendientes] = pd.to_numeric(texto[pendientes], errors="coerce")
+
+    pendientes = segundos.isna() & ~nulos
+    if pendientes.any():
+        partes = texto[pendientes].str.extract(_PATRON_DURACION).astype("float64")
+        con_horas = partes["c"].notna()
+        horas = partes["a"].where(con_horas, 0)
+        minutos = partes["a"].where(~con_horas, partes["b"])
+        segs = partes["c"].where(con_horas, partes["b"])
+        segundos[pendientes] = (
+            partes["dias"].fillna(0) * 86400 + horas * 3600 + minutos * 60 + segs
+        )
+
+    coercidos = int((segundos.isna() & ~nulos).sum())
+    if coercidos:
+        logging.warning(
+            f"⚠ {origen or 'Duraciones'} | {serie.name}: {coercidos} valores no son duración "
+            f"y quedan vacíos"
+        )
+
+    return a_numero(segundos)
+
+
+def tipar_columnas(
+    df: pd.DataFrame,
+    tipos: dict[str, str],
+    firma: tuple | None = None,
+    origen: str | None = None
+) -> pd.DataFrame:
+    # firma: encabezado original del archivo, para cachear formatos de fecha
+    for col, tipo in tipos.items():
+        if col not in df.columns:
+            continue
+
+        if tipo == CATEGORIA:
+            df[col] = df[col].astype("category")
+        elif tipo == NUMERO:
+            df[col] = a_numero(df[col])
+        elif tipo == FECHA:
+            clave = (firma, col) if firma is not None else None
+            df[col] = parsear_fechas(df[col], clave, origen)
+        elif tipo == DURACION:
+            df[col] = a_segundos(df[col], origen)
+        else:
+            raise ValueError(f"Tipo de columna desconocido: {tipo} ({col})")
+
+    return df
+
+
+# =============================================================
+# OPERACIONES SOBRE CATEGORÍAS
+# =============================================================
+def transformar_categorias(
+    serie: pd.Series,
+    funcion: Callable[[pd.Series], pd.Series]
+) -> pd.Series:
+    # La transformación corre sobre las categorías, no sobre cada fila
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return funcion(serie)
+
+    nuevas = funcion(pd.Series(serie.cat.categories))
+    codigos_nuevos, categorias = pd.factorize(nuevas)
+
+    codigos = serie.cat.codes.to_numpy()
+    codigos = np.where(codigos >= 0, codigos_nuevos[codigos], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(codigos, categorias),
+        index=serie.index,
+        name=serie.name
+    )
+
+
+def concatenar(dfs: list[pd.DataFrame]) -> pd.DataFrame:
+    # pd.concat convierte a object las categorías que difieren entre
+    # archivos; se unifican antes para conservar el dtype compacto
+    if len(dfs) > 1:
+        categoricas = [
+            col for col in dfs[0].columns
+            if all(
+                col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype)
+                for df in dfs
+            )
+        ]
+
+        if categoricas:
+            dtypes = {
+                col: pd.CategoricalDtype(
+                    pd.Index(np.concatenate([
+                        df[col].cat.categories.to_numpy(dtype=object) for df in dfs
+                    ])).unique()
+                )
+                for col in categoricas
+            }
+            dfs = [df.astype(dtypes) for df in dfs]
+
+    return pd.concat(dfs, ignore_index=True)
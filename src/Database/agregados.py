@@ -0,0 +1,236 @@
+import os
+import sqlite3
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from src.Consolidacion.tipos import tipar_columnas
+from src.Database.cargador_sql import _citar
+
+# =============================================================
+# AGREGADOS KPI PERSISTENTES (SQLITE + UPSERT)
+# =============================================================
+# Tablas resumen por grupo y día (productividad por Picker, ingresos /
+# salidas por Codigo y Empresa) que los tableros leen directo.
+# - Corrida incremental: se agrega solo el delta de filas nuevas y se
+#   suma a lo que ya hay (INSERT ... ON CONFLICT DO UPDATE).
+# - Corrida completa: se recalcula todo y se intercambia la tabla.
+# Solo conteos y sumas: son aditivos y el delta basta para mantenerlos.
+COLUMNA_DIA = "Dia"
+
+
+@dataclass(frozen=True)
+class Agregado:
+    nombre: str
+    grupo: tuple[str, ...]
+    # Fecha que se trunca a día (columna "Dia"); None = sin día
+    columna_fecha: str | None
+    sumas: tuple[str, ...]
+    conteo: str = "Filas"
+
+    def claves(self) -> list[str]:
+        return list(self.grupo) + ([COLUMNA_DIA] if self.columna_fecha else [])
+
+    def medidas(self) -> list[str]:
+        return [self.conteo, *self.sumas]
+
+
+def ruta_kpi(ruta_salida: Path) -> Path:
+    return Path(os.getenv("RUTA_KPI") or ruta_salida / "KPI.db")
+
+
+def _texto_clave(serie: pd.Series) -> pd.Series:
+    # Sin nulos en la clave: en SQLite NULL no choca en ON CONFLICT
+    return serie.astype(object).where(serie.notna(), "").astype(str)
+
+
+def agregar(df: pd.DataFrame, agregado: Agregado) -> pd.DataFrame:
+    claves = {col: _texto_clave(df[col]) for col in agregado.grupo}
+    if agregado.columna_fecha:
+        fechas = pd.to_datetime(df[agregado.columna_fecha], errors="coerce")
+        claves[COLUMNA_DIA] = fechas.dt.strftime("%Y-%m-%d").fillna("")
+
+    base = pd.DataFrame(claves, index=df.index)
+    for col in agregado.sumas:
+        base[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    base[agregado.conteo] = 1
+
+    return (
+        base.groupby(agregado.claves(), sort=False)[agregado.medidas()]
+        .sum()
+        .reset_index()
+    )
+
+
+def _combinar(parciales: list[pd.DataFrame], agregado: Agregado) -> pd.DataFrame:
+    if not parciales:
+        return pd.DataFrame(columns=agregado.claves() + agregado.medidas())
+    if len(parciales) == 1:
+        return parciales[0]
+    return (
+        pd.concat(parciales, ignore_index=True)
+        .groupby(agregado.claves(), sort=False)[agregado.medidas()]
+        .sum()
+        .reset_index()
+    )
+
+
+class AgregadosKPI:
+    # Por bloque solo se acumulan los parciales (chicos, ya agrupados);
+    # la base se toca una vez, en confirmar()
+
+    def __init__(self, ruta: Path, agregados: list[Agregado], incremental: bool = False):
+        self.ruta = ruta
+        self.agregados = agregados
+        self.incremental = incremental
+        self._parciales: list[list[pd.DataFrame]] = []
+        self.filas = 0
+
+    def escribir(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        self._parciales.append([agregar(df, agregado) for agregado in self.agregados])
+        self.filas += len(df)
+
+    # Permite descartar lo agregado de un archivo que falló a mitad
+    def marca(self) -> int:
+        return len(self._parciales)
+
+    def deshacer(self, marca: int) -> None:
+        del self._parciales[marca:]
+
+    def descartar(self) -> None:
+        self._parciales = []
+
+    # ---------------------------------------------------------
+    # Escritura
+    # ---------------------------------------------------------
+    def _crear(self, cnx: sqlite3.Connection, tabla: str, agregado: Agregado) -> None:
+        q = lambda n: _citar(n, "sqlite")
+        definicion = ", ".join(
+            [f"{q(c)} TEXT NOT NULL" for c in agregado.claves()]
+            + [f"{q(agregado.conteo)} INTEGER NOT NULL"]
+            + [f"{q(c)} REAL" for c in agregado.sumas]
+        )
+        claves = ", ".join(q(c) for c in agregado.claves())
+        cnx.execute(f"CREATE TABLE IF NOT EXISTS {q(tabla)} ({definicion}, PRIMARY KEY ({claves}))")
+
+    def _upsert(self, cnx: sqlite3.Connection, tabla: str, agregado: Agregado, df: pd.DataFrame) -> None:
+        q = lambda n: _citar(n, "sqlite")
+        columnas = agregado.claves() + agregado.medidas()
+        sumar = ", ".join(f"{q(c)} = {q(c)} + excluded.{q(c)}" for c in agregado.medidas())
+
+        sentencia = (
+            f"INSERT INTO {q(tabla)} ({', '.join(q(c) for c in columnas)}) "
+            f"VALUES ({', '.join('?' for _ in columnas)}) "
+            f"ON CONFLICT ({', '.join(q(c) for c in agregado.claves())}) DO UPDATE SET {sumar}"
+        )
+        df = df[columnas].astype(object).where(df[columnas].notna(), None)
+        cnx.executemany(sentencia, df.itertuples(index=False, name=None))
+
+    def confirmar(self) -> int:
+        # En una completa sin filas igual se intercambian las tablas (vacías):
+        # si no, el tablero seguiría mostrando la corrida anterior
+        if self.incremental and not self._parciales:
+            logging.info("📈 KPI: sin filas nuevas")
+            return 0
+
+        q = lambda n: _citar(n, "sqlite")
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        cnx = sqlite3.connect(self.ruta, timeout=30)
+        try:
+            cnx.execute("PRAGMA journal_mode=WAL")
+            # Todas las tablas en una transacción: o se actualizan todas o ninguna
+            cnx.execute("BEGIN")
+            for i, agregado in enumerate(self.agregados):
+                df = _combinar([parciales[i] for parciales in self._parciales], agregado)
+
+                if self.incremental:
+                    self._crear(cnx, agregado.nombre, agregado)
+                    self._upsert(cnx, agregado.nombre, agregado, df)
+                else:
+                    trabajo = f"{agregado.nombre}__NUEVA"
+                    cnx.execute(f"DROP TABLE IF EXISTS {q(trabajo)}")
+                    self._crear(cnx, trabajo, agregado)
+                    self._upsert(cnx, trabajo, agregado, df)
+                    cnx.execute(f"DROP TABLE IF EXISTS {q(agregado.nombre)}")
+                    cnx.execute(f"ALTER TABLE {q(trabajo)} RENAME TO {q(agregado.nombre)}")
+
+                logging.info(
+                    f"📈 KPI {agregado.nombre} {'actualizado' if self.incremental else 'recalculado'} | "
+                    f"Grupos del lote: {len(df)}"
+                )
+            cnx.commit()
+        except Exception:
+            cnx.rollback()
+            raise
+        finally:
+            cnx.close()
+
+        self._parciales = []
+        return self.filas
+
+
+def actualizar_agregados(
+    df: pd.DataFrame,
+    ruta: Path,
+    agregados: list[Agregado],
+    incremental: bool = False
+) -> int:
+    kpi = AgregadosKPI(ruta, agregados, incremental)
+    kpi.escribir(df)
+    return kpi.confirmar()
+
+
+def existen_agregados(ruta: Path, agregados: list[Agregado]) -> bool:
+    if not ruta.exists():
+        return False
+    cnx = sqlite3.connect(ruta, timeout=30)
+    try:
+        existentes = {fila[0] for fila in cnx.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        cnx.close()
+    return all(agregado.nombre in existentes for agregado in agregados)
+
+
+def reconstruir_agregados(
+    salida: Path,
+    ruta: Path,
+    agregados: list[Agregado],
+    tipos: dict[str, str] | None = None,
+    filas_por_bloque: int = 500_000
+) -> int:
+    # Primera corrida incremental con KPI: se parte de lo que ya tiene el
+    # consolidado, leído con los mismos tipos del pipeline
+    kpi = AgregadosKPI(ruta, agregados)
+    with pd.read_csv(
+        salida,
+        sep="|",
+        dtype=str,
+        encoding="utf-8",
+        keep_default_na=False,
+        na_values=[""],
+        chunksize=filas_por_bloque
+    ) as lector:
+        for bloque in lector:
+            kpi.escribir(tipar_columnas(bloque, tipos or {}))
+
+    logging.info(f"📈 KPI reconstruidos desde {salida.name}")
+    return kpi.confirmar()
+
+
+# =============================================================
+# TOTALES DESDE EL AGREGADO (SIN RELEER EL CONSOLIDADO)
+# =============================================================
+def totales_kpi(ruta: Path, agregado: Agregado, columnas: list[str]) -> dict[str, float]:
+    q = lambda n: _citar(n, "sqlite")
+    cnx = sqlite3.connect(ruta, timeout=30)
+    try:
+        fila = cnx.execute(
+            f"SELECT {', '.join(f'COALESCE(SUM({q(c)}), 0)' for c in columnas)} FROM {q(agregado.nombre)}"
+        ).fetchone()
+    finally:
+        cnx.close()
+    return {col: int(v) if float(v).is_integer() else v for col, v in zip(columnas, fila)}
@@ -0,0 +1,229 @@
+import logging
+
+import pandas as pd
+
+from src.Database.conexion_sql import PoolConexiones, dialecto_sql
+
+# =============================================================
+# CARGA A SQL: STAGING POR LOTES + MERGE (UPSERT) AL DESTINO
+# =============================================================
+# dialecto "mssql" usa pyodbc con fast_executemany y MERGE; "sqlite"
+# existe para probar la carga localmente sin servidor.
+COLUMNA_LOTE = "_Lote"
+
+
+def _citar(nombre: str, dialecto: str) -> str:
+    if dialecto == "mssql":
+        return ".".join(f"[{parte}]" for parte in nombre.split("."))
+    return ".".join(f'"{parte}"' for parte in nombre.split("."))
+
+
+def _tipo_sql(serie: pd.Series, dialecto: str) -> str:
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return "DATETIME2" if dialecto == "mssql" else "TIMESTAMP"
+    if pd.api.types.is_bool_dtype(serie):
+        return "BIT" if dialecto == "mssql" else "INTEGER"
+    if pd.api.types.is_integer_dtype(serie):
+        return "BIGINT" if dialecto == "mssql" else "INTEGER"
+    if pd.api.types.is_float_dtype(serie):
+        return "FLOAT" if dialecto == "mssql" else "REAL"
+    return "NVARCHAR(4000)" if dialecto == "mssql" else "TEXT"
+
+
+class CargaSQL:
+
+    def __init__(
+        self,
+        pool: PoolConexiones,
+        tabla: str,
+        clave: list[str] | None = None,
+        tamano_lote: int = 10_000,
+        dialecto: str | None = None,
+        tabla_staging: str | None = None
+    ):
+        self.pool = pool
+        self.tabla = tabla
+        self.tabla_staging = tabla_staging or f"{tabla}_STG"
+        self.clave = clave
+        self.tamano_lote = tamano_lote
+        self.dialecto = dialecto or dialecto_sql()
+
+        self.columnas: list[str] | None = None
+        self._lote = 0
+        self.filas = 0
+
+    # ---------------------------------------------------------
+    # Estructura
+    # ---------------------------------------------------------
+    def _crear_tablas(self, df: pd.DataFrame) -> None:
+        q = lambda n: _citar(n, self.dialecto)
+
+        definicion = ", ".join(f"{q(c)} {_tipo_sql(df[c], self.dialecto)}" for c in self.columnas)
+        entero = "INT" if self.dialecto == "mssql" else "INTEGER"
+
+        with self.pool.conexion() as cnx:
+            cursor = cnx.cursor()
+
+            if self.dialecto == "mssql":
+                for tabla, extra in [(self.tabla, ""), (self.tabla_staging, f", {q(COLUMNA_LOTE)} {entero}")]:
+                    cursor.execute(
+                        f"IF OBJECT_ID(N'{tabla}') IS NULL "
+                        f"CREATE TABLE {q(tabla)} ({definicion}{extra})"
+                    )
+                cursor.execute(f"TRUNCATE TABLE {q(self.tabla_staging)}")
+            else:
+                cursor.execute(f"CREATE TABLE IF NOT EXISTS {q(self.tabla)} ({definicion})")
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {q(self.tabla_staging)} "
+                    f"({definicion}, {q(COLUMNA_LOTE)} {entero})"
+                )
+                # Índice sobre la clave para el cruce con staging
+                indice = f"UX_{self.tabla.replace('.', '_')}"
+                columnas_clave = ", ".join(q(c) for c in self.clave)
+                cursor.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {q(indice)} "
+                    f"ON {q(self.tabla)} ({columnas_clave})"
+                )
+                cursor.execute(f"DELETE FROM {q(self.tabla_staging)}")
+
+            cnx.commit()
+
+    def _filas(self, df: pd.DataFrame) -> list[tuple]:
+        df = df[self.columnas].copy()
+
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]) and self.dialecto != "mssql":
+                df[col] = df[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+
+        df = df.astype(object).where(df.notna(), None)
+        df[COLUMNA_LOTE] = self._lote
+        return list(df.itertuples(index=False, name=None))
+
+    # ---------------------------------------------------------
+    # Staging
+    # ---------------------------------------------------------
+    def escribir(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        if self.columnas is None:
+            self.columnas = list(df.columns)
+            self.clave = self.clave or self.columnas
+            self._crear_tablas(df)
+
+        self._lote += 1
+        filas = self._filas(df)
+
+        q = lambda n: _citar(n, self.dialecto)
+        columnas = ", ".join(q(c) for c in [*self.columnas, COLUMNA_LOTE])
+        marcadores = ", ".join("?" for _ in range(len(self.columnas) + 1))
+        sentencia = f"INSERT INTO {q(self.tabla_staging)} ({columnas}) VALUES ({marcadores})"
+
+        with self.pool.conexion() as cnx:
+            cursor = cnx.cursor()
+            if self.dialecto == "mssql":
+                cursor.fast_executemany = True
+
+            for inicio in range(0, len(filas), self.tamano_lote):
+                cursor.executemany(sentencia, filas[inicio:inicio + self.tamano_lote])
+
+            cnx.commit()
+
+        self.filas += len(filas)
+
+    # Permite descartar lo cargado de un archivo que falló a mitad
+    def marca(self) -> int:
+        return self._lote
+
+    def deshacer(self, marca: int) -> None:
+        if self.columnas is None or self._lote <= marca:
+            return
+
+        q = lambda n: _citar(n, self.dialecto)
+        with self.pool.conexion() as cnx:
+            cursor = cnx.cursor()
+            cursor.execute(f"DELETE FROM {q(self.tabla_staging)} WHERE {q(COLUMNA_LOTE)} > ?", (marca,))
+            self.filas -= max(cursor.rowcount, 0)
+            cnx.commit()
+
+    # ---------------------------------------------------------
+    # Merge staging -> destino
+    # ---------------------------------------------------------
+    def _sentencias_merge(self) -> list[str]:
+        q = lambda n: _citar(n, self.dialecto)
+        otras = [c for c in self.columnas if c not in self.clave]
+        columnas = ", ".join(q(c) for c in self.columnas)
+
+        if self.dialecto == "mssql":
+            claves = ", ".join(f"s.{q(c)}" for c in self.clave)
+            union = " AND ".join(
+                f"(d.{q(c)} = s.{q(c)} OR (d.{q(c)} IS NULL AND s.{q(c)} IS NULL))"
+                for c in self.clave
+            )
+            actualizar = (
+                "WHEN MATCHED THEN UPDATE SET "
+                + ", ".join(f"d.{q(c)} = s.{q(c)}" for c in otras) + " "
+            ) if otras else ""
+
+            # Una fila por clave en staging (MERGE falla con duplicados)
+            return [(
+                f"MERGE INTO {q(self.tabla)} AS d "
+                f"USING (SELECT {columnas} FROM ("
+                f"SELECT s.*, ROW_NUMBER() OVER (PARTITION BY {claves} ORDER BY s.{q(COLUMNA_LOTE)} DESC) AS rn "
+                f"FROM {q(self.tabla_staging)} AS s) AS x WHERE rn = 1) AS s "
+                f"ON {union} "
+                f"{actualizar}"
+                f"WHEN NOT MATCHED THEN INSERT ({columnas}) "
+                f"VALUES ({', '.join(f's.{q(c)}' for c in self.columnas)});"
+            )]
+
+        # sqlite: ON CONFLICT no ve iguales dos claves con NULL (la clave de
+        # PICKING incluye Glosa), así que se cruza con IS como en el MERGE
+        claves = ", ".join(q(c) for c in self.clave)
+        union = " AND ".join(f"d.{q(c)} IS s.{q(c)}" for c in self.clave)
+        sentencias = [
+            # Una fila por clave en staging: la última cargada (GROUP BY agrupa los NULL)
+            f"DELETE FROM {q(self.tabla_staging)} WHERE rowid NOT IN ("
+            f"SELECT MAX(rowid) FROM {q(self.tabla_staging)} GROUP BY {claves})"
+        ]
+        if otras:
+            sentencias.append(
+                f"UPDATE {q(self.tabla)} AS d SET "
+                + ", ".join(f"{q(c)} = s.{q(c)}" for c in otras)
+                + f" FROM {q(self.tabla_staging)} AS s WHERE {union}"
+            )
+        sentencias.append(
+            f"INSERT INTO {q(self.tabla)} ({columnas}) "
+            f"SELECT {', '.join(f's.{q(c)}' for c in self.columnas)} FROM {q(self.tabla_staging)} AS s "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {q(self.tabla)} AS d WHERE {union})"
+        )
+        return sentencias
+
+    def confirmar(self) -> int:
+        if self.columnas is None:
+            logging.info(f"🛢 SQL {self.tabla}: sin filas para cargar")
+            return 0
+
+        q = lambda n: _citar(n, self.dialecto)
+        with self.pool.conexion() as cnx:
+            cursor = cnx.cursor()
+            for sentencia in self._sentencias_merge():
+                cursor.execute(sentencia)
+            cursor.execute(f"DELETE FROM {q(self.tabla_staging)}")
+            cnx.commit()
+
+        logging.info(f"🛢 SQL {self.tabla} actualizada (upsert) | Filas en staging: {self.filas}")
+        return self.filas
+
+
+def cargar_consolidado(
+    df: pd.DataFrame,
+    pool: PoolConexiones,
+    tabla: str,
+    clave: list[str] | None = None,
+    tamano_lote: int = 10_000,
+    dialecto: str | None = None
+) -> int:
+    carga = CargaSQL(pool, tabla, clave, tamano_lote, dialecto)
+    carga.escribir(df)
+    return carga.confirmar()
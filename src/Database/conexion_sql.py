@@ -1,6 +1,75 @@
-import pyodbc
 import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+def dialecto_sql() -> str:
+    return os.getenv("DIALECTO_SQL", "mssql").strip().lower()
+
 
 def obtener_conexion():
     cadena = os.getenv("STRING_CONEXION_SQL")
+
+    # DIALECTO_SQL=sqlite: base local de prueba (cadena = ruta del .db)
+    if dialecto_sql() == "sqlite":
+        import sqlite3
+        return sqlite3.connect(cadena, check_same_thread=False)
+
+    import pyodbc
     return pyodbc.connect(cadena)
+
+
+# =============================================================
+# POOL DE CONEXIONES
+# =============================================================
+# Reutiliza conexiones en vez de abrir una nueva por cada carga. La
+# fábrica es inyectable (p. ej. sqlite3 para probar sin servidor).
+class PoolConexiones:
+
+    def __init__(self, fabrica: Callable = obtener_conexion, tamano: int = 2):
+        self._fabrica = fabrica
+        self._libres: queue.Queue = queue.Queue()
+        self._creadas = 0
+        self._tamano = max(1, tamano)
+        self._lock = threading.Lock()
+
+    def _tomar(self):
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._creadas < self._tamano:
+                self._creadas += 1
+                return self._fabrica()
+
+        return self._libres.get()
+
+    @contextmanager
+    def conexion(self) -> Iterator:
+        cnx = self._tomar()
+        try:
+            yield cnx
+        except Exception:
+            cnx.rollback()
+            raise
+        finally:
+            self._libres.put(cnx)
+
+    def cerrar(self) -> None:
+        while not self._libres.empty():
+            self._libres.get_nowait().close()
+        self._creadas = 0
+
+
+_pool: PoolConexiones | None = None
+
+
+def obtener_pool() -> PoolConexiones:
+    global _pool
+    if _pool is None:
+        _pool = PoolConexiones(tamano=int(os.getenv("POOL_SQL", "2")))
+    return _pool
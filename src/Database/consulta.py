@@ -0,0 +1,306 @@
+import os
+import sqlite3
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from src.Consolidacion.tipos import tipar_columnas
+from src.Database.cargador_sql import _citar, _tipo_sql
+
+# =============================================================
+# ÍNDICE DE CONSULTA LOCAL (SQLITE)
+# =============================================================
+# Copia de cada consolidado en un .db local con índices sobre las
+# claves de búsqueda (Nro_Gestion, Nro_Pedido, Nro_Orden, Codigo): una
+# consulta puntual o por rango no recorre el CSV completo.
+# - Corrida completa: se carga en una tabla nueva y se intercambia al
+#   confirmar; las consultas ven la versión anterior hasta ese momento.
+# - Corrida incremental: se agregan solo las filas nuevas de la corrida.
+def ruta_consulta(ruta_salida: Path) -> Path:
+    return Path(os.getenv("RUTA_INDICE_CONSULTA") or ruta_salida / "Consulta.db")
+
+
+def _conectar(ruta: Path) -> sqlite3.Connection:
+    cnx = sqlite3.connect(ruta, timeout=30, check_same_thread=False)
+    # WAL: se puede consultar mientras una corrida escribe
+    cnx.execute("PRAGMA journal_mode=WAL")
+    cnx.execute("PRAGMA synchronous=NORMAL")
+    return cnx
+
+
+def _columnas_tabla(cnx: sqlite3.Connection, tabla: str) -> list[str]:
+    return [fila[1] for fila in cnx.execute(f"PRAGMA table_info({_citar(tabla, 'sqlite')})")]
+
+
+def _como_numero(columna: str) -> str:
+    # Las claves se guardan como texto ("00123" sigue siendo "00123"); los
+    # rangos numéricos comparan este valor, que tiene su propio índice
+    return f"CAST({_citar(columna, 'sqlite')} AS INTEGER)"
+
+
+def _es_entero(valor: str | None) -> bool:
+    return valor is None or str(valor).strip().isdigit()
+
+
+class IndiceConsulta:
+
+    def __init__(
+        self,
+        ruta: Path,
+        tabla: str,
+        claves: list[str],
+        incremental: bool = False,
+        tamano_lote: int = 10_000
+    ):
+        self.ruta = ruta
+        self.tabla = tabla
+        self.claves = claves
+        self.incremental = incremental
+        self.tamano_lote = tamano_lote
+
+        # Completa: se arma aparte y se intercambia en confirmar()
+        self._trabajo = tabla if incremental else f"{tabla}__NUEVA"
+        self._cnx: sqlite3.Connection | None = None
+        self.columnas: list[str] | None = None
+        self.filas = 0
+
+    # ---------------------------------------------------------
+    # Estructura
+    # ---------------------------------------------------------
+    def _crear_indices(self, tabla: str) -> None:
+        q = lambda n: _citar(n, "sqlite")
+        for col in self.claves:
+            if col in self.columnas:
+                self._cnx.execute(
+                    f"CREATE INDEX IF NOT EXISTS {q(f'IX_{self.tabla}_{col}')} ON {q(tabla)} ({q(col)})"
+                )
+                self._cnx.execute(
+                    f"CREATE INDEX IF NOT EXISTS {q(f'IX_{self.tabla}_{col}_NUM')} "
+                    f"ON {q(tabla)} ({_como_numero(col)})"
+                )
+
+    def _abrir(self) -> None:
+        if self._cnx is None:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            self._cnx = _conectar(self.ruta)
+
+    def _crear_tabla(self, df: pd.DataFrame) -> None:
+        q = lambda n: _citar(n, "sqlite")
+        self._abrir()
+
+        definicion = ", ".join(f"{q(c)} {_tipo_sql(df[c], 'sqlite')}" for c in self.columnas)
+
+        if not self.incremental:
+            self._cnx.execute(f"DROP TABLE IF EXISTS {q(self._trabajo)}")
+        self._cnx.execute(f"CREATE TABLE IF NOT EXISTS {q(self._trabajo)} ({definicion})")
+
+        if self.incremental:
+            # Columnas nuevas en el consolidado: se agregan a la tabla
+            existentes = _columnas_tabla(self._cnx, self._trabajo)
+            for col in self.columnas:
+                if col not in existentes:
+                    self._cnx.execute(
+                        f"ALTER TABLE {q(self._trabajo)} ADD COLUMN {q(col)} {_tipo_sql(df[col], 'sqlite')}"
+                    )
+            self._crear_indices(self._trabajo)
+
+        self._cnx.commit()
+
+    def _filas(self, df: pd.DataFrame) -> list[tuple]:
+        df = df[self.columnas].copy()
+
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = df[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+
+        df = df.astype(object).where(df.notna(), None)
+        return list(df.itertuples(index=False, name=None))
+
+    # ---------------------------------------------------------
+    # Carga (misma interfaz que EscritorParquet / CargaSQL)
+    # ---------------------------------------------------------
+    def escribir(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        if self.columnas is None:
+            self.columnas = list(df.columns)
+            self._crear_tabla(df)
+
+        q = lambda n: _citar(n, "sqlite")
+        columnas = ", ".join(q(c) for c in self.columnas)
+        marcadores = ", ".join("?" for _ in self.columnas)
+        sentencia = f"INSERT INTO {q(self._trabajo)} ({columnas}) VALUES ({marcadores})"
+
+        filas = self._filas(df)
+        for inicio in range(0, len(filas), self.tamano_lote):
+            self._cnx.executemany(sentencia, filas[inicio:inicio + self.tamano_lote])
+        self._cnx.commit()
+
+        self.filas += len(filas)
+
+    # Permite descartar lo cargado de un archivo que falló a mitad
+    def marca(self) -> int:
+        # Completa: la tabla de trabajo se recrea en la primera escritura
+        if self.columnas is None and not self.incremental:
+            return 0
+        self._abrir()
+        if not _columnas_tabla(self._cnx, self._trabajo):
+            return 0
+        q = lambda n: _citar(n, "sqlite")
+        return self._cnx.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {q(self._trabajo)}").fetchone()[0]
+
+    def deshacer(self, marca: int) -> None:
+        if self.columnas is None:
+            return
+        q = lambda n: _citar(n, "sqlite")
+        cursor = self._cnx.execute(f"DELETE FROM {q(self._trabajo)} WHERE rowid > ?", (marca,))
+        self.filas -= max(cursor.rowcount, 0)
+        self._cnx.commit()
+
+    def confirmar(self) -> int:
+        if self.columnas is None:
+            self.descartar()
+            logging.info(f"🔎 Índice de consulta {self.tabla}: sin filas")
+            return 0
+
+        q = lambda n: _citar(n, "sqlite")
+        try:
+            if not self.incremental:
+                # Intercambio en una transacción: nunca queda sin tabla
+                self._cnx.execute("BEGIN")
+                self._cnx.execute(f"DROP TABLE IF EXISTS {q(self.tabla)}")
+                self._cnx.execute(f"ALTER TABLE {q(self._trabajo)} RENAME TO {q(self.tabla)}")
+                self._crear_indices(self.tabla)
+                self._cnx.commit()
+        finally:
+            self._cnx.close()
+            self._cnx = None
+
+        modo = "agregadas" if self.incremental else "cargadas"
+        logging.info(f"🔎 Índice de consulta {self.tabla} actualizado: {self.ruta} | Filas {modo}: {self.filas}")
+        return self.filas
+
+    def descartar(self) -> None:
+        if self._cnx is None:
+            return
+        if not self.incremental and self.columnas is not None:
+            self._cnx.execute(f"DROP TABLE IF EXISTS {_citar(self._trabajo, 'sqlite')}")
+            self._cnx.commit()
+        self._cnx.close()
+        self._cnx = None
+
+
+def actualizar_consulta(
+    df: pd.DataFrame,
+    ruta: Path,
+    tabla: str,
+    claves: list[str],
+    incremental: bool = False
+) -> int:
+    indice = IndiceConsulta(ruta, tabla, claves, incremental)
+    try:
+        indice.escribir(df)
+    except Exception:
+        indice.descartar()
+        raise
+    return indice.confirmar()
+
+
+# =============================================================
+# CONSULTAS
+# =============================================================
+def consultar(
+    ruta: Path,
+    tabla: str,
+    columna: str,
+    valor: str | None = None,
+    desde: str | None = None,
+    hasta: str | None = None,
+    limite: int | None = 1000
+) -> pd.DataFrame:
+    if not ruta.exists():
+        raise FileNotFoundError(f"❌ No existe el índice de consulta: {ruta}")
+
+    q = lambda n: _citar(n, "sqlite")
+    cnx = sqlite3.connect(f"file:{ruta}?mode=ro", uri=True, timeout=30)
+    try:
+        columnas = _columnas_tabla(cnx, tabla)
+        if not columnas:
+            raise ValueError(f"❌ El índice no tiene la tabla {tabla}")
+        if columna not in columnas:
+            raise ValueError(f"❌ {tabla} no tiene la columna {columna}")
+
+        condiciones, parametros = [], []
+        if valor is not None:
+            condiciones.append(f"{q(columna)} = ?")
+            parametros.append(valor)
+
+        # Rango con límites enteros: se compara como número (100..199 no
+        # trae "1000"), solo entre claves que son todas dígitos
+        orden = q(columna)
+        if (desde is not None or hasta is not None) and _es_entero(desde) and _es_entero(hasta):
+            orden = _como_numero(columna)
+            condiciones.append(f"{q(columna)} NOT GLOB '*[^0-9]*' AND {q(columna)} <> ''")
+            desde = int(desde) if desde is not None else None
+            hasta = int(hasta) if hasta is not None else None
+        if desde is not None:
+            condiciones.append(f"{orden} >= ?")
+            parametros.append(desde)
+        if hasta is not None:
+            condiciones.append(f"{orden} <= ?")
+            parametros.append(hasta)
+
+        sentencia = f"SELECT * FROM {q(tabla)}"
+        if condiciones:
+            sentencia += " WHERE " + " AND ".join(condiciones)
+        sentencia += f" ORDER BY {orden}, rowid"
+        if limite:
+            sentencia += " LIMIT ?"
+            parametros.append(limite)
+
+        return pd.read_sql_query(sentencia, cnx, params=parametros)
+    finally:
+        cnx.close()
+
+
+def existe_tabla(ruta: Path, tabla: str) -> bool:
+    if not ruta.exists():
+        return False
+    cnx = sqlite3.connect(ruta, timeout=30)
+    try:
+        return bool(_columnas_tabla(cnx, tabla))
+    finally:
+        cnx.close()
+
+
+def reconstruir_consulta(
+    salida: Path,
+    ruta: Path,
+    tabla: str,
+    claves: list[str],
+    tipos: dict[str, str] | None = None,
+    filas_por_bloque: int = 500_000
+) -> int:
+    # Primera corrida incremental con índice: se carga lo que ya tiene el
+    # consolidado, leído con los mismos tipos del pipeline
+    indice = IndiceConsulta(ruta, tabla, claves)
+    try:
+        with pd.read_csv(
+            salida,
+            sep="|",
+            dtype=str,
+            encoding="utf-8",
+            keep_default_na=False,
+            na_values=[""],
+            chunksize=filas_por_bloque
+        ) as lector:
+            for bloque in lector:
+                indice.escribir(tipar_columnas(bloque, tipos or {}))
+    except Exception:
+        indice.descartar()
+        raise
+
+    logging.info(f"🔎 Índice de consulta {tabla} reconstruido desde {salida.name}")
+    return indice.confirmar()
@@ -0,0 +1,28 @@
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from src.Database.agregados import Agregado, actualizar_agregados
+
+AGREGADO = Agregado(nombre="KPI_PRUEBA", grupo=("Picker",), columna_fecha=None, sumas=("Cantidad",))
+
+
+def _filas(ruta: Path) -> int:
+    with sqlite3.connect(ruta) as cnx:
+        return cnx.execute('SELECT COUNT(*) FROM "KPI_PRUEBA"').fetchone()[0]
+
+
+def test_completa_sin_filas_vacia_los_kpi(tmp_path: Path):
+    ruta = tmp_path / "KPI.db"
+    df = pd.DataFrame({"Picker": ["A", "B", "A"], "Cantidad": [1, 2, 3]})
+    actualizar_agregados(df, ruta, [AGREGADO])
+    assert _filas(ruta) == 2
+
+    # Incremental sin filas nuevas: lo anterior se mantiene
+    actualizar_agregados(df.iloc[:0], ruta, [AGREGADO], incremental=True)
+    assert _filas(ruta) == 2
+
+    # Completa sin filas: el consolidado quedó vacío y los KPI también
+    actualizar_agregados(df.iloc[:0], ruta, [AGREGADO])
+    assert _filas(ruta) == 0
@@ -0,0 +1,29 @@
+import sqlite3
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from src.Database.cargador_sql import cargar_consolidado
+from src.Database.conexion_sql import PoolConexiones
+
+
+def test_upsert_sqlite_con_claves_nulas(tmp_path: Path):
+    ruta = tmp_path / "carga.db"
+    pool = PoolConexiones(partial(sqlite3.connect, ruta, check_same_thread=False))
+    df = pd.DataFrame({
+        "Pedido": ["1", "1", "2", "3"],
+        "Glosa": ["A", None, None, "B"],
+        "Cantidad": [1, 2, 3, 4],
+    })
+
+    # Dos corridas con el mismo consolidado: la segunda solo actualiza
+    for cantidad in ([1, 2, 3, 4], [10, 20, 30, 40]):
+        cargar_consolidado(df.assign(Cantidad=cantidad), pool, "PICKING", ["Pedido", "Glosa"], dialecto="sqlite")
+    pool.cerrar()
+
+    with sqlite3.connect(ruta) as cnx:
+        resultado = pd.read_sql('SELECT * FROM "PICKING" ORDER BY "Pedido", "Glosa"', cnx)
+
+    assert len(resultado) == 4
+    assert sorted(resultado["Cantidad"]) == [10, 20, 30, 40]
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import pandas as pd
+
+from src.Database.consulta import actualizar_consulta, consultar
+
+
+def test_rango_numerico_sobre_clave_texto(tmp_path: Path):
+    ruta = tmp_path / "Consulta.db"
+    # Como llegan del CSV: las claves son texto
+    df = pd.DataFrame({
+        "Nro_Gestion": ["5", "100", "150", "199", "1000", "10500", "2"],
+        "Glosa": ["a", "b", "c", "d", "e", "f", "g"],
+    }, dtype=str)
+    actualizar_consulta(df, ruta, "PICKING", ["Nro_Gestion"])
+
+    # Una corrida posterior con ceros a la izquierda y códigos no numéricos
+    nuevas = pd.DataFrame({"Nro_Gestion": ["00123", "A150"], "Glosa": ["h", "i"]}, dtype=str)
+    actualizar_consulta(nuevas, ruta, "PICKING", ["Nro_Gestion"], incremental=True)
+
+    resultado = consultar(ruta, "PICKING", "Nro_Gestion", desde="100", hasta="199")
+    assert resultado["Nro_Gestion"].tolist() == ["100", "00123", "150", "199"]
+
+    puntual = consultar(ruta, "PICKING", "Nro_Gestion", valor="00123")
+    assert puntual["Glosa"].tolist() == ["h"]
+
+    texto = consultar(ruta, "PICKING", "Nro_Gestion", desde="A", hasta="B")
+    assert texto["Nro_Gestion"].tolist() == ["A150"]
@@ -0,0 +1,157 @@
+import sys
+import json
+import time
+import atexit
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RUTA_LOGS = Path("./Log/Archivos_Log")
+
+# Corrida en curso: etapas medidas desde el último configurar_logging
+_corrida: dict | None = None
+
+
+def configurar_logging(nombre_script):
+    ruta_log = RUTA_LOGS / f"{nombre_script}.log"
+    logging.basicConfig(
+        filename=ruta_log,
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    iniciar_metricas(nombre_script)
+
+
+# =============================================================
+# MEMORIA DEL PROCESO
+# =============================================================
+def rss_actual_mb() -> float | None:
+    if psutil is not None:
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+
+    # Linux sin psutil: páginas residentes
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return round(paginas * resource.getpagesize() / (1024 * 1024), 1)
+    except (OSError, AttributeError):
+        return None
+
+
+def rss_pico_mb() -> float | None:
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa KB, macOS bytes
+        return round(pico / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+    if psutil is not None:
+        memoria = psutil.Process().memory_info()
+        return round(getattr(memoria, "peak_wset", memoria.rss) / (1024 * 1024), 1)
+
+    return None
+
+
+# =============================================================
+# MÉTRICAS POR ETAPA
+# =============================================================
+def iniciar_metricas(nombre_script):
+    global _corrida
+
+    # En modo vigilancia hay varias corridas por proceso
+    guardar_metricas()
+    _corrida = {
+        "script": nombre_script,
+        "inicio": datetime.now().isoformat(timespec="seconds"),
+        "reloj": time.perf_counter(),
+        "etapas": []
+    }
+
+
+@contextmanager
+def medicion(etapa, archivo=None, filas_entrada=None):
+    # Llena el registro sin guardarlo (sirve en procesos hijos)
+    registro = {
+        "etapa": etapa,
+        "archivo": archivo,
+        "filas_entrada": filas_entrada,
+        "filas_salida": None,
+        "ok": True
+    }
+    memoria = rss_actual_mb()
+    inicio = time.perf_counter()
+
+    try:
+        yield registro
+    except BaseException:
+        registro["ok"] = False
+        raise
+    finally:
+        registro["segundos"] = round(time.perf_counter() - inicio, 4)
+        final = rss_actual_mb()
+        registro["memoria_delta_mb"] = (
+            round(final - memoria, 1) if final is not None and memoria is not None else None
+        )
+
+
+def registrar_etapa(registro: dict):
+    if _corrida is not None:
+        _corrida["etapas"].append(registro)
+
+
+@contextmanager
+def medir_etapa(etapa, archivo=None, filas_entrada=None):
+    # Uso: with medir_etapa("concat", filas_entrada=n) as m: ...; m["filas_salida"] = len(df)
+    with medicion(etapa, archivo, filas_entrada) as registro:
+        try:
+            yield registro
+        finally:
+            registrar_etapa(registro)
+
+
+def guardar_metricas():
+    global _corrida
+
+    if not _corrida or not _corrida["etapas"]:
+        return
+
+    corrida, _corrida = _corrida, None
+
+    resumen = {}
+    for r in corrida["etapas"]:
+        total = resumen.setdefault(r["etapa"], {"segundos": 0.0, "veces": 0, "filas_salida": 0})
+        total["segundos"] = round(total["segundos"] + r["segundos"], 4)
+        total["veces"] += 1
+        total["filas_salida"] += r["filas_salida"] or 0
+
+    registro = {
+        "script": corrida["script"],
+        "inicio": corrida["inicio"],
+        "fin": datetime.now().isoformat(timespec="seconds"),
+        "segundos": round(time.perf_counter() - corrida["reloj"], 4),
+        "rss_pico_mb": rss_pico_mb(),
+        "resumen": resumen,
+        "etapas": corrida["etapas"]
+    }
+
+    # Una línea JSON por corrida
+    ruta = RUTA_LOGS / f"{corrida['script']}_metricas.jsonl"
+    try:
+        with open(ruta, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+        logging.info(f"📊 Métricas guardadas: {ruta}")
+    except OSError as e:
+        logging.error(f"❌ No se pudieron guardar las métricas: {e}")
+
+
+atexit.register(guardar_metricas)